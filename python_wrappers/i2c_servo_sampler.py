@@ -35,6 +35,16 @@ SLEEP entries is the only register-level evidence of the cross-channel glitch.
 --keep-invalid records the values that fail the plausibility gate instead of only
 counting them, so torn writes (a low byte from one command paired with a high
 byte from another) can be read back rather than inferred.
+
+With more than one channel the report includes a `skew` section: transitions
+on different channels that land within --skew-window ms of each other are
+treated as one multi-channel move, and the spread between the first and last
+channel to change is reported. --atomic reads every sampled channel in a single
+block read per pass (they must span at most eight adjacent channels), so a move
+counted as same-sample really did reach the chip in one piece. That is how to
+check the daemon's block writes against its old one-write-per-channel path:
+
+  python3 i2c_servo_sampler.py --channels 0,1,2 --atomic --duration 30
 """
 
 import argparse
@@ -46,6 +56,7 @@ PCA9685_LED0_ON_L = 0x06
 PCA9685_MODE1 = 0x00
 MODE1_SLEEP = 0x10
 DEFAULT_ADDRESS = 0x40
+MAX_BLOCK_CHANNELS = 8  # 32-byte SMBus block limit / 4 registers per channel
 
 # Standard-servo pulse window used by python_wrappers/pca9685_control.py and
 # jaw_servo_daemon.py: 0deg = 500us, 180deg = 2400us, 50Hz / 4096 steps.
@@ -64,6 +75,45 @@ def off_to_angle(off_count):
     return ((pulse_us - PULSE_MIN_US) / (PULSE_MAX_US - PULSE_MIN_US)) * 180.0
 
 
+def skew_report(samples, window_ms):
+    """Group near-simultaneous transitions across channels into moves.
+
+    `samples` is {channel: [(t_ms, off), ...]}. Returns how many moves touched
+    more than one channel, how many of those were seen changing in the same
+    sampling pass, and the spread (first to last channel) of the rest.
+    """
+    events = []
+    for ch, s in samples.items():
+        for i in range(1, len(s)):
+            if s[i][1] != s[i - 1][1]:
+                events.append((s[i][0], ch))
+    events.sort()
+
+    groups = []
+    for t, ch in events:
+        if groups and t - groups[-1][-1][0] <= window_ms:
+            groups[-1].append((t, ch))
+        else:
+            groups.append([(t, ch)])
+
+    spreads = []
+    for group in groups:
+        first = {}
+        for t, ch in group:
+            first.setdefault(ch, t)
+        if len(first) > 1:
+            spreads.append(max(first.values()) - min(first.values()))
+    spreads.sort()
+    return {
+        'window_ms': window_ms,
+        'multi_channel_moves': len(spreads),
+        'same_sample': sum(1 for v in spreads if v == 0),
+        'split': sum(1 for v in spreads if v > 0),
+        'p50_spread_ms': round(spreads[len(spreads) // 2], 2) if spreads else None,
+        'max_spread_ms': round(spreads[-1], 2) if spreads else None,
+    }
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--channels', default='3', help='comma-separated PCA9685 channels')
@@ -77,6 +127,10 @@ def main():
                     help='also sample MODE1 and report SLEEP (re-init glitch) events')
     ap.add_argument('--keep-invalid', action='store_true',
                     help='record the values rejected by the plausibility gate, not just the count')
+    ap.add_argument('--atomic', action='store_true',
+                    help='read all channels in one block read per pass (adjacent span of <= 8)')
+    ap.add_argument('--skew-window', type=float, default=50.0,
+                    help='ms within which transitions on different channels are one move')
     args = ap.parse_args()
 
     try:
@@ -93,6 +147,12 @@ def main():
         if not 0 <= ch <= 15:
             print(json.dumps({'error': f'channel out of range: {ch}'}))
             return 1
+    span_start = min(channels)
+    span = max(channels) - span_start + 1
+    if args.atomic and span > MAX_BLOCK_CHANNELS:
+        print(json.dumps({'error': f'--atomic needs channels within {MAX_BLOCK_CHANNELS} '
+                                   f'adjacent channels, got a span of {span}'}))
+        return 1
 
     period = 1.0 / max(1.0, args.rate)
     t_start = time.time()
@@ -123,14 +183,27 @@ def main():
                     mode1_prev = m1
             except OSError:
                 pass
-        for ch in channels:
-            reg = PCA9685_LED0_ON_L + 4 * ch
+        block = None
+        if args.atomic:
             try:
-                # Atomic 4-byte read: ON_L, ON_H, OFF_L, OFF_H.
-                data = read_block(reg, 4)
+                # One read for every channel: a pass sees the chip at one instant.
+                block = read_block(PCA9685_LED0_ON_L + 4 * span_start, 4 * span)
             except OSError:
-                rejected[ch] += 1
-                continue
+                # Read this pass channel by channel instead, which counts each
+                # channel that fails; the pass is still paced below.
+                block = None
+        for ch in channels:
+            if block is not None:
+                offset = 4 * (ch - span_start)
+                data = block[offset:offset + 4]
+            else:
+                reg = PCA9685_LED0_ON_L + 4 * ch
+                try:
+                    # Atomic 4-byte read: ON_L, ON_H, OFF_L, OFF_H.
+                    data = read_block(reg, 4)
+                except OSError:
+                    rejected[ch] += 1
+                    continue
             on = data[0] | (data[1] << 8)
             off = data[2] | (data[3] << 8)
             # Plausibility gate — see module docstring.
@@ -171,6 +244,10 @@ def main():
                 {'t_ms': t, 'on': on, 'off': off} for t, on, off in invalid[ch][:50]
             ]
 
+    if len(channels) > 1:
+        report['skew'] = skew_report(samples, args.skew_window)
+        report['skew']['atomic'] = args.atomic
+
     if args.mode1:
         report['mode1'] = {
             'sleep_events': mode1_sleep_events,
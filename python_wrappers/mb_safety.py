@@ -32,10 +32,29 @@ up in data/character-<id>/parts.json for the character resolved the same way
 Node resolves it (config/app-config.json `selectedCharacter`), overridable with
 MB_CHARACTER_ID for callers that know better. An unresolvable part is allowed
 through with a warning unless MB_SAFETY_STRICT=1.
+
+The servo daemon can also be told a part id instead of a channel (set_part).
+servo_part() resolves it the way Node's hardwareService does — chip and
+channel from parts.json, window and inversion from the part's calibration
+profile in data/calibration_profiles.json, narrowed by its configured limits.
+That is a port of Node's resolution for addressing, kept apart from guard(),
+which still never reads a calibration profile.
+
+Caching
+-------
+The servo daemon and other long-lived callers ask these questions on every
+write, so nothing here rescans a file per call. Parsed JSON is cached with the
+file's stat stamp (mtime, size, inode) and re-read only once that changes —
+an edit to parts.json, physical-faults.json or calibration_profiles.json
+applies to a running daemon within MB_SAFETY_STAT_INTERVAL_S (default 0.25s)
+without a restart. Parts are indexed by (controller, address, channel), by pin
+and by id, and the broken-channel map is derived once per version of the
+files, so lookups are dict hits.
 """
 
 import errno
 import json
+import math
 import os
 import re
 import sys
@@ -56,6 +75,7 @@ SAFETY_CONFIG_PATH = os.path.join(APP_ROOT, 'config', 'hardware-safety.json')
 APP_CONFIG_PATH = os.path.join(APP_ROOT, 'config', 'app-config.json')
 PHYSICAL_FAULTS_PATH = os.path.join(APP_ROOT, 'config', 'physical-faults.json')
 DATA_ROOT = os.path.join(APP_ROOT, 'data')
+CALIBRATION_PROFILES_PATH = os.path.join(DATA_ROOT, 'calibration_profiles.json')
 
 # Mirrors RETRACT_DIRECTIONS in services/hardwareService/safetyLimits.js.
 RETRACT_DIRECTIONS = frozenset({'retract', 'reverse', 'backward', 'back', 'down', 'in', 'ccw'})
@@ -65,17 +85,48 @@ RETRACT_DIRECTIONS = frozenset({'retract', 'reverse', 'backward', 'back', 'down'
 # as a duty cycle and must not be clamped into a servo's travel window.
 ANGULAR_TYPES = frozenset({'servo', 'continuous_servo'})
 
-_json_cache = {}
+# A cached file is re-stat'ed at most this often. Hot callers (the servo daemon
+# asks on every write) pay a dict lookup in between instead of a syscall.
+STAT_INTERVAL_S = float(os.environ.get('MB_SAFETY_STAT_INTERVAL_S', '0.25'))
+
+_json_cache = {}     # path -> [stamp, value, checked_at]
+_index_cache = {}    # character_id -> _PartIndex
+_servo_cache = {}    # character_id -> _ServoParts
 
 
 def _strict():
     return os.environ.get('MB_SAFETY_STRICT', '') == '1'
 
 
+def _stamp(path):
+    """What changes when the file does; None for a file that is not there."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
 def _load_json(path, default=None):
-    """Read and cache a JSON file. Never raises; returns `default` on failure."""
-    if path in _json_cache:
-        return _json_cache[path]
+    """Read and cache a JSON file. Never raises; returns `default` on failure.
+
+    The cached value is kept until the file's stamp changes, so an edit (or a
+    file appearing or disappearing) is picked up by a long-lived process. The
+    same object is returned until then, which is what lets derived indexes
+    tell whether they are still current.
+    """
+    now = time.monotonic()
+    entry = _json_cache.get(path)
+    if entry is not None:
+        if now - entry[2] < STAT_INTERVAL_S:
+            return entry[1]
+        stamp = _stamp(path)
+        if stamp == entry[0]:
+            entry[2] = now
+            return entry[1]
+    else:
+        stamp = _stamp(path)
+
     value = default
     try:
         with open(path, 'r', encoding='utf-8') as handle:
@@ -87,7 +138,7 @@ def _load_json(path, default=None):
     except (OSError, ValueError) as exc:
         warn(f'safety: {os.path.basename(path)} unreadable ({exc}) — '
              f'continuing without the limits it holds')
-    _json_cache[path] = value
+    _json_cache[path] = [stamp, value, now]
     return value
 
 
@@ -103,11 +154,14 @@ def resolve_character_id(explicit=None):
     return None if selected in (None, '') else str(selected)
 
 
+def _parts_path(character_id):
+    return os.path.join(DATA_ROOT, f'character-{character_id}', 'parts.json')
+
+
 def load_parts(character_id):
     if character_id is None:
         return []
-    path = os.path.join(DATA_ROOT, f'character-{character_id}', 'parts.json')
-    parts = _load_json(path, [])
+    parts = _load_json(_parts_path(character_id), [])
     return parts if isinstance(parts, list) else []
 
 
@@ -127,6 +181,101 @@ def _part_controller(part):
     return str(cfg.get('controllerType') or part.get('controllerType') or '').lower()
 
 
+def _part_address(part):
+    """The PCA9685 address a part declares, or None for "not declared"."""
+    cfg = part.get('config') or {}
+    address = cfg.get('address', part.get('address'))
+    if address is None:
+        return None
+    try:
+        return int(address, 0) if isinstance(address, str) else int(address)
+    except (TypeError, ValueError):
+        return None   # unparseable matches any address, as it always has
+
+
+def _declared_pins(part):
+    """Every integer-valued field a part declares, top level over config."""
+    merged = dict(part.get('config') or {})
+    merged.update(part)
+    pins = {}
+    for key, value in merged.items():
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        try:
+            pins[key] = int(value)
+        except (TypeError, ValueError):
+            continue
+    return pins
+
+
+class _PartIndex:
+    """One character's parts, indexed for O(1) lookup, for one version of its files.
+
+    Built from the exact objects _load_json returned; `current()` is an
+    identity check against what _load_json returns now, so any edit to
+    parts.json or physical-faults.json retires the index.
+    """
+
+    def __init__(self, character_id, parts, faults):
+        self.parts = parts
+        self.faults = faults
+        # (controller, address-or-None, channel) -> (position, part), and the same
+        # without the address; the first part in file order wins either way.
+        self.channels = {}
+        self.any_address = {}
+        # (pin key, pin value) -> [position, ...]
+        self.pins = {}
+        self.declared = []
+        for position, part in enumerate(parts):
+            if not isinstance(part, dict):
+                self.declared.append({})
+                continue
+            channel = _part_channel(part)
+            if channel is not None:
+                controller = _part_controller(part)
+                self.channels.setdefault((controller, _part_address(part), channel),
+                                         (position, part))
+                self.any_address.setdefault((controller, channel), (position, part))
+            declared = _declared_pins(part)
+            self.declared.append(declared)
+            for item in declared.items():
+                self.pins.setdefault(item, []).append(position)
+
+        self.broken = {}
+        broken = _broken_ids_from(faults, character_id)
+        for part in parts:
+            if not isinstance(part, dict) or str(part.get('id')) not in broken:
+                continue
+            if _part_controller(part) not in ('pca9685', ''):
+                continue
+            channel = _part_channel(part)
+            if channel is None:
+                continue
+            self.broken[channel] = (f"part {part.get('id')} ({part.get('name')}) "
+                                    f"is declared physically broken")
+
+    def current(self, parts, faults):
+        return parts is self.parts and faults is self.faults
+
+    def by_channel(self, controller, channel, address=None):
+        if address is None:
+            hit = self.any_address.get((controller, channel))
+            return hit[1] if hit else None
+        hits = [hit for hit in (self.channels.get((controller, address, channel)),
+                                self.channels.get((controller, None, channel))) if hit]
+        return min(hits, key=lambda hit: hit[0])[1] if hits else None
+
+    def by_pins(self, wanted):
+        """First part (in file order) agreeing with every pin in `wanted` it declares."""
+        candidates = sorted({position for item in wanted.items()
+                             for position in self.pins.get(item, ())})
+        for position in candidates:
+            declared = self.declared[position]
+            if all(declared.get(key, value) == value for key, value in wanted.items()):
+                return self.parts[position]
+        return None
+
+
 def broken_part_ids(character_id):
     """Part ids the operator has declared PHYSICALLY BROKEN for this character.
 
@@ -134,36 +283,40 @@ def broken_part_ids(character_id):
     NOT the retired per-part safety-limit system (config/hardware-safety.json, empty
     by permanent operator ruling) — it is an inventory of damaged hardware.
     """
-    cfg = _load_json(PHYSICAL_FAULTS_PATH, {}) or {}
-    chars = cfg.get('characters') or {}
+    return _broken_ids_from(_load_json(PHYSICAL_FAULTS_PATH, {}), character_id)
+
+
+def _broken_ids_from(faults, character_id):
+    chars = (faults or {}).get('characters') or {}
     entry = chars.get(str(character_id)) or {}
     parts = entry.get('parts') or {}
     return {str(pid) for pid, meta in parts.items()
             if isinstance(meta, dict) and meta.get('status') == 'broken'}
 
 
+def _index(character_id):
+    """The current _PartIndex for a character, rebuilt only when its files change."""
+    parts = load_parts(character_id)
+    faults = _load_json(PHYSICAL_FAULTS_PATH, {})
+    index = _index_cache.get(character_id)
+    if index is None or not index.current(parts, faults):
+        index = _PartIndex(character_id, parts, faults)
+        _index_cache[character_id] = index
+    return index
+
+
 def broken_channels(character_id, address=None):
     """PCA9685 channels owned by a physically broken part.
 
     Returned as {channel: reason} so a refusal can say WHY. Used by the servo
     daemon as a last line of defence: it is the single transport every caller
     passes through, so a channel denied here cannot be energized by any code path,
-    including ones that bypass the Node-side guards entirely.
+    including ones that bypass the Node-side guards entirely. The daemon asks on
+    every write; the answer is derived once per version of the files.
     """
-    broken = broken_part_ids(character_id)
-    if not broken:
+    if character_id is None:
         return {}
-    out = {}
-    for part in load_parts(character_id):
-        if str(part.get('id')) not in broken:
-            continue
-        if _part_controller(part) not in ('pca9685', ''):
-            continue
-        channel = _part_channel(part)
-        if channel is None:
-            continue
-        out[channel] = f"part {part.get('id')} ({part.get('name')}) is declared physically broken"
-    return out
+    return _index(character_id).broken
 
 
 def find_part_by_channel(character_id, channel, address=None):
@@ -172,24 +325,14 @@ def find_part_by_channel(character_id, channel, address=None):
         channel = int(channel)
     except (TypeError, ValueError):
         return None
-    for part in load_parts(character_id):
-        if not isinstance(part, dict):
-            continue
-        if _part_controller(part) != 'pca9685':
-            continue
-        if _part_channel(part) != channel:
-            continue
-        if address is not None:
-            cfg = part.get('config') or {}
-            part_addr = cfg.get('address', part.get('address'))
-            if part_addr is not None:
-                try:
-                    if int(part_addr) != int(address):
-                        continue
-                except (TypeError, ValueError):
-                    pass
-        return part
-    return None
+    if character_id is None:
+        return None
+    if address is not None:
+        try:
+            address = int(address, 0) if isinstance(address, str) else int(address)
+        except (TypeError, ValueError):
+            address = None
+    return _index(character_id).by_channel('pca9685', channel, address)
 
 
 def find_part_by_pins(character_id, pins):
@@ -208,29 +351,9 @@ def find_part_by_pins(character_id, pins):
             wanted[key] = int(value)
         except (TypeError, ValueError):
             continue
-    if not wanted:
+    if not wanted or character_id is None:
         return None
-
-    for part in load_parts(character_id):
-        if not isinstance(part, dict):
-            continue
-        matched = 0
-        conflict = False
-        for key, value in wanted.items():
-            declared = part.get(key, (part.get('config') or {}).get(key))
-            if declared is None:
-                continue
-            try:
-                declared = int(declared)
-            except (TypeError, ValueError):
-                continue
-            if declared == value:
-                matched += 1
-            else:
-                conflict = True
-        if matched and not conflict:
-            return part
-    return None
+    return _index(character_id).by_pins(wanted)
 
 
 def _min_defined(a, b):
@@ -344,6 +467,162 @@ def guard(character_id, part, op, angle=None, speed=None, duration_ms=None,
     return values, clamps, safety
 
 
+# ---------------------------------------------------------------------------
+# Servo addressing by part id (servo daemon set_part)
+# ---------------------------------------------------------------------------
+# Node resolves a part to its chip, channel and calibrated window before every
+# daemon call (hardwareService controlPart / batch moves). The daemon's set_part
+# does that resolution itself, so it has to come out the same: this is a port
+# of those few lines, not a second opinion. It is the one place in this module
+# that reads calibration profiles, and guard() still never does.
+#
+# data/character-*/servo_calibrations.json is not read here, though it holds
+# standard servos as well as continuous ones. Node only reads it in
+# servo.js moveToAngle(), for GPIO servos. The PCA9685 path that set_part stands
+# in for takes its window and inversion from calibration_profiles.json through
+# the calibration store, so using that file's records here would move a part
+# somewhere Node would not.
+
+# Narrowest window accepted as a measurement; MIN_MEASURED_SPAN_DEG in
+# server/calibration/store.js.
+MIN_MEASURED_SPAN_DEG = 1.0
+
+
+def _finite(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _degenerate_window(bounds):
+    """isDegenerateWindow() in server/calibration/store.js."""
+    lo, hi = bounds.get('minAngle'), bounds.get('maxAngle')
+    if isinstance(lo, (int, float)) and isinstance(hi, (int, float)):
+        if not (_finite(lo) and _finite(hi)) or hi - lo < MIN_MEASURED_SPAN_DEG:
+            return True
+    # Open-loop parts fail the same way in normalized units.
+    lo, hi = bounds.get('minP'), bounds.get('maxP')
+    if isinstance(lo, (int, float)) and isinstance(hi, (int, float)):
+        if not (_finite(lo) and _finite(hi)) or hi - lo <= 0:
+            return True
+    return False
+
+
+def _measured_bounds(profile):
+    """A profile's bounds as calibrationStore.get() hands them out.
+
+    A placeholder's 0-180 span and a pinned (degenerate) window are withheld —
+    see shapeForRead() in server/calibration/store.js — so neither can pass
+    for a measurement here either.
+    """
+    if not isinstance(profile, dict) or profile.get('autoGenerated'):
+        return None
+    bounds = profile.get('bounds')
+    if not isinstance(bounds, dict) or _degenerate_window(bounds):
+        return None
+    return bounds
+
+
+class _ServoParts:
+    """One character's servos resolved for addressing, for one version of its files.
+
+    Built from the exact objects _load_json returned, like _PartIndex, so an
+    edit to parts.json, calibration_profiles.json or hardware-safety.json
+    retires it. Parts are resolved lazily, once per version.
+    """
+
+    def __init__(self, character_id, parts, profiles, safety_cfg):
+        self.character_id = character_id
+        self.parts = parts
+        self.profiles = profiles
+        self.safety_cfg = safety_cfg
+        self.by_id = {}
+        for part in parts:
+            if isinstance(part, dict) and part.get('id') is not None:
+                self.by_id.setdefault(str(part['id']), part)
+        self.resolved = {}
+
+    def current(self, parts, profiles, safety_cfg):
+        return (parts is self.parts and profiles is self.profiles
+                and safety_cfg is self.safety_cfg)
+
+    def get(self, part_id):
+        part_id = str(part_id)
+        if part_id not in self.resolved:
+            self.resolved[part_id] = self._resolve(part_id)
+        return self.resolved[part_id]
+
+    def _resolve(self, part_id):
+        part = self.by_id.get(part_id)
+        if part is None:
+            return None
+        profiles = self.profiles if isinstance(self.profiles, dict) else {}
+        # Character-scoped key first, then the legacy bare part id (store.getRaw).
+        profile = profiles.get(f'{self.character_id}:{part_id}') or profiles.get(part_id)
+        bounds = _measured_bounds(profile) or {}
+        safety = get_part_safety(self.character_id, part_id)
+
+        def bound(key):
+            value = bounds.get(key)
+            return float(value) if _finite(value) else None
+
+        # The window is the configured limits intersected with the measured
+        # bounds, as applySafetyLimits and the batch path's daemon backstop use.
+        lo = _max_defined(_float_or_none(safety.get('minAngle')), bound('minAngle'))
+        hi = _min_defined(_float_or_none(safety.get('maxAngle')), bound('maxAngle'))
+        capability = (profile or {}).get('capability') or {}
+        mirror = None
+        if capability.get('invert'):
+            # minAngle + maxAngle - angle, 0/180 standing in for missing bounds:
+            # the single inversion formula (tests/unit/invert-single-formula).
+            mirror = (bound('minAngle') if bound('minAngle') is not None else 0.0,
+                      bound('maxAngle') if bound('maxAngle') is not None else 180.0)
+        blocked = None
+        if safety.get('blockAllMotion'):
+            blocked = (f"Part {part_id} ({part.get('name')}) is quarantined by "
+                       f"config/hardware-safety.json: "
+                       f"{safety.get('blockReason') or 'no reason recorded'}")
+        return {
+            'id': part_id,
+            'name': part.get('name'),
+            'type': _normalized_type(part),
+            'controller': _part_controller(part),
+            'address': _part_address(part),
+            'channel': _part_channel(part),
+            'min': lo,
+            'max': hi,
+            'mirror': mirror,
+            'blocked': blocked,
+        }
+
+
+def _float_or_none(value):
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def servo_part(character_id, part_id):
+    """How to drive a part by id, or None if the character has no such part.
+
+    Returns a dict with the part's `address` (None when parts.json does not
+    say), `channel`, `type` and `controller`, its angle window `min`/`max`
+    (None for an open side), `mirror` — the (min, max) pair an inverted part
+    is mirrored within, None when it is not inverted — and `blocked`, the
+    reason it must not move, or None. A lookup is a dict hit until one of the
+    files behind it changes.
+    """
+    if character_id is None:
+        return None
+    parts = load_parts(character_id)
+    profiles = _load_json(CALIBRATION_PROFILES_PATH, {})
+    safety_cfg = _load_json(SAFETY_CONFIG_PATH, {})
+    index = _servo_cache.get(character_id)
+    if index is None or not index.current(parts, profiles, safety_cfg):
+        index = _ServoParts(character_id, parts, profiles, safety_cfg)
+        _servo_cache[character_id] = index
+    return index.get(part_id)
+
+
 # ---------------------------------------------------------------------------
 # Power-group serialization (cross-process)
 # ---------------------------------------------------------------------------
@@ -356,6 +635,12 @@ def _lock_path(character_id, group):
     return os.path.join('/tmp', f'monsterbox-powergroup-{safe}.lock')
 
 
+def is_power_serialized(safety):
+    """True if the part's rail is shared and power_group will hold a lock for it."""
+    group_cfg = (safety or {}).get('powerGroupConfig') or {}
+    return bool((safety or {}).get('powerGroup')) and group_cfg.get('serialize') is not False
+
+
 @contextmanager
 def power_group(character_id, safety, timeout_s=15.0):
     """Hold the part's fused rail for the duration of the block.
@@ -364,8 +649,7 @@ def power_group(character_id, safety, timeout_s=15.0):
     permissions problem on /tmp cannot stop a show.
     """
     group = (safety or {}).get('powerGroup')
-    group_cfg = (safety or {}).get('powerGroupConfig') or {}
-    if not group or group_cfg.get('serialize') is False:
+    if not is_power_serialized(safety):
         yield
         return
 
@@ -504,8 +788,10 @@ def validate_power_groups(character_id):
 
 
 def reset_cache():
-    """Test hook: forget cached JSON reads."""
+    """Test hook: forget cached JSON reads and the indexes built from them."""
     _json_cache.clear()
+    _index_cache.clear()
+    _servo_cache.clear()
 
 
 if __name__ == '__main__':
@@ -9,10 +9,20 @@ Two ways to reach the chip, in strict order of preference:
      process owns the I2C bus for the whole box. Every command from every other
      process is forwarded to it over a Unix socket, so the chip is configured
      exactly once and multiple channels can be driven together without any of
-     them disturbing the others.
+     them disturbing the others. The socket is kept open and pooled between
+     commands, so a caller streaming corrections pays the connect once.
 
   2. Direct I2C from this process, used only when the daemon is unreachable.
 
+If no daemon is running, the first command starts one (socket-only, detached,
+so it outlives this process) and waits for it to report ready. A lock file
+next to the socket makes sure concurrent callers start exactly one. Every
+later one-shot CLI call then finds it already up. Never under MB_TEST_MODE,
+so a test run does not leave a process holding the bus behind it.
+MB_SERVO_AUTOSTART=0 keeps the old behaviour of falling back to direct I2C
+instead; MB_SERVO_DIRECT=1 skips the daemon entirely, for bench work on a
+box where nothing else runs.
+
 Why the daemon matters (measured on a reference node, v9.2.0):
   pca9685_init has to drive MODE1 to 0x10 (SLEEP) to change the prescaler, and
   SLEEP stops the oscillator, which kills the PWM output on ALL SIXTEEN channels
@@ -29,20 +39,37 @@ The direct path is fixed too, so the fallback is safe on its own:
   * channel writes are a single atomic 4-byte block write. Four separate byte
     writes let a concurrent writer interleave and let the chip act on a low byte
     from one command paired with a high byte from another.
+
+Angles become off-counts in one place, angle_to_off. A channel listed in
+data/servo_curves.json ($MB_SERVO_CURVES) goes through its compiled calibration
+table (servo_curves.py) instead of the standard 500-2400us map, on the daemon
+and on the direct path alike.
 """
 
+import errno
+import fcntl
+import itertools
 import json
 import time
 import os
+import select
 import socket
+import subprocess
 import sys
+import threading
 import atexit
 
+import servo_curves
+
 # PCA9685 Constants
 PCA9685_DEFAULT_ADDRESS = 0x40
 PCA9685_MODE1 = 0x00
 PCA9685_PRESCALE = 0xFE
 PCA9685_LED0_ON_L = 0x06
+PCA9685_ALL_LED_ON_L = 0xFA
+
+# SMBus caps a block transfer at 32 data bytes: eight channels of four registers.
+MAX_BLOCK_CHANNELS = 8
 
 MODE1_RESTART = 0x80
 MODE1_AI = 0x20
@@ -57,12 +84,30 @@ PWM_STEPS = 4096.0
 SERVO_MIN_US = 500.0
 SERVO_MAX_US = 2400.0
 
+# Per-channel calibration curves (see servo_curves.py). A channel without one
+# uses the standard window above.
+CURVES_PATH = os.environ.get(
+    'MB_SERVO_CURVES',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'servo_curves.json'))
+CURVES_STAT_INTERVAL_S = 0.5
+
 # Unix socket the shared servo daemon listens on.
 SERVO_SOCKET_PATH = os.environ.get('MB_SERVO_SOCKET', '/tmp/monsterbox-servo.sock')
 
 # Set by servo_daemon.py in its own process so it never tries to call itself.
 _IS_DAEMON = os.environ.get('MB_SERVO_DAEMON') == '1'
 
+# Explicit opt-out: never talk to (or start) the daemon, always drive the bus.
+_DIRECT = os.environ.get('MB_SERVO_DIRECT') == '1'
+
+# Start the daemon on demand when nobody is serving the socket. Never in test
+# mode, which must not leave a process holding the bus behind it.
+_AUTOSTART = (os.environ.get('MB_SERVO_AUTOSTART', '1') != '0'
+              and os.environ.get('MB_TEST_MODE') not in ('1', 'true'))
+DAEMON_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jaw_servo_daemon.py')
+DAEMON_LOG = os.environ.get('MB_SERVO_DAEMON_LOG', '/tmp/monsterbox-servo-daemon.log')
+DAEMON_START_TIMEOUT_S = 5.0
+
 # Cached bus instances keyed by I2C address
 _bus_cache = {}
 
@@ -70,7 +115,30 @@ _bus_cache = {}
 _configured = set()
 
 # Remembered result of the daemon probe: None = not tried, False = unreachable.
+# "Unreachable" is re-tested after DAEMON_RETRY_S, so a process that outlives a
+# daemon restart finds its way back instead of driving the bus directly forever.
 _daemon_available = None
+_daemon_retry_at = 0.0
+DAEMON_RETRY_S = 3.0
+
+# Persistent daemon connections kept open between requests. Small on purpose:
+# one per concurrently-moving thread is plenty, and every one is a daemon-side
+# connection too.
+DAEMON_POOL_SIZE = 2
+
+# Longest rotation the daemon will time by itself (its MAX_MOTION_S); a longer
+# one is timed by the caller, as without a daemon.
+DAEMON_MAX_ROTATION_S = 120.0
+_idle_connections = []
+_pool_lock = threading.Lock()
+_request_ids = itertools.count(1)
+
+# Commands that leave the daemon in the same state however often they arrive,
+# so a batch made only of them can be resent when its connection drops after
+# the send. Anything timed or relative (rotate, move_to, cancel, play, ...) is
+# only ever resent if it provably never left this process.
+_RESENDABLE = frozenset(('ping', 'state', 'stats', 'library', 'set_angle', 'set_angles',
+                         'set_part', 'set_pulse', 'set_raw', 'release', 'release_all'))
 
 
 def log_message(msg_dict):
@@ -92,9 +160,16 @@ def expected_prescale(freq_hz=PWM_FREQ_HZ):
     return max(3, min(255, val))
 
 
-def angle_to_off(angle_deg):
-    """Standard-servo angle (deg) -> PCA9685 off-count. Always clamped 0-180."""
+def angle_to_off(angle_deg, channel=None, address=PCA9685_DEFAULT_ADDRESS, bus=1):
+    """Servo angle (deg) -> PCA9685 off-count. Always clamped 0-180.
+
+    Given the channel, a calibration curve for it is used if there is one.
+    """
     angle_deg = max(0.0, min(180.0, float(angle_deg)))
+    if channel is not None:
+        curve = servo_curve(channel, address, bus)
+        if curve is not None:
+            return curve.off(angle_deg)
     pulse_us = (angle_deg / 180.0) * (SERVO_MAX_US - SERVO_MIN_US) + SERVO_MIN_US
     return us_to_off(pulse_us)
 
@@ -180,6 +255,45 @@ def write_channel(bus, i2c_address, channel, on, off):
             bus.write_byte_data(i2c_address, reg + offset, value)
 
 
+def write_channels(bus, i2c_address, first_channel, offs):
+    """Write a run of ADJACENT channels (on=0) in as few transactions as possible.
+
+    With MODE1 auto-increment (set by ensure_chip) the LEDn registers are one
+    contiguous block, so up to MAX_BLOCK_CHANNELS channels go out as a single
+    block write: they reach the chip in one transaction instead of one each,
+    which is both less bus time and less skew between the channels.
+    """
+    offs = list(offs)
+    for start in range(0, len(offs), MAX_BLOCK_CHANNELS):
+        chunk = offs[start:start + MAX_BLOCK_CHANNELS]
+        if len(chunk) == 1:
+            write_channel(bus, i2c_address, first_channel + start, 0, chunk[0])
+            continue
+        reg = PCA9685_LED0_ON_L + 4 * (int(first_channel) + start)
+        payload = []
+        for off in chunk:
+            payload.extend((0, 0, off & 0xFF, (off >> 8) & 0x0F))
+        try:
+            bus.write_i2c_block_data(i2c_address, reg, payload)
+        except AttributeError:
+            for offset, off in enumerate(chunk):
+                write_channel(bus, i2c_address, first_channel + start + offset, 0, off)
+
+
+def write_all_channels(bus, i2c_address, on, off):
+    """Load the same on/off counts into all sixteen channels in one transaction.
+
+    Goes through the ALL_LED registers, which the chip copies into every
+    LEDn register — so a release_all is one write, not sixteen.
+    """
+    payload = [on & 0xFF, (on >> 8) & 0x0F, off & 0xFF, (off >> 8) & 0x0F]
+    try:
+        bus.write_i2c_block_data(i2c_address, PCA9685_ALL_LED_ON_L, payload)
+    except AttributeError:
+        for offset, value in enumerate(payload):
+            bus.write_byte_data(i2c_address, PCA9685_ALL_LED_ON_L + offset, value)
+
+
 def read_channel(bus, i2c_address, channel):
     """Read one channel's four PWM registers. Returns (on, off).
 
@@ -197,11 +311,154 @@ def read_channel(bus, i2c_address, channel):
     return on, off
 
 
+def read_channels(bus, i2c_address, first_channel=0, count=16, auto_increment=True):
+    """Read a run of adjacent channels' PWM registers. Returns [(on, off), ...].
+
+    The read-side twin of write_channels: up to MAX_BLOCK_CHANNELS channels per
+    block read, so a whole chip is two transactions. A block read only walks the
+    registers with MODE1 auto-increment set; pass auto_increment=False for a
+    chip configured without it and every register is read on its own.
+
+    A channel with its FULL_OFF bit set emits no pulse whatever its count says,
+    so it reads back as off=0, the same as one this module released.
+    """
+    data = []
+    reg = PCA9685_LED0_ON_L + 4 * int(first_channel)
+    size = 4 * int(count)
+    for start in range(0, size, 4 * MAX_BLOCK_CHANNELS):
+        length = min(4 * MAX_BLOCK_CHANNELS, size - start)
+        if auto_increment:
+            try:
+                data.extend(bus.read_i2c_block_data(i2c_address, reg + start, length))
+                continue
+            except AttributeError:
+                pass
+        data.extend(bus.read_byte_data(i2c_address, reg + start + offset)
+                    for offset in range(length))
+    channels = []
+    for base in range(0, size, 4):
+        on = data[base] | ((data[base + 1] & 0x0F) << 8)
+        off = data[base + 2] | ((data[base + 3] & 0x0F) << 8)
+        if data[base + 3] & 0x10:
+            off = 0
+        channels.append((on, off))
+    return channels
+
+
+def continuous_pulse_us(direction, speed):
+    """Pulse width for a continuous-rotation servo: 1500us neutral, 1000-2000us at full speed."""
+    neutral, min_pulse, max_pulse = 1500, 1000, 2000
+    speed = max(0, min(100, int(speed)))
+    if direction == 'cw':
+        return int(round(neutral + (max_pulse - neutral) * (speed / 100.0)))
+    if direction == 'ccw':
+        return int(round(neutral - (neutral - min_pulse) * (speed / 100.0)))
+    return neutral
+
+
 def off_to_us(off_count):
     """PCA9685 off-count -> pulse width in microseconds (inverse of us_to_off)."""
     return (float(off_count) / PWM_STEPS) * PERIOD_US
 
 
+def off_to_angle(off_count, channel=None, address=PCA9685_DEFAULT_ADDRESS, bus=1):
+    """PCA9685 off-count -> servo angle (inverse of angle_to_off), 0-180."""
+    if channel is not None:
+        curve = servo_curve(channel, address, bus)
+        if curve is not None:
+            return curve.angle(off_count)
+    pulse_us = off_to_us(off_count)
+    angle = (pulse_us - SERVO_MIN_US) / (SERVO_MAX_US - SERVO_MIN_US) * 180.0
+    return max(0.0, min(180.0, angle))
+
+
+# ---------------------------------------------------------------------------
+# Calibration curves — compiled once per version of CURVES_PATH
+# ---------------------------------------------------------------------------
+# {"64:4": {"points": [[0, 560], [90, 1480], [180, 2410]], "interpolation": "spline"},
+#  "3:64:0": {...}}  keyed like the daemon's `state`, a bus prefix for bus != 1.
+# The daemon asks per channel per frame, so the file is re-stat'ed at most every
+# CURVES_STAT_INTERVAL_S and recompiled only when its stamp changes. A file that
+# stops parsing keeps the tables already compiled, with a warning: a typo made
+# mid-show must not throw every calibrated servo back onto the standard map.
+
+_curves = {'tables': {}, 'stamp': None, 'checked_at': float('-inf'), 'generation': 0}
+_curves_lock = threading.Lock()
+
+
+def _curves_stamp():
+    try:
+        st = os.stat(CURVES_PATH)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _reload_curves():
+    """Recompile the tables if CURVES_PATH changed. Caller holds _curves_lock."""
+    now = time.monotonic()
+    if now - _curves['checked_at'] < CURVES_STAT_INTERVAL_S:
+        return
+    _curves['checked_at'] = now
+    stamp = _curves_stamp()
+    if stamp == _curves['stamp']:
+        return
+    _curves['stamp'] = stamp
+    if stamp is None:
+        tables, errors = {}, []
+    else:
+        try:
+            with open(CURVES_PATH, 'r', encoding='utf-8') as handle:
+                spec = json.loads(handle.read() or '{}')
+            if not isinstance(spec, dict):
+                raise ValueError('expected an object keyed by address:channel')
+        except (OSError, ValueError) as exc:
+            sys.stderr.write(f"[pca9685] {CURVES_PATH} unreadable ({exc}) — "
+                             f"keeping the curves already loaded\n")
+            return
+        tables, errors = servo_curves.compile_curves(spec, us_to_off)
+        for error in errors:
+            sys.stderr.write(f"[pca9685] servo curve {error} — that channel uses the standard map\n")
+    _curves['tables'] = tables
+    _curves['generation'] += 1
+
+
+def servo_curve(channel, address=PCA9685_DEFAULT_ADDRESS, bus=1):
+    """The compiled calibration curve for a channel, or None."""
+    with _curves_lock:
+        _reload_curves()
+        tables = _curves['tables']
+    if not tables:
+        return None
+    address = int(address)
+    curve = tables.get((int(bus), address, int(channel)))
+    if curve is None and int(bus) == 1:
+        curve = tables.get((None, address, int(channel)))
+    return curve
+
+
+def curves_generation():
+    """Changes whenever the tables are recompiled (see curves_loaded)."""
+    with _curves_lock:
+        _reload_curves()
+        return _curves['generation']
+
+
+def curves_loaded():
+    """(generation, {label: interpolation}) for what is compiled now.
+
+    `generation` changes whenever the tables are recompiled, so a caller that
+    compiled something through them (the daemon's pose and clip library) can
+    tell it is stale.
+    """
+    with _curves_lock:
+        _reload_curves()
+        tables, generation = _curves['tables'], _curves['generation']
+    labels = {(f"{address}:{channel}" if bus in (None, 1) else f"{bus}:{address}:{channel}"):
+              curve.interpolation for (bus, address, channel), curve in tables.items()}
+    return generation, labels
+
+
 def _cleanup_buses():
     """Close all cached I2C bus handles on process exit"""
     for addr, bus in _bus_cache.items():
@@ -290,49 +547,262 @@ def pca9685_set_pwm(bus, i2c_address, channel, on, off):
 # Shared-daemon client
 # ---------------------------------------------------------------------------
 
-def daemon_request(payload, timeout=2.0):
-    """Send one JSON command to the shared servo daemon.
+class _NotSent(OSError):
+    """The connection failed before any byte of the batch was written."""
+
 
-    Returns the decoded reply, or None if the daemon is not reachable — the
-    caller then falls back to driving the bus directly. Never raises for a
-    missing daemon: an absent daemon must degrade, not break a servo.
+class _DaemonConnection:
+    """One persistent socket to the shared daemon.
+
+    Replies are matched to requests by `id` rather than by arrival order, so a
+    whole batch can be written in one send and its replies collected after —
+    several commands in flight on one connection, no round trip between them.
     """
-    global _daemon_available
 
-    if _IS_DAEMON or _daemon_available is False:
-        return None
+    def __init__(self, timeout):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.settimeout(timeout)
+            self.sock.connect(SERVO_SOCKET_PATH)
+        except OSError:
+            self.sock.close()
+            raise
+        self.reader = self.sock.makefile('rb')
+
+    def exchange(self, payloads, timeout):
+        self.sock.settimeout(timeout)
+        wanted = {}
+        lines = []
+        for payload in payloads:
+            request_id = next(_request_ids)
+            wanted[request_id] = payload.get('id')
+            lines.append((json.dumps(dict(payload, id=request_id)) + '\n').encode('utf-8'))
+        data = b''.join(lines)
+        try:
+            sent = self.sock.send(data)
+        except OSError as exc:
+            raise _NotSent(exc.errno, f"servo daemon connection is dead: {exc}") from exc
+        if sent < len(data):
+            self.sock.sendall(data[sent:])
+
+        replies = {}
+        while len(replies) < len(wanted):
+            raw = self.reader.readline()
+            if not raw:
+                raise OSError(errno.ECONNRESET, 'servo daemon closed the connection')
+            reply = json.loads(raw)
+            request_id = reply.get('id') if isinstance(reply, dict) else None
+            if request_id not in wanted or request_id in replies:
+                continue  # not ours — a stale line must never answer a new request
+            # Echo the caller's own id, or none, exactly as a direct request would.
+            if wanted[request_id] is None:
+                del reply['id']
+            else:
+                reply['id'] = wanted[request_id]
+            replies[request_id] = reply
+        return [replies[request_id] for request_id in wanted]
+
+    def hung_up(self):
+        """True if an idle connection has anything to read — the daemon's EOF."""
+        try:
+            return bool(select.select([self.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def close(self):
+        for closer in (self.reader.close, self.sock.close):
+            try:
+                closer()
+            except Exception:
+                pass
+
+
+def _checkout(timeout):
+    """An idle pooled connection if there is one, else a fresh one.
+
+    Returns (connection, reused). Threaded callers beyond the pool size still
+    get a connection of their own — the pool only bounds how many are KEPT.
+    An idle connection the daemon has hung up on is dropped here, before
+    anything is sent on it.
+    """
+    with _pool_lock:
+        while _idle_connections:
+            conn = _idle_connections.pop()
+            if not conn.hung_up():
+                return conn, True
+            conn.close()
+    return _DaemonConnection(timeout), False
+
+
+def _checkin(conn):
+    with _pool_lock:
+        if len(_idle_connections) < DAEMON_POOL_SIZE:
+            _idle_connections.append(conn)
+            return
+    conn.close()
 
-    sock = None
-    try:
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        sock.connect(SERVO_SOCKET_PATH)
-        sock.sendall((json.dumps(payload) + '\n').encode('utf-8'))
 
-        chunks = []
+def _close_pool():
+    with _pool_lock:
+        while _idle_connections:
+            _idle_connections.pop().close()
+
+
+atexit.register(_close_pool)
+
+
+def _daemon_answers(timeout=0.5):
+    try:
+        conn = _DaemonConnection(timeout)
+    except OSError:
+        return False
+    try:
+        reply = conn.exchange([{"cmd": "ping"}], timeout)[0]
+        return reply.get('status') == 'pong'
+    except (OSError, ValueError):
+        return False
+    finally:
+        conn.close()
+
+
+def _wait_ready(proc, deadline):
+    """Read the new daemon's stdout until {"status":"ready"}; False on exit or timeout."""
+    buf = b''
+    while time.monotonic() < deadline:
+        ready, _w, _x = select.select([proc.stdout], [], [], max(0.0, deadline - time.monotonic()))
+        if not ready:
+            break
+        chunk = os.read(proc.stdout.fileno(), 4096)
+        if not chunk:
+            return False
+        buf += chunk
+        while b'\n' in buf:
+            line, buf = buf.split(b'\n', 1)
+            try:
+                if json.loads(line).get('status') == 'ready':
+                    return True
+            except (ValueError, AttributeError):
+                continue
+    return False
+
+
+def _start_daemon():
+    """Start the shared daemon if nobody serves the socket. True once one answers.
+
+    Serialised across processes on a lock file beside the socket: whoever gets
+    it first spawns, everyone queued behind it finds the daemon already up. The
+    daemon is started as jaw_servo_daemon.py (the name singleInstance.js knows
+    how to reap) in its own session with stdin closed, so it runs socket-only
+    and does not die with the CLI call that started it. Its stderr goes to
+    DAEMON_LOG rather than to a caller that is about to exit.
+    """
+    if not _AUTOSTART or _IS_DAEMON:
+        return False
+    try:
+        lock = open(SERVO_SOCKET_PATH + '.lock', 'a')
+    except OSError:
+        return False
+    try:
+        deadline = time.monotonic() + DAEMON_START_TIMEOUT_S
         while True:
-            data = sock.recv(4096)
-            if not data:
-                break
-            chunks.append(data)
-            if b'\n' in data:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
                 break
-        raw = b''.join(chunks).split(b'\n')[0].decode('utf-8').strip()
-        if not raw:
-            _daemon_available = False
-            return None
-        _daemon_available = True
-        return json.loads(raw)
-    except (OSError, socket.timeout, ValueError):
-        # No socket, stale socket, daemon mid-restart — all mean "go direct".
-        _daemon_available = False
-        return None
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.02)
+        if _daemon_answers():
+            return True  # started by whoever held the lock before us
+
+        try:
+            with open(DAEMON_LOG, 'ab') as log:
+                proc = subprocess.Popen(
+                    [sys.executable, DAEMON_SCRIPT, '--no-stdin', '--on-demand'],
+                    stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=log,
+                    env=dict(os.environ, MB_SERVO_SOCKET=SERVO_SOCKET_PATH),
+                    start_new_session=True, close_fds=True)
+        except OSError:
+            return False
+        try:
+            return _wait_ready(proc, deadline)
+        finally:
+            # Nothing more is read from it; the daemon shrugs off the closed pipe.
+            proc.stdout.close()
     finally:
-        if sock is not None:
-            try:
-                sock.close()
-            except Exception:
-                pass
+        lock.close()  # releases the flock
+
+
+def daemon_request_many(payloads, timeout=2.0):
+    """Send several JSON commands to the shared daemon, pipelined on one connection.
+
+    Returns the replies in request order, or None if the daemon is not
+    reachable — the caller then falls back to driving the bus directly. Never
+    raises for a missing daemon: an absent daemon must degrade, not break a
+    servo.
+
+    Connections are kept open between calls, so a process that moves servos
+    repeatedly pays the connect/teardown once, not per move. A pooled
+    connection that turns out to be dead (the daemon restarted, or hung up an
+    idle client) is replaced once, transparently, when that is known to be
+    safe: the batch never left this process, or every command in it is an
+    absolute one (_RESENDABLE) that the daemon may see twice. Otherwise the
+    daemon may already have run part of it, so neither a resend nor the
+    direct path is safe: every command in the batch gets an error reply
+    saying so, and the caller reports it like any rejected command.
+    """
+    global _daemon_available, _daemon_retry_at
+
+    payloads = list(payloads)
+    if _IS_DAEMON or _DIRECT or not payloads:
+        return None
+    if _daemon_available is False and time.monotonic() < _daemon_retry_at:
+        return None
+
+    for attempt in range(2):
+        try:
+            conn, reused = _checkout(timeout)
+        except OSError:
+            if attempt == 0 and _start_daemon():
+                continue
+            break  # no socket, stale socket, daemon mid-restart — all mean "go direct"
+        try:
+            replies = conn.exchange(payloads, timeout)
+        except socket.timeout:
+            conn.close()
+            break  # a daemon that is alive but stuck will not answer a resend either
+        except (OSError, ValueError) as exc:
+            conn.close()
+            resendable = (isinstance(exc, _NotSent)
+                          or all(p.get('cmd') in _RESENDABLE for p in payloads))
+            if not resendable:
+                message = f"servo daemon connection lost after sending ({exc}); not resent"
+                return [dict({'status': 'error', 'message': message},
+                             **({'id': p['id']} if p.get('id') is not None else {}))
+                        for p in payloads]
+            if reused and attempt == 0:
+                # Its idle siblings were opened to the same daemon and are just
+                # as dead; drop them so the retry gets a fresh connection.
+                _close_pool()
+                continue
+            break
+        _checkin(conn)
+        _daemon_available = True
+        return replies
+
+    _daemon_available = False
+    _daemon_retry_at = time.monotonic() + DAEMON_RETRY_S
+    return None
+
+
+def daemon_request(payload, timeout=2.0):
+    """Send one JSON command to the shared servo daemon.
+
+    Returns the decoded reply, or None if the daemon is not reachable. Same
+    pooled, reconnecting transport as daemon_request_many.
+    """
+    replies = daemon_request_many([payload], timeout)
+    return replies[0] if replies else None
 
 
 def daemon_is_available():
@@ -378,7 +848,7 @@ def pca9685_set_angle(channel, angle, i2c_address=PCA9685_DEFAULT_ADDRESS, servo
             return
 
         bus = pca9685_get_bus(i2c_address)
-        pca9685_set_pwm(bus, i2c_address, channel, 0, angle_to_off(angle))
+        pca9685_set_pwm(bus, i2c_address, channel, 0, angle_to_off(angle, channel, i2c_address))
 
         # Brief settle time (reduced from 500ms — the old value caused sluggish response)
         time.sleep(0.05)
@@ -429,7 +899,7 @@ def pca9685_set_angles(pairs, i2c_address=PCA9685_DEFAULT_ADDRESS):
     bus = pca9685_get_bus(i2c_address)
     for ch, angle in pairs:
         try:
-            pca9685_set_pwm(bus, i2c_address, ch, 0, angle_to_off(angle))
+            pca9685_set_pwm(bus, i2c_address, ch, 0, angle_to_off(angle, ch, i2c_address))
             results.append({"channel": ch, "angle": angle, "status": "success"})
         except Exception as e:
             results.append({"channel": ch, "angle": angle, "status": "error", "error": str(e)})
@@ -487,7 +957,8 @@ def pca9685_set_pulse_width(channel, pulse_us, i2c_address=PCA9685_DEFAULT_ADDRE
         raise
 
 
-def pca9685_continuous_rotation(channel, direction, speed, duration_ms, i2c_address=PCA9685_DEFAULT_ADDRESS):
+def pca9685_continuous_rotation(channel, direction, speed, duration_ms,
+                                i2c_address=PCA9685_DEFAULT_ADDRESS, wait=False):
     """
     Control continuous rotation servo via PCA9685
 
@@ -497,11 +968,15 @@ def pca9685_continuous_rotation(channel, direction, speed, duration_ms, i2c_addr
         speed: Speed percentage (0-100)
         duration_ms: Duration in milliseconds
         i2c_address: PCA9685 I2C address
-
-    The duration is honoured by THIS process (it sleeps, then releases the
-    channel) whether or not the daemon is in play. The daemon is only asked to
-    perform the two register writes, so a long rotation can never block servo
-    commands for other channels.
+        wait: block until the rotation is over even when the daemon times it
+
+    With the daemon in play this returns as soon as the rotation has started:
+    the daemon's `rotate` stops the channel on its own timer, whether or not
+    this process is still around. `wait` is for a caller that must hold
+    something for the whole rotation (a power-group lock); if that wait is
+    interrupted the channel is stopped at once. Without the daemon, or for a
+    rotation longer than the daemon times (DAEMON_MAX_ROTATION_S), the
+    duration is honoured by THIS process, which sleeps, then releases.
     """
     bus = None
     safe_channel = None
@@ -514,20 +989,33 @@ def pca9685_continuous_rotation(channel, direction, speed, duration_ms, i2c_addr
         speed = max(0, min(100, int(speed)))
         duration_s = max(0.0, int(duration_ms) / 1000.0)
 
-        # Standard continuous servo range: 1000-2000us, 1500us neutral
-        neutral = 1500
-        min_pulse = 1000
-        max_pulse = 2000
-
-        if direction == 'stop':
-            pulse_us = neutral
-        elif direction == 'cw':
-            pulse_us = int(round(neutral + (max_pulse - neutral) * (speed / 100.0)))
-        else:  # ccw
-            pulse_us = int(round(neutral - (neutral - min_pulse) * (speed / 100.0)))
-
+        pulse_us = continuous_pulse_us(direction, speed)
         off_value = us_to_off(pulse_us)
 
+        if direction != 'stop' and 0 < duration_s <= DAEMON_MAX_ROTATION_S:
+            reply = daemon_request({
+                "cmd": "rotate",
+                "channel": channel,
+                "pulse_us": pulse_us,
+                "duration_ms": int(duration_ms),
+                "address": int(i2c_address)
+            })
+            if reply is not None:
+                if reply.get('status') != 'ok':
+                    raise RuntimeError(reply.get('message', 'servo daemon rejected command'))
+                if wait:
+                    try:
+                        time.sleep(duration_s)  # the daemon stops it on time by itself
+                    except BaseException:
+                        daemon_request({"cmd": "set_raw", "channel": channel, "off": 0,
+                                        "address": int(i2c_address)}, timeout=1.0)
+                        raise
+                log_message({
+                    "status": "success",
+                    "message": f"Continuous servo on channel {channel}: {direction} at {speed}%"
+                })
+                return
+
         def write(off):
             reply = daemon_request({
                 "cmd": "set_raw",
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+Audio levels and the jaw envelope for the servo daemon's jaw stream.
+
+Pure functions and small value objects only — no sockets, no threads, no
+clocks. servo_daemon.py owns the jaw socket and the frame thread; this module
+turns the bytes arriving on it into loudness levels, and a level per frame
+into how far open the jaw is:
+
+  python3 -c "import servo_audio as a; e = a.Envelope(); print([round(e.step(0.3, 0.02), 2) for _ in range(5)])"
+
+The shaping matches what services/jawAnimationSuperPowerService.js does in
+Node (volume gate, gamma below 1 to open the jaw on mid-level speech, a fast
+attack and a slower release), so a character tuned there looks the same when
+its jaw is driven from here.
+
+audioop does the per-window RMS in C where it exists; it is deprecated and
+gone from Python 3.13, and without it the same sums run over an array.
+"""
+
+import math
+import struct
+import warnings
+from array import array
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
+# Stream formats: raw PCM, analysed here, or loudness the client already worked out.
+#   pcm_s16le      mono signed 16-bit samples
+#   pcm_f32le      mono 32-bit float samples, full scale +-1.0
+#   amplitude_u8   one level per byte, 0-255
+#   amplitude_f32  one level per 32-bit float, 0.0-1.0
+FORMATS = ('pcm_s16le', 'pcm_f32le', 'amplitude_u8', 'amplitude_f32')
+_SAMPLE_BYTES = {'pcm_s16le': 2, 'pcm_f32le': 4, 'amplitude_u8': 1, 'amplitude_f32': 4}
+
+DEFAULT_PCM_RATE = 16000
+DEFAULT_AMPLITUDE_RATE = 50
+
+
+def _rms_s16(data):
+    if audioop is not None:
+        return audioop.rms(data, 2) / 32768.0
+    samples = array('h', data)
+    return math.sqrt(sum(s * s for s in samples) / len(samples)) / 32768.0
+
+
+def _rms_f32(data):
+    samples = array('f', data)
+    return min(1.0, math.sqrt(sum(s * s for s in samples) / len(samples)))
+
+
+class LevelDecoder:
+    """Bytes of one stream in, loudness levels (0-1) out, each covering `step_s`.
+
+    PCM is cut into windows of `window_s` and each window becomes its RMS; an
+    amplitude stream is one level per value. Bytes split across reads are
+    carried over, so the caller can hand over whatever recv() returned.
+    """
+
+    __slots__ = ('format', 'rate', 'window_bytes', 'step_s', 'buffer')
+
+    def __init__(self, fmt='pcm_s16le', rate=None, window_s=0.02):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown stream format: {fmt} (use one of {', '.join(FORMATS)})")
+        pcm = fmt.startswith('pcm_')
+        rate = float(rate or (DEFAULT_PCM_RATE if pcm else DEFAULT_AMPLITUDE_RATE))
+        if rate <= 0:
+            raise ValueError('sample_rate must be > 0')
+        self.format = fmt
+        self.rate = rate
+        samples = max(1, int(round(rate * window_s))) if pcm else 1
+        self.window_bytes = samples * _SAMPLE_BYTES[fmt]
+        self.step_s = samples / rate
+        self.buffer = b''
+
+    def levels(self, data):
+        """Every complete window in `data` (plus what was carried over), as levels."""
+        data = self.buffer + data if self.buffer else data
+        usable = len(data) - len(data) % self.window_bytes
+        self.buffer = data[usable:]
+        size = self.window_bytes
+        if self.format == 'amplitude_u8':
+            return [b / 255.0 for b in data[:usable]]
+        if self.format == 'amplitude_f32':
+            return [max(0.0, min(1.0, v)) for (v,) in struct.iter_unpack('<f', data[:usable])]
+        rms = _rms_s16 if self.format == 'pcm_s16le' else _rms_f32
+        return [rms(data[start:start + size]) for start in range(0, usable, size)]
+
+
+class Envelope:
+    """Envelope follower: a loudness level per frame in, jaw openness (0-1) out.
+
+    Levels under `gate` count as silence. Above it the level is scaled by
+    `gain`, capped at 1 and shaped by `gamma`; the openness then rises towards
+    that with time constant `attack_s` and falls with `release_s`, so the jaw
+    snaps open on a syllable and closes a little more lazily.
+    """
+
+    __slots__ = ('attack_s', 'release_s', 'gate', 'gamma', 'gain', 'value')
+
+    def __init__(self, attack_s=0.05, release_s=0.15, gate=0.02, gamma=0.75, gain=1.0):
+        if gamma <= 0 or gain <= 0:
+            raise ValueError('gamma and gain must be > 0')
+        self.attack_s = max(0.0, float(attack_s))
+        self.release_s = max(0.0, float(release_s))
+        self.gate = max(0.0, float(gate))
+        self.gamma = float(gamma)
+        self.gain = float(gain)
+        self.value = 0.0
+
+    def step(self, level, dt):
+        target = 0.0
+        if level >= self.gate and level > 0.0:
+            target = min(1.0, level * self.gain) ** self.gamma
+        tau = self.attack_s if target > self.value else self.release_s
+        if tau > 0.0:
+            self.value += (target - self.value) * (1.0 - math.exp(-dt / tau))
+        else:
+            self.value = target
+        return self.value
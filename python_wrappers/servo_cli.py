@@ -312,8 +312,11 @@ def rotate_continuous_pca(channel, direction, speed, duration_ms, address=None):
             # Go straight to no-pulse: strictly less energy, equally stopped.
             _release_channel(channel, int(address))
         else:
+            # The daemon times the rotation itself, so this returns at once —
+            # unless the rail is shared, when the lock must cover the rotation.
             pca9685_continuous_rotation(channel, direction, max(0, min(100, speed)),
-                                        duration_ms, address)
+                                        duration_ms, address,
+                                        wait=mb_safety.is_power_serialized(safety))
 
     return {
         'part': part.get('id') if part else None,
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+Per-channel servo calibration curves, compiled to off-count lookup tables.
+
+Pure functions and small value objects only — no I2C, no files, no clocks.
+pca9685_control.py loads data/servo_curves.json and keeps the compiled tables;
+the daemon and the direct I2C path both convert through them, so a channel's
+calibration lives in one compiled artifact instead of in Node's per-call math:
+
+  python3 -c "import servo_curves as c; t = c.compile_curve([[0, 560], [90, 1500], [180, 2380]], 'spline', lambda us: int(us / 20000 * 4096)); print(t.off(45.0), t.angle(t.off(45.0)))"
+
+A curve is a list of measured [angle, pulse_us] points. Pulse widths must rise
+or fall strictly with the angle; a falling curve is a servo mounted the other
+way round. "linear" joins the points with straight lines; "spline" is a
+monotone cubic (Fritsch-Carlson), which is smooth through the points but
+never overshoots between them, so no angle in a measured window can map to a
+pulse outside it. Beyond the first and last points the pulse holds at the
+nearest measured end, so a curve measured over part of the travel narrows the
+channel's range and never widens it past what was measured.
+
+The table holds one off-count per RESOLUTION_DEG from 0 to 180 degrees, so
+converting an angle is one index. Off-counts are about 0.5 degrees apart on a
+standard servo, finer than any curve is measured to, so the table loses
+nothing against evaluating the curve per write.
+"""
+
+import bisect
+from array import array
+
+RESOLUTION_DEG = 0.1
+TABLE_STEPS = 1800          # 180 / RESOLUTION_DEG; the table has TABLE_STEPS + 1 entries
+INTERPOLATIONS = ('linear', 'spline')
+MAX_POINTS = 64
+
+
+def parse_label(label):
+    """"address:channel" or "bus:address:channel" -> (bus or None, address, channel).
+
+    The same labels the daemon's `state` reports; an address may be written
+    as 64 or 0x40.
+    """
+    parts = str(label).split(':')
+    if len(parts) not in (2, 3):
+        raise ValueError(f"curve key {label!r} is not address:channel or bus:address:channel")
+    bus = int(parts[0]) if len(parts) == 3 else None
+    address = int(parts[-2], 0)
+    channel = int(parts[-1])
+    if not 0 <= channel <= 15:
+        raise ValueError(f"curve key {label!r}: channel must be 0-15")
+    return bus, address, channel
+
+
+def _validate(points):
+    if not isinstance(points, (list, tuple)) or not 2 <= len(points) <= MAX_POINTS:
+        raise ValueError(f"a curve needs 2-{MAX_POINTS} [angle, pulse_us] points")
+    angles, pulses = [], []
+    for point in points:
+        angle, pulse = float(point[0]), float(point[1])
+        if not 0.0 <= angle <= 180.0:
+            raise ValueError(f"curve angle {angle} is outside 0-180")
+        if pulse <= 0.0:
+            raise ValueError(f"curve pulse {pulse}us must be > 0")
+        angles.append(angle)
+        pulses.append(pulse)
+    if any(b <= a for a, b in zip(angles, angles[1:])):
+        raise ValueError('curve angles must be strictly increasing')
+    rises = [b > a for a, b in zip(pulses, pulses[1:])]
+    if any(b == a for a, b in zip(pulses, pulses[1:])) or len(set(rises)) != 1:
+        raise ValueError('curve pulse widths must rise, or fall, strictly with the angle')
+    return angles, pulses
+
+
+def _tangents(angles, pulses, interpolation):
+    """Fritsch-Carlson tangent at each point for a spline; None for linear."""
+    if interpolation == 'linear' or len(angles) == 2:
+        return None
+    secants = [(pulses[i + 1] - pulses[i]) / (angles[i + 1] - angles[i])
+               for i in range(len(angles) - 1)]
+    tangents = [secants[0]]
+    for before, after in zip(secants, secants[1:]):
+        # Same sign throughout (validated), so the harmonic mean keeps it monotone.
+        tangents.append(2.0 * before * after / (before + after))
+    tangents.append(secants[-1])
+    return tangents
+
+
+def _pulse_at(angle, angles, pulses, tangents):
+    if angle <= angles[0]:
+        return pulses[0]
+    if angle >= angles[-1]:
+        return pulses[-1]
+    i = bisect.bisect_right(angles, angle) - 1
+    span = angles[i + 1] - angles[i]
+    t = (angle - angles[i]) / span
+    if tangents is None:
+        return pulses[i] + (pulses[i + 1] - pulses[i]) * t
+    t2, t3 = t * t, t * t * t
+    return ((2 * t3 - 3 * t2 + 1) * pulses[i] + (t3 - 2 * t2 + t) * span * tangents[i]
+            + (-2 * t3 + 3 * t2) * pulses[i + 1] + (t3 - t2) * span * tangents[i + 1])
+
+
+class Curve:
+    """One channel's compiled curve: angle -> off-count by table, and back.
+
+    `offs` is an array of TABLE_STEPS + 1 off-counts. `angle()` is the inverse
+    used to report where a channel is, or to ease from it: the middle of the
+    run of table entries holding that off-count, clamped to the measured
+    angles (the table is flat beyond them).
+    """
+
+    __slots__ = ('points', 'interpolation', 'offs', 'rising', '_sorted')
+
+    def __init__(self, points, interpolation, offs):
+        self.points = points
+        self.interpolation = interpolation
+        self.offs = offs
+        self.rising = offs[-1] >= offs[0]
+        self._sorted = offs if self.rising else offs[::-1]
+
+    def off(self, angle):
+        index = int(float(angle) / RESOLUTION_DEG + 0.5)
+        return self.offs[0 if index < 0 else TABLE_STEPS if index > TABLE_STEPS else index]
+
+    def angle(self, off):
+        table = self._sorted
+        first = bisect.bisect_left(table, off)
+        last = bisect.bisect_right(table, off) - 1
+        if first > last:
+            # Not in the table: whichever neighbour is nearer.
+            if first == 0:
+                first = last = 0
+            elif first > TABLE_STEPS:
+                first = last = TABLE_STEPS
+            elif table[first] - off >= off - table[first - 1]:
+                first = last = first - 1
+            else:
+                last = first
+        index = (first + last) / 2.0
+        if not self.rising:
+            index = TABLE_STEPS - index
+        return max(self.points[0][0], min(self.points[-1][0], index * RESOLUTION_DEG))
+
+
+def compile_curve(points, interpolation, to_off):
+    """Measured [[angle, pulse_us], ...] -> Curve, through `to_off` (pulse_us -> off-count).
+
+    Raises ValueError for a curve that is not strictly monotonic.
+    """
+    interpolation = str(interpolation or 'linear').lower()
+    if interpolation not in INTERPOLATIONS:
+        raise ValueError(f"Unknown interpolation: {interpolation} (use {' or '.join(INTERPOLATIONS)})")
+    angles, pulses = _validate(points)
+    tangents = _tangents(angles, pulses, interpolation)
+    offs = array('H', (to_off(_pulse_at(step * RESOLUTION_DEG, angles, pulses, tangents))
+                       for step in range(TABLE_STEPS + 1)))
+    return Curve(tuple(zip(angles, pulses)), interpolation, offs)
+
+
+def compile_curves(spec, to_off):
+    """{"label": {"points": [...], "interpolation": "spline"}, ...} -> ({(bus, address, channel): Curve}, errors).
+
+    `bus` is None for a label without one. A bad entry is reported in
+    `errors` and left out, so one typo does not take every other channel's
+    calibration with it.
+    """
+    curves, errors = {}, []
+    for label, entry in (spec or {}).items():
+        if str(label).startswith('_'):
+            continue   # comments and metadata
+        try:
+            if not isinstance(entry, dict):
+                raise ValueError('expected {"points": [...], "interpolation": ...}')
+            curves[parse_label(label)] = compile_curve(entry.get('points'),
+                                                       entry.get('interpolation'), to_off)
+        except (ValueError, TypeError, IndexError) as exc:
+            errors.append(f"{label}: {exc}")
+    return curves, errors
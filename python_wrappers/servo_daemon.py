@@ -20,19 +20,23 @@ motion impossible.
 With a single owner the chip is configured once, and two channels written
 back-to-back under one lock land ~0.3ms apart, which reads as simultaneous.
 
-Front ends (both served at once, both optional)
------------------------------------------------
+Front ends (all served at once, all optional)
+---------------------------------------------
   * Unix socket at $MB_SERVO_SOCKET (default /tmp/monsterbox-servo.sock).
     This is how other *processes* reach the daemon — one-shot CLI invocations,
-    calibration adapters, and Node.
+    calibration adapters, and Node. Threaded by default, or on one asyncio
+    loop with --asyncio (_async_socket_server); {"cmd":"binary"} switches a
+    connection to servo_protocol's framing.
   * stdin/stdout JSON lines. This is the original jaw-daemon protocol and is
     kept byte-for-byte compatible so services/jawServoDaemon.js is unchanged.
+  * a jaw stream socket, only if $MB_SERVO_JAW_SOCKET names one (_serve_jaw).
 
 Protocol (JSON object per line, reply is one JSON object per line)
 ------------------------------------------------------------------
   {"cmd":"ping"}                                    -> {"status":"pong"}
   {"cmd":"set_angle","channel":3,"angle":85}        -> {"status":"ok"}
   {"cmd":"set_angle","channel":3,"angle":85,"min":60,"max":120}
+  {"cmd":"set_part","part":"4","angle":85}         -> {"status":"ok","part":"4","channel":4,...}
   {"cmd":"set_angles","moves":[{"channel":0,"angle":100},
                                {"channel":5,"angle":110}]} -> {"status":"ok","results":[...]}
   {"cmd":"set_pulse","channel":5,"pulse_us":1500}   -> {"status":"ok"}
@@ -40,14 +44,37 @@ Protocol (JSON object per line, reply is one JSON object per line)
   {"cmd":"release","channel":5}                     -> {"status":"ok"}
   {"cmd":"release_all"}                             -> {"status":"ok"}
   {"cmd":"state"}                                   -> {"status":"ok","channels":{...}}
+  {"cmd":"stats"}                                   -> {"status":"ok","stats":{...},...}
+  {"cmd":"move_to","channel":3,"angle":120,"duration_ms":400,"easing":"ease_in_out"}
+  {"cmd":"trajectory","channel":3,"keyframes":[{"t_ms":0,"angle":90}, ...]}
+  {"cmd":"cancel","channel":3}                      -> {"status":"ok","cancelled":[...]}
+  {"cmd":"rotate","channel":7,"direction":"cw","speed":40,"duration_ms":3000}
+  {"cmd":"limits","channel":3,"max_velocity":120,"max_accel":600}
+  {"cmd":"define_pose","name":"alert","moves":[...]}, {"cmd":"pose","name":"alert"}
+  {"cmd":"define_clip","name":"nod","tracks":[...]}, {"cmd":"play","name":"nod"}
+  {"cmd":"library"}, {"cmd":"forget","name":"nod"}
+  {"cmd":"layer","channel":1,"layer":"tracking","angle":95,"rank":80,"fade_ms":200}
+  {"cmd":"idle","channel":1,"amplitude":3,"frequency_hz":0.4}
   {"cmd":"shutdown"}                                -> {"status":"shutdown"}
+  {"cmd":"subscribe"}       (socket only) -> {"status":"ok",...}, then change events
+  {"cmd":"binary"}          (socket only) -> {"status":"ok","protocol":"binary","version":1}
+  {"cmd":"handoff"}         (socket only; what --takeover sends, see _hand_off)
   An optional "id" on any request is echoed back on the reply.
+  Any command may carry "priority": "realtime" | "interactive" | "background".
+  Any command, and any single move or track inside one, may name its chip with
+  "address" (default 0x40) and its I2C bus with "bus" (default: the first in
+  MB_SERVO_BUSES).
+
+Each command's options and behaviour are documented where it is implemented:
+motions, goals, layers and idle under "Motion engine", poses and clips under
+"Pose and clip library", and so on down this file.
 
 Safety
 ------
 This daemon is a transport, not a policy engine. Calibrated bounds and
 config/hardware-safety.json are enforced in Node before a command gets here, and
-that must stay true — the daemon can only ever narrow, never widen:
+that must stay true — set_part applies the same bounds again from the same
+files, and the daemon can only ever narrow, never widen:
   * every angle is clamped to 0-180 unconditionally;
   * an optional per-move min/max is applied on top, and is intersected with,
     never substituted for, the 0-180 clamp;
@@ -55,15 +82,21 @@ that must stay true — the daemon can only ever narrow, never widen:
     commanded to a value that was only half-written.
 """
 
+import asyncio
+import bisect
+import collections
 import errno
 import json
+import math
 import os
+import select
 import signal
 import socket
 import stat
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -71,31 +104,139 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 os.environ['MB_SERVO_DAEMON'] = '1'
 
 from pca9685_control import (  # noqa: E402
+    MODE1_AI,
     PCA9685_DEFAULT_ADDRESS,
+    PCA9685_MODE1,
     SERVO_SOCKET_PATH,
     angle_to_off,
     chip_is_configured,
+    continuous_pulse_us,
+    curves_generation,
+    curves_loaded,
     ensure_chip,
+    off_to_angle,
     open_bus,
+    read_channels,
+    servo_curve,
     us_to_off,
+    write_all_channels,
     write_channel,
+    write_channels,
+    MAX_BLOCK_CHANNELS,
 )
+import servo_audio  # noqa: E402
+import servo_curves  # noqa: E402
+import servo_motion  # noqa: E402
+import servo_protocol  # noqa: E402
+
+# How often the background verifier re-reads each chip's MODE1/PRESCALE. Cheap
+# insurance against some other process resetting it behind our back, and kept
+# entirely off the write path: see _verify_loop.
+VERIFY_INTERVAL_S = float(os.environ.get('MB_SERVO_VERIFY_S', '5'))
+
+# A client that sends nothing for this long is hung up on, in both front ends.
+CLIENT_IDLE_TIMEOUT_S = 30.0
+
+# Executor size for the asyncio front end. Every command that touches a chip
+# serialises on its bus's lock anyway, so more workers only add contention.
+ASYNC_WORKERS = max(1, int(os.environ.get('MB_SERVO_WORKERS', '2')))
+
+# One PCA9685 PWM period at 50Hz. The chip emits one pulse per frame, so there
+# is nothing to gain from updating a channel more often than this.
+FRAME_S = 0.02
+
+# Upper bounds on what one trajectory command may ask for.
+MAX_MOTION_S = 120.0
+MAX_KEYFRAMES = 2000
+
+# Upper bound on the poses and on the clips a client may upload (see _library).
+MAX_LIBRARY_ENTRIES = 256
+
+# Upper bound on the bands of one idle generator.
+MAX_IDLE_BANDS = 8
 
-# Re-verify the chip is still configured at most this often. Cheap insurance
-# against some other process resetting it behind our back; not a hot-path cost.
-VERIFY_INTERVAL_S = 5.0
+# The jaw stream socket (see _jaw_server); opt-in, empty runs without one.
+JAW_SOCKET_PATH = os.environ.get('MB_SERVO_JAW_SOCKET', '')
+
+# A jaw stream whose levels arrive later than this is re-timed to "now"
+# instead of being played back late.
+JAW_MAX_LAG_S = 0.2
+
+# Upper bound on connections subscribed to state changes at once.
+MAX_SUBSCRIBERS = 16
 
-_bus = None
-_bus_lock = threading.RLock()
-_initialized = {}          # i2c_address -> last verification timestamp
-_last_off = {}             # (address, channel) -> last off-count written
 _shutdown_event = threading.Event()
-_stats = {'commands': 0, 'errors': 0, 'reinits': 0, 'started_at': time.time()}
+
+# Set while this daemon hands its socket to a replacement (see _hand_off); the
+# socket servers stop accepting and say so on _accept_stopped.
+_handoff = threading.Event()
+_accept_stopped = threading.Event()
+
+# Set once a socket server is accepting; `ready` is not announced before it.
+_listening = threading.Event()
+
+# Frame-scheduler mode (--frame-scheduler, or MB_SERVO_FRAME_SCHEDULER=1): every
+# write is parked and each bus's frame thread sends the lot once per frame.
+_frame_scheduler = os.environ.get('MB_SERVO_FRAME_SCHEDULER') == '1'
+
+# True for a daemon pca9685_control started on demand (--on-demand). A daemon
+# managed over stdin takes the socket over from one of those on startup.
+_on_demand = False
+_stats = {'commands': 0, 'errors': 0, 'reinits': 0, 'trajectories': 0,
+          'verifications': 0, 'verify_mismatches': 0, 'verify_s': 0.0,
+          'writes': 0, 'transactions': 0, 'block_fallbacks': 0,
+          'writes_skipped': 0, 'writes_deferred': 0, 'writes_coalesced': 0,
+          'write_s': 0.0, 'bursts': 0, 'goals': 0, 'poses': 0, 'clips': 0,
+          'layer_updates': 0, 'jaw_streams': 0, 'jaw_levels': 0,
+          'subscriptions': 0, 'events_sent': 0,
+          'rotations': 0, 'rotation_stops': 0, 'snapshots': 0, 'snapshot_channels': 0,
+          'snapshot_s': 0.0, 'positions_saves': 0, 'positions_save_s': 0.0,
+          'positions_confirmed': 0, 'positions_superseded': 0, 'positions_kept': 0,
+          'started_at': time.time()}
+
+# Command priority classes, most urgent first. Bus access is granted in this
+# order, and a queued realtime command is let in between two transactions of
+# any longer job, so its wait is bounded by one transaction rather than by
+# whatever happens to hold the bus. The stdin jaw protocol is realtime; socket
+# commands are interactive unless they say otherwise (calibration sweeps and
+# tests should say "background"). `stats` reports waits per class under "locks".
+PRIORITIES = ('realtime', 'interactive', 'background')
+REALTIME, INTERACTIVE, BACKGROUND = range(len(PRIORITIES))
+
+# A realtime wait longer than this is counted in `stats` as over budget.
+REALTIME_BUDGET_S = float(os.environ.get('MB_SERVO_REALTIME_BUDGET_MS', '5')) / 1000.0
+
+# Optional periodic dump of the `stats` reply, one JSON line per interval.
+STATS_FILE = os.environ.get('MB_SERVO_STATS_FILE', '')
+STATS_INTERVAL_S = max(1.0, float(os.environ.get('MB_SERVO_STATS_INTERVAL_S', '10')))
+
+# Where the last-driven positions are kept across restarts (see _positions_loop);
+# empty to keep none. Saved at most once per POSITIONS_FLUSH_S, never on the
+# write path.
+POSITIONS_PATH = os.environ.get(
+    'MB_SERVO_POSITIONS',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data',
+                 'servo_positions.json'))
+POSITIONS_FLUSH_S = max(0.05, float(os.environ.get('MB_SERVO_POSITIONS_FLUSH_MS', '1000')) / 1000.0)
+
+# Handing the socket to a replacement daemon (--takeover): how long the old one
+# lets its open connections finish, and how long the new one waits for its state.
+HANDOFF_DRAIN_S = 2.0
+HANDOFF_TIMEOUT_S = 10.0
 
 # Path we successfully bound, or None. Only set while this process is the owner,
 # so cleanup can remove the socket file without probing (and racing) for it.
 _bound_socket_path = None
 
+# The listening socket this daemon accepts on, and one received by --takeover
+# for the socket server to adopt instead of binding a new one.
+_listener = None
+_inherited_listener = None
+
+# Socket client connections currently open, so a handoff can wind them down.
+_clients = set()
+_clients_lock = threading.Lock()
+
 
 def _log(msg):
     """Daemon logging goes to stderr — stdout is the jaw protocol channel."""
@@ -103,87 +244,776 @@ def _log(msg):
     sys.stderr.flush()
 
 
+# ---------------------------------------------------------------------------
+# Instrumentation — where a command's time actually went
+# ---------------------------------------------------------------------------
+
+class _Histogram:
+    """Fixed-bucket latency histogram in milliseconds. Caller serialises record().
+
+    Buckets are coarse and fixed on purpose: recording is an index lookup, so
+    it can sit on every command without becoming the latency it measures, and
+    percentiles read back as "at most this bucket's bound".
+    """
+
+    BOUNDS_MS = (0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    __slots__ = ('counts', 'n', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.n += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def _percentile(self, pct):
+        rank = pct / 100.0 * self.n
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(self.BOUNDS_MS):
+                    return min(self.BOUNDS_MS[index], round(self.max_ms, 3))
+                return round(self.max_ms, 3)
+        return None
+
+    def summary(self):
+        if not self.n:
+            return {'n': 0}
+        labels = [f"<={b}" for b in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}"]
+        return {
+            'n': self.n,
+            'mean_ms': round(self.total_ms / self.n, 3),
+            'p50_ms': self._percentile(50),
+            'p95_ms': self._percentile(95),
+            'p99_ms': self._percentile(99),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': {label: c for label, c in zip(labels, self.counts) if c},
+        }
+
+
+# What the command running on this thread has spent so far, split by kind.
+# dispatch_line and the frame thread set it up; _charge adds to it.
+_call = threading.local()
+
+# command name -> {'total'|'lock_wait'|'i2c': _Histogram}, guarded by _metrics_lock.
+_metrics = {}
+_metrics_lock = threading.Lock()
+MAX_METRIC_NAMES = 64   # unknown commands must not grow this without bound
+
+
+def _begin_call(priority=INTERACTIVE, source=None):
+    _call.spent = {'lock_wait': 0.0, 'i2c': 0.0}
+    _call.priority = priority
+    _call.source = source   # what a subscriber is told caused a write
+
+
+def _charge(kind, seconds):
+    spent = getattr(_call, 'spent', None)
+    if spent is not None:
+        spent[kind] += seconds
+
+
+def _end_call(name, started):
+    """Record the command that ran on this thread since _begin_call."""
+    spent = getattr(_call, 'spent', None)
+    _call.spent = None
+    if spent is None:
+        return
+    total_s = time.perf_counter() - started
+    name = str(name)[:32]
+    with _metrics_lock:
+        if name not in _metrics:
+            if len(_metrics) >= MAX_METRIC_NAMES:
+                name = 'other'
+            _metrics.setdefault(name, {'total': _Histogram(), 'lock_wait': _Histogram(),
+                                       'i2c': _Histogram()})
+        histograms = _metrics[name]
+        histograms['total'].record(total_s * 1000.0)
+        histograms['lock_wait'].record(spent['lock_wait'] * 1000.0)
+        histograms['i2c'].record(spent['i2c'] * 1000.0)
+
+
+class _PriorityLock:
+    """A bus's lock, granted by priority class rather than by arrival order.
+
+    Reentrant, like the RLock it replaces, and used the same way (`with
+    bus.lock:`); the priority comes from the command running on the calling
+    thread (_call.priority). Waiters queue per class, FIFO within a class, and
+    a released lock goes to the oldest waiter of the most urgent class.
+
+    A holder doing a longer job calls yield_to_realtime() between transactions,
+    which steps aside for any queued realtime command and then resumes ahead of
+    everything else in its own class. That is what bounds a jaw update's wait
+    behind a big scene set_angles or release_all.
+
+    Only a caller that actually had to wait is timed; its wait is charged to
+    the command it is running, which is how a caller starving the bus shows up
+    by name. Counters are only touched under the internal condition lock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._owner = None
+        self._owner_priority = None
+        self._depth = 0
+        self._queues = [collections.deque() for _ in PRIORITIES]
+        self.acquisitions = [0] * len(PRIORITIES)
+        self.contended = [0] * len(PRIORITIES)
+        self.wait_s = [0.0] * len(PRIORITIES)
+        self.max_wait_s = [0.0] * len(PRIORITIES)
+        self.max_queued = [0] * len(PRIORITIES)
+        self.waits = [_Histogram() for _ in PRIORITIES]
+        self.yields = 0
+        self.over_budget = 0
+
+    def _is_next(self, me):
+        if self._owner is not None:
+            return False
+        for queue in self._queues:
+            if queue:
+                return queue[0] == me
+        return False
+
+    def _wait_turn(self, me, priority, front=False):
+        """Queue `me` and block until granted. Caller holds self._cond."""
+        queue = self._queues[priority]
+        if front:
+            queue.appendleft(me)
+        else:
+            queue.append(me)
+        self.max_queued[priority] = max(self.max_queued[priority], len(queue))
+        started = time.perf_counter()
+        while not self._is_next(me):
+            self._cond.wait()
+        queue.popleft()
+        self._owner = me
+        self._owner_priority = priority
+        return time.perf_counter() - started
+
+    def acquire(self, priority=INTERACTIVE):
+        me = threading.get_ident()
+        waited = 0.0
+        with self._cond:
+            if self._owner == me:
+                self._depth += 1
+                return
+            self.acquisitions[priority] += 1
+            if self._owner is None and not any(self._queues):
+                self._owner = me
+                self._owner_priority = priority
+            else:
+                waited = self._wait_turn(me, priority)
+                self.contended[priority] += 1
+                self.wait_s[priority] += waited
+                self.max_wait_s[priority] = max(self.max_wait_s[priority], waited)
+                if priority == REALTIME and waited > REALTIME_BUDGET_S:
+                    self.over_budget += 1
+            self.waits[priority].record(waited * 1000.0)
+            self._depth = 1
+        if waited:
+            _charge('lock_wait', waited)
+
+    def release(self):
+        with self._cond:
+            self._depth -= 1
+            if self._depth:
+                return
+            self._owner = None
+            self._owner_priority = None
+            if any(self._queues):
+                self._cond.notify_all()
+
+    def yield_to_realtime(self):
+        """Between transactions: let queued realtime commands run, then resume.
+
+        Returns True if anything ran in between, so the caller knows to recheck
+        what it was about to write. A no-op for a realtime holder.
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if (self._owner != me or self._owner_priority == REALTIME
+                    or not self._queues[REALTIME]):
+                return False
+            depth, priority = self._depth, self._owner_priority
+            self._owner = None
+            self._owner_priority = None
+            self._cond.notify_all()
+            self._wait_turn(me, priority, front=True)
+            self._depth = depth
+            self.yields += 1
+        return True
+
+    def __enter__(self):
+        self.acquire(getattr(_call, 'priority', INTERACTIVE))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+        return False
+
+    def summary(self):
+        with self._cond:
+            classes = {}
+            for index, name in enumerate(PRIORITIES):
+                classes[name] = {
+                    'queued': len(self._queues[index]),
+                    'max_queued': self.max_queued[index],
+                    'acquisitions': self.acquisitions[index],
+                    'contended': self.contended[index],
+                    'wait_ms': round(self.wait_s[index] * 1000.0, 2),
+                    'max_wait_ms': round(self.max_wait_s[index] * 1000.0, 3),
+                    'wait': self.waits[index].summary(),
+                }
+            return {'acquisitions': sum(self.acquisitions), 'contended': sum(self.contended),
+                    'wait_ms': round(sum(self.wait_s) * 1000.0, 2),
+                    'max_wait_ms': round(max(self.max_wait_s) * 1000.0, 3),
+                    'yields_to_realtime': self.yields,
+                    'realtime_over_budget': self.over_budget,
+                    'priorities': classes}
+
+
 # ---------------------------------------------------------------------------
 # Bus ownership
 # ---------------------------------------------------------------------------
 
-def _get_bus():
-    global _bus
-    if _bus is None:
-        _bus = open_bus(1)
-    return _bus
+def _configured_buses():
+    """I2C bus numbers from MB_SERVO_BUSES ("1", or "1,3"); the first is the default.
+
+    Bigger characters need more than one board. Each bus gets its own handle,
+    lock and frame thread (_Bus), so boards on one bus never wait behind
+    another, and a set_angles spanning buses writes each bus's share at the
+    same time. Channels off the default bus are labelled "bus:address:channel".
+
+    A value that does not parse falls back to bus 1 with a warning rather than
+    leaving the box without a servo daemon.
+    """
+    raw = os.environ.get('MB_SERVO_BUSES', '1')
+    numbers = []
+    try:
+        for item in raw.split(','):
+            if item.strip() and int(item) not in numbers:
+                numbers.append(int(item))
+    except ValueError:
+        _log(f"MB_SERVO_BUSES={raw!r} is not a list of bus numbers — using bus 1")
+        return [1]
+    return numbers or [1]
+
+
+class _TimerWheel:
+    """Deadlines per key on a hashed wheel of `slots` ticks of `resolution` seconds.
+
+    Scheduling, moving and cancelling a deadline are a dict and a set operation
+    whatever the number of timers, which is what lets a later command extend a
+    running rotation as often as it likes. A deadline more than one turn away
+    simply stays in its slot until its own turn comes round. Times are whatever
+    clock the caller passes in (the frame thread's time.monotonic()). Caller
+    serialises access (bus.lock).
+    """
+
+    def __init__(self, resolution, slots=256):
+        self.resolution = resolution
+        self.slots = [set() for _ in range(slots)]
+        self.ticks = {}     # key -> absolute tick it fires on
+        self.cursor = self._tick(time.monotonic())
+
+    def _tick(self, t):
+        return int(t / self.resolution)
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def __contains__(self, key):
+        return key in self.ticks
+
+    def keys(self):
+        return list(self.ticks)
+
+    def schedule(self, key, due):
+        """Fire `key` at time `due`, replacing any deadline it already had."""
+        self.cancel(key)
+        # Rounded up: a deadline may fire up to one tick late, never early.
+        tick = max(-int(-due // self.resolution), self.cursor + 1)
+        self.ticks[key] = tick
+        self.slots[tick % len(self.slots)].add(key)
+
+    def cancel(self, key):
+        tick = self.ticks.pop(key, None)
+        if tick is None:
+            return False
+        self.slots[tick % len(self.slots)].discard(key)
+        return True
+
+    def due(self, key):
+        """When `key` fires (to one tick), or None."""
+        tick = self.ticks.get(key)
+        return None if tick is None else tick * self.resolution
+
+    def expire(self, now):
+        """Remove and return every key whose deadline is at or before `now`."""
+        now_tick = self._tick(now)
+        fired = []
+        for step in range(1, min(now_tick - self.cursor, len(self.slots)) + 1):
+            slot = self.slots[(self.cursor + step) % len(self.slots)]
+            for key in [k for k in slot if self.ticks[k] <= now_tick]:
+                slot.discard(key)
+                del self.ticks[key]
+                fired.append(key)
+        self.cursor = max(self.cursor, now_tick)
+        return fired
+
+    def next_due(self):
+        """Time of the soonest deadline within one turn, else of the turn's end; None if empty."""
+        if not self.ticks:
+            return None
+        for step in range(1, len(self.slots) + 1):
+            tick = self.cursor + step
+            if any(self.ticks[k] == tick for k in self.slots[tick % len(self.slots)]):
+                return tick * self.resolution
+        return (self.cursor + len(self.slots)) * self.resolution
+
+
+class _Bus:
+    """One I2C bus: its handle, its lock, and the state of every chip on it.
+
+    Each bus is serialised on its own lock, so a second bus (or a slow board on
+    the first) never waits behind the other. Everything below is guarded by
+    `lock` and keyed by (address, channel); chips are verified per address.
+
+    `motions` are the running server-side motions. Sharing the lock with the
+    writes means a command that preempts a motion and the frame thread that
+    advances it can never interleave a stale frame after the new command.
+
+    `pending` is write coalescing. A channel written less than one PWM frame
+    ago has its next value parked there and flushed by this bus's frame thread
+    once that frame is over; a later value for the same channel replaces it
+    (last writer wins). The chip emits one pulse per frame, so a value that is
+    superseded within a frame was never going to reach the servo anyway.
+
+    `timers` holds the auto-stop deadline of every running `rotate`, fired by
+    the same frame thread.
+
+    `limits` are the per-channel motion limits set with the `limits` command. A
+    set_angle on such a channel becomes a goal (_Goal) in `motions` rather than
+    a write. They are configuration, not chip state, so drop() keeps them.
+
+    `driven` is where each channel was last driven to, the last non-zero
+    off-count that reached it. Unlike `last_off` it survives a release, and a
+    restart (see _positions_loop), so a released servo still has a position;
+    `state` reports it as "driven", in degrees.
+    """
+
+    def __init__(self, number):
+        self.number = number
+        self.lock = _PriorityLock()
+        self.handle = None
+        self.initialized = {}   # i2c_address -> when this daemon configured or adopted it
+        self.dirty = set()      # addresses the verifier found unconfigured; re-init on next use
+        self.frame_at = 0.0     # monotonic time of the frame thread's last motion tick
+        self.last_off = {}      # (address, channel) -> last off-count written or read back
+        self.motions = {}       # (address, channel) -> _Motion, _Goal, _Clip or _Layers
+        self.pending = {}       # (address, channel) -> off-count waiting for its frame
+        self.written_at = {}    # (address, channel) -> monotonic time of the last real write
+        self.channel_writes = {}  # (address, channel) -> writes that reached the chip
+        self.timers = _TimerWheel(FRAME_S)  # (address, channel) -> when its rotation stops
+        self.limits = {}        # (address, channel) -> (max_velocity, max_accel, max_jerk)
+        self.origins = {}       # (address, channel) -> source of a write the frame thread will make
+        self.driven = {}        # (address, channel) -> last non-zero off-count written or read back
+        self.wake = threading.Event()
+
+    def get(self):
+        if self.handle is None:
+            self.handle = open_bus(self.number)
+            # A fresh handle knows nothing the chips are doing; read it back.
+            _snapshot(self)
+        return self.handle
+
+    def drop(self):
+        """Forget the handle so the next command reopens and re-verifies it."""
+        if self.handle is not None:
+            try:
+                self.handle.close()
+            except Exception:
+                pass
+        self.handle = None
+        self.initialized.clear()
+        self.dirty.clear()
+
+
+def _between_frames(bus):
+    """Seconds to wait so a background read lands just after a frame's writes.
+
+    With motions running (or writes parked, in frame-scheduler mode), the frame
+    thread writes at the top of every 20ms frame; a read issued in the first
+    half of the frame is clear of both that write and the next. With nothing
+    moving there is no frame to avoid.
+    """
+    if not bus.motions and not (_frame_scheduler and bus.pending):
+        return 0.0
+    phase = (time.monotonic() - bus.frame_at) % FRAME_S
+    return 0.0 if phase < FRAME_S / 2 else FRAME_S - phase + 0.001
+
+
+def _verify_chip(bus, address):
+    """One background MODE1/PRESCALE check; marks the chip dirty on mismatch."""
+    started = time.perf_counter()
+    _begin_call(BACKGROUND)
+    try:
+        with bus.lock:
+            if address not in bus.initialized or address in bus.dirty or bus.handle is None:
+                return  # dropped or already condemned while we waited for the bus
+            t0 = time.monotonic()
+            configured = chip_is_configured(bus.handle, address)
+            elapsed = time.monotonic() - t0
+            _charge('i2c', elapsed)
+            _stats['verifications'] += 1
+            _stats['verify_s'] += elapsed
+            if not configured:
+                bus.dirty.add(address)
+                _stats['verify_mismatches'] += 1
+                _log(f"verifier: chip 0x{address:02x} on i2c-{bus.number} is not configured "
+                     f"(reset, or unreadable) — re-initialising on next use")
+    finally:
+        _end_call('verify', started)
+
+
+def _verify_loop(bus):
+    """Background chip-health check for one bus, every VERIFY_INTERVAL_S.
+
+    Runs at background priority, one chip per lock hold, timed into the gap
+    between frames, so it waits behind every command and motion tick rather
+    than in front of them. A mismatch only marks the chip dirty; the next
+    write's _ensure re-initialises it, so what happens to the chip still
+    follows from a command, as it always has.
+    """
+    while not _shutdown_event.wait(VERIFY_INTERVAL_S):
+        for address in sorted(bus.initialized):
+            if _shutdown_event.is_set():
+                return
+            delay = _between_frames(bus)
+            if delay:
+                time.sleep(delay)
+            _verify_chip(bus, address)
+
+
+BUS_NUMBERS = _configured_buses()
+DEFAULT_BUS = BUS_NUMBERS[0]
+_buses = {number: _Bus(number) for number in BUS_NUMBERS}
 
+# Runs the per-bus halves of a command that spans buses, one worker per bus.
+_bus_pool = ThreadPoolExecutor(max_workers=len(BUS_NUMBERS), thread_name_prefix='servo-bus')
 
-def _drop_bus():
-    """Forget the bus so the next command reopens and re-verifies it."""
-    global _bus
-    if _bus is not None:
+
+def _configured_addresses():
+    """Chip addresses from MB_SERVO_ADDRESSES ("0x40", or "0x40,0x41") to warm-start.
+
+    Every configured bus is read at each of them; an address with no chip on a
+    bus simply reads back nothing. A value that does not parse falls back to the
+    default address with a warning.
+    """
+    raw = os.environ.get('MB_SERVO_ADDRESSES', f"0x{PCA9685_DEFAULT_ADDRESS:02x}")
+    addresses = []
+    try:
+        for item in raw.split(','):
+            if item.strip() and int(item, 0) not in addresses:
+                addresses.append(int(item, 0))
+    except ValueError:
+        _log(f"MB_SERVO_ADDRESSES={raw!r} is not a list of chip addresses — "
+             f"using 0x{PCA9685_DEFAULT_ADDRESS:02x}")
+        return [PCA9685_DEFAULT_ADDRESS]
+    return addresses or [PCA9685_DEFAULT_ADDRESS]
+
+
+SNAPSHOT_ADDRESSES = _configured_addresses()
+
+
+def _snapshot(bus):
+    """Rebuild bus.last_off from the chips' own PWM registers. Reads only.
+
+    A restarted daemon, or one that has just reopened a bus after an I2C error,
+    otherwise starts from nothing: `state` is empty, the first write to every
+    channel cannot be skipped as redundant, and a move_to has no position to
+    ease from. The chips still hold every channel's last command, so ask them —
+    two block reads per chip, and not one register written.
+
+    A chip that is asleep or at the wrong prescale is driving nothing, so
+    whatever this daemon remembered for it, where its channels were last
+    driven included, is forgotten, and its first write initialises it as
+    before. A configured chip is adopted without a word to
+    it. A channel with a non-zero ON count was set up by someone else and is
+    left unknown rather than guessed at. Caller holds bus.lock.
+
+    The first snapshot of a bus after startup is also checked against the
+    positions the last daemon saved (_cross_check).
+    """
+    started = time.monotonic()
+    restored = 0
+    read_back = set()
+    for address in SNAPSHOT_ADDRESSES:
         try:
-            _bus.close()
-        except Exception:
-            pass
-    _bus = None
-    _initialized.clear()
+            configured = chip_is_configured(bus.handle, address)
+            if configured:
+                mode1 = bus.handle.read_byte_data(address, PCA9685_MODE1)
+                channels = read_channels(bus.handle, address,
+                                         auto_increment=bool(mode1 & MODE1_AI))
+        except OSError as exc:
+            _log(f"snapshot: chip 0x{address:02x} on i2c-{bus.number} unreadable ({exc})")
+            continue
+        for key in [k for k in bus.last_off if k[0] == address]:
+            del bus.last_off[key]
+        read_back.add(address)
+        if not configured:
+            # Power-cycled or never set up: it has driven nothing since.
+            for key in [k for k in bus.driven if k[0] == address]:
+                del bus.driven[key]
+            continue
+        for channel, (on, off) in enumerate(channels):
+            if on == 0:
+                bus.last_off[(address, channel)] = off
+                if off:
+                    bus.driven[(address, channel)] = off
+                restored += 1
+        if mode1 & MODE1_AI:
+            # Nothing left for _ensure to do; without AI it still sets the bit.
+            bus.initialized.setdefault(address, time.time())
+    elapsed = time.monotonic() - started
+    _charge('i2c', elapsed)
+    _stats['snapshots'] += 1
+    _stats['snapshot_channels'] += restored
+    _stats['snapshot_s'] += elapsed
+    _log(f"snapshot of i2c-{bus.number}: {restored} channel(s) restored "
+         f"in {elapsed * 1000.0:.1f}ms")
+    saved = _saved_positions.pop(bus.number, None)
+    if saved:
+        _cross_check(bus, saved, read_back)
+
+
+def _warm_start():
+    """Open every bus and snapshot its chips before the daemon reports ready.
+
+    A bus that cannot be opened yet is logged and left closed; its first
+    command opens it, and takes the snapshot then.
+    """
+    for bus in _buses.values():
+        with bus.lock:
+            try:
+                bus.get()
+            except (OSError, ImportError) as exc:
+                _log(f"could not open i2c-{bus.number} at startup ({exc}) — "
+                     f"opening it on first use")
 
 
-def _ensure(address):
-    """Make sure the chip at `address` is usable, disturbing it as little as possible."""
-    now = time.time()
-    last = _initialized.get(address)
-    if last is not None and (now - last) < VERIFY_INTERVAL_S:
-        return
+# ---------------------------------------------------------------------------
+# Last positions — kept across restarts
+# ---------------------------------------------------------------------------
+
+# Set by _committed when a write reaches a chip; _positions_loop clears it and saves.
+_positions_dirty = threading.Event()
+_positions_save_lock = threading.Lock()
+
+# What POSITIONS_PATH held at startup: {bus number: {(address, channel): (off, driven)}}.
+# Each bus's first _snapshot takes its share and checks it against the chips.
+_saved_positions = {}
 
-    bus = _get_bus()
-    if last is not None:
-        # Already ours — a cheap read-only check is enough. Only a chip that has
-        # actually been reset gets the disruptive sequence.
-        if chip_is_configured(bus, address):
-            _initialized[address] = now
+
+def _load_positions(path):
+    """The positions file at `path` -> {bus number: {(address, channel): (off, driven)}}.
+
+    No file is a first start. A file that cannot be read or parsed is logged
+    and ignored: the chips are read back either way, so all that is lost is
+    where the released channels were last driven to.
+    """
+    try:
+        with open(path) as handle:
+            saved = json.load(handle)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        _log(f"positions: ignoring {path} ({exc})")
+        return {}
+    if (not isinstance(saved, dict) or saved.get('version') != 1
+            or not isinstance(saved.get('channels'), dict)):
+        _log(f"positions: {path} is not a version 1 positions file — ignoring it")
+        return {}
+    positions = {}
+    for label, entry in saved['channels'].items():
+        try:
+            number, address, channel = servo_curves.parse_label(label)
+            if not isinstance(entry, list):
+                raise TypeError('expected [off, driven]')
+            off, driven = (None if value is None else int(value) for value in entry)
+        except (ValueError, TypeError) as exc:
+            _log(f"positions: skipping {label!r} in {path} ({exc})")
+            continue
+        number = DEFAULT_BUS if number is None else number
+        positions.setdefault(number, {})[(address, channel)] = (off, driven)
+    age_s = time.time() - float(saved.get('saved_at') or 0.0)
+    _log(f"positions: {sum(map(len, positions.values()))} channel(s) from {path}, "
+         f"saved {age_s:.0f}s ago")
+    return positions
+
+
+def _cross_check(bus, saved, read_back):
+    """Lay the positions the last daemon saved over what the chips were just read back as.
+
+    The chip is the authority for any channel it could be read for: a saved
+    value it agrees with is confirmed, one it contradicts (someone wrote the
+    chip while no daemon was running, or the chip was power-cycled) is logged
+    and dropped. The file only ever fills in `driven` — for a channel that
+    reads back released, or whose chip is unreadable, it is the last position
+    anyone knows of. A chip found asleep has been power-cycled or never set up
+    and drove nothing, so its saved positions are dropped. `last_off` stays
+    what the chips say it is.
+    Caller holds bus.lock.
+    """
+    confirmed = superseded = kept = 0
+    for key, (off, driven) in saved.items():
+        if key[0] in read_back:
+            held = bus.last_off.get(key)
+            if held is None:
+                continue   # set up by someone else; see _snapshot
+            if held == off:
+                confirmed += 1
+            else:
+                superseded += 1
+                _log(f"positions: {_label(bus, *key)} was saved at off={off}, "
+                     f"the chip holds off={held} — going by the chip")
+            if held:
+                continue   # driven is already what the chip holds
+        if driven and key not in bus.driven:
+            bus.driven[key] = driven
+            kept += 1
+    _stats['positions_confirmed'] += confirmed
+    _stats['positions_superseded'] += superseded
+    _stats['positions_kept'] += kept
+    _log(f"positions on i2c-{bus.number}: {confirmed} confirmed by the chips, "
+         f"{superseded} superseded, {kept} last-driven position(s) kept from the file")
+
+
+def _save_positions(path):
+    """Write every bus's last_off and driven to `path`: temp file, fsync, rename.
+
+    Readers, and the next daemon, see the old file or the new one, never half
+    of one. The bus locks are held only long enough to copy two dicts, at
+    background priority.
+    """
+    started = time.perf_counter()
+    _begin_call(BACKGROUND)
+    try:
+        channels = {}
+        for bus in _buses.values():
+            with bus.lock:
+                last_off, driven = dict(bus.last_off), dict(bus.driven)
+            for key in sorted(set(last_off) | set(driven)):
+                channels[_label(bus, *key)] = [last_off.get(key), driven.get(key)]
+        temp = f"{path}.{os.getpid()}.tmp"
+        with _positions_save_lock:
+            with open(temp, 'w') as handle:
+                json.dump({'version': 1, 'saved_at': round(time.time(), 3),
+                           'channels': channels}, handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp, path)
+        _stats['positions_saves'] += 1
+        _stats['positions_save_s'] += time.perf_counter() - started
+    finally:
+        _end_call('positions', started)
+
+
+def _positions_loop(path):
+    """Write-behind saver for the last positions, at most once per POSITIONS_FLUSH_S.
+
+    The file is POSITIONS_PATH (data/servo_positions.json, $MB_SERVO_POSITIONS;
+    empty keeps nothing), the interval MB_SERVO_POSITIONS_FLUSH_MS (default
+    1000). At startup it is checked against the chips' readback (_cross_check).
+
+    A write that reaches a chip only sets a flag (_committed). This thread
+    wakes on it, lets the rest of the flush interval go by so a whole gesture's
+    worth of writes lands in one save, then saves. So the write path never
+    waits on the disk, and a show costs one fsync per interval at most, none
+    while nothing moves. A save that fails is logged once and retried the next
+    interval; main() saves whatever is left at shutdown.
+    """
+    failing = False
+    while _positions_dirty.wait():
+        if _shutdown_event.wait(POSITIONS_FLUSH_S):
             return
-        _log(f"chip at 0x{address:02x} lost its configuration — re-initialising")
-        _stats['reinits'] += 1
+        _positions_dirty.clear()
+        try:
+            _save_positions(path)
+            failing = False
+        except OSError as exc:
+            if not failing:
+                _log(f"positions: cannot save to {path}: {exc}")
+            failing = True
+            _positions_dirty.set()
+
+
+def _ensure(bus, address):
+    """Make sure the chip at `address` is usable, disturbing it as little as possible.
 
-    state = ensure_chip(bus, address)
-    _initialized[address] = now
+    On the write path this is a set lookup. Only a chip the daemon has not
+    taken on yet, or one the background verifier has marked dirty, costs any
+    I2C here; periodic re-verification never lands in front of a command.
+    """
+    if address in bus.initialized and address not in bus.dirty:
+        return
+
+    handle = bus.get()
+    if address in bus.dirty:
+        _log(f"chip at 0x{address:02x} on i2c-{bus.number} lost its configuration "
+             f"— re-initialising")
+    # Read-only when the chip is still configured: only a chip that has actually
+    # been reset gets the disruptive sequence.
+    state = ensure_chip(handle, address)
+    bus.initialized[address] = time.time()
+    bus.dirty.discard(address)
     if state == 'initialized':
         _stats['reinits'] += 1
-    _log(f"chip 0x{address:02x} {state}")
+        # A reset chip comes back with every channel off. What we remember
+        # writing is no longer on it, and must not be used to skip a write.
+        for key in [k for k in bus.last_off if k[0] == address]:
+            del bus.last_off[key]
+    _log(f"chip 0x{address:02x} on i2c-{bus.number} {state}")
 
 
-_broken_cache = {'at': 0.0, 'channels': {}}
-BROKEN_REFRESH_S = 30.0
+_broken_unreadable = False
 
 
 def _broken_channels():
-    """{channel: reason} for parts declared physically broken, cached briefly.
+    """{channel: reason} for parts declared physically broken.
+
+    Asked on every write. mb_safety keeps parts.json and physical-faults.json
+    parsed and indexed and re-reads them only when they change on disk, so this
+    is a dict lookup, and an operator's edit applies within a fraction of a
+    second instead of whenever a timed cache happened to expire.
 
-    Cheap and fail-open on error: a daemon that cannot read the fault list must not
-    stop driving healthy hardware mid-show.
+    Fail-open on error: a daemon that cannot read the fault list must not
+    stop driving healthy hardware mid-show. That is logged once per outage,
+    not once per write.
     """
-    now = time.time()
-    if (now - _broken_cache['at']) < BROKEN_REFRESH_S:
-        return _broken_cache['channels']
-    channels = {}
+    global _broken_unreadable
     try:
         import mb_safety
         channels = mb_safety.broken_channels(mb_safety.resolve_character_id())
     except Exception as exc:
-        _log(f"could not read physical-faults ({exc}) — not denying any channel")
-    _broken_cache['at'] = now
-    _broken_cache['channels'] = channels
+        if not _broken_unreadable:
+            _log(f"could not read physical-faults ({exc}) — not denying any channel")
+        _broken_unreadable = True
+        return {}
+    _broken_unreadable = False
     return channels
 
 
-def _write(address, channel, off):
-    """One guarded channel write. Releases the channel if it cannot be trusted.
-
-    This daemon is the only PERSISTENT holder of /dev/i2c-1, so every lasting
-    channel state on the chip passes through here. Set MB_SERVO_TRACE=1 to log each
-    write. That exists because a channel belonging to a physically damaged part kept
-    ending up energized during a full test-suite run with no corresponding entry in
-    the Node-side log — the Node layer logs its own intent, not what actually
-    reached the chip, so attribution needs a probe at this boundary.
-    """
+def _refused(channel, off):
+    """True if this write must not reach the chip (and says why, on stderr)."""
     # LAST LINE OF DEFENCE: never energize a channel owned by a physically broken
     # part. Releasing one (off == 0) is always allowed.
     #
@@ -195,7 +1025,8 @@ def _write(address, channel, off):
     # boundary proved the daemon really did receive channel 4 twice. Rather than keep
     # hunting the caller, the deny lives where every caller must pass: this is the
     # only persistent owner of /dev/i2c-1, and the stdin jaw protocol, the unix
-    # socket, and one-shot CLI invocations all funnel through here.
+    # socket, and one-shot CLI invocations all funnel through here — every write,
+    # single or batched, goes through _write or _write_many, and both ask this first.
     #
     # Consistent with the daemon's stated contract — "can only ever narrow, never
     # widen" — exactly like the unconditional 0-180 clamp above it.
@@ -208,29 +1039,239 @@ def _write(address, channel, off):
         if denied:
             _log(f"REFUSED ch{channel} off={off} — {denied}. "
                  f"Clear it in config/physical-faults.json once repaired.")
-            return
+            return True
+    return False
+
+
+def _admit(bus, key, off, coalesce, now):
+    """Decide whether a write goes to the bus now. Caller has run _ensure.
+
+    Returns False for a write that is redundant (the chip already holds that
+    off-count) or that lands within one PWM frame of the previous write to the
+    channel — that one is parked in bus.pending for the frame thread instead.
+    In frame-scheduler mode every write is parked, however long ago the last one was.
+    """
+    if coalesce and key in bus.pending:
+        bus.pending[key] = off
+        _stats['writes_coalesced'] += 1
+        if _subscribers:
+            bus.origins[key] = getattr(_call, 'source', None)
+        return False
+    if off == bus.last_off.get(key):
+        _stats['writes_skipped'] += 1
+        return False
+    if coalesce and (_frame_scheduler or now - bus.written_at.get(key, float('-inf')) < FRAME_S):
+        bus.pending[key] = off
+        _stats['writes_deferred'] += 1
+        if _subscribers:
+            bus.origins[key] = getattr(_call, 'source', None)
+        bus.wake.set()
+        return False
+    return True
+
+
+def _trace(bus, address, channel, off):
+    if os.environ.get('MB_SERVO_TRACE') == '1':
+        _log(f"TRACE write ch{channel} off={off} "
+             f"({off / 4096.0 * 20000.0:.1f}us) addr=0x{address:02x} bus={bus.number}")
+
+
+def _committed(bus, address, channels, offs, started):
+    """Record channel writes that reached the chip in one transaction."""
+    for channel, off in zip(channels, offs):
+        key = (address, channel)
+        bus.last_off[key] = off
+        if off:
+            bus.driven[key] = off
+        bus.written_at[key] = started
+        bus.channel_writes[key] = bus.channel_writes.get(key, 0) + 1
+    elapsed = time.monotonic() - started
+    _stats['writes'] += len(channels)
+    _stats['transactions'] += 1
+    _stats['write_s'] += elapsed
+    _charge('i2c', elapsed)
+    if not _positions_dirty.is_set():
+        _positions_dirty.set()
+    if _subscribers:
+        _publish(bus, address, channels, offs)
+
+
+def _write(bus, address, channel, off, coalesce=True):
+    """One guarded channel write. Releases the channel if it cannot be trusted.
+
+    A write of the off-count the channel already holds is skipped, and a write
+    landing within one PWM frame of the previous one for the same channel is
+    deferred to the frame thread (coalesce=False is how that thread, which is
+    frame-aligned already, writes through). Both show up in `stats`.
+
+    This daemon is the only PERSISTENT holder of /dev/i2c-*, so every lasting
+    channel state on the chip passes through here. Set MB_SERVO_TRACE=1 to log each
+    write. That exists because a channel belonging to a physically damaged part kept
+    ending up energized during a full test-suite run with no corresponding entry in
+    the Node-side log — the Node layer logs its own intent, not what actually
+    reached the chip, so attribution needs a probe at this boundary.
+    """
+    if _refused(channel, off):
+        return
 
+    key = (address, channel)
     try:
-        _ensure(address)
-        if os.environ.get('MB_SERVO_TRACE') == '1':
-            _log(f"TRACE write ch{channel} off={off} "
-                 f"({off / 4096.0 * 20000.0:.1f}us) addr=0x{address:02x}")
-        write_channel(_get_bus(), address, channel, 0, off)
-        _last_off[(address, channel)] = off
+        # Verified even when the write turns out to be redundant: a chip reset
+        # behind our back forgets bus.last_off, so the write below is not skipped.
+        _ensure(bus, address)
+        now = time.monotonic()
+        if not _admit(bus, key, off, coalesce, now):
+            return
+        _trace(bus, address, channel, off)
+        write_channel(bus.get(), address, channel, 0, off)
+        _committed(bus, address, (channel,), (off,), now)
     except OSError as exc:
         _stats['errors'] += 1
-        _log(f"I2C error on ch{channel}: {exc} — releasing channel")
+        _log(f"I2C error on ch{channel} (i2c-{bus.number}): {exc} — releasing channel")
         # Fail safe: a half-written channel is a pulse width nobody chose.
         # Stop driving it rather than leave it at an unknown command.
         try:
-            write_channel(_get_bus(), address, channel, 0, 0)
+            write_channel(bus.get(), address, channel, 0, 0)
         except Exception:
             pass
-        _last_off.pop((address, channel), None)
-        _drop_bus()
+        bus.last_off.pop(key, None)
+        bus.pending.pop(key, None)
+        bus.drop()
         raise
 
 
+def _contiguous_runs(channels):
+    """[0,1,2,5,6,9] -> [[0,1,2],[5,6],[9]], each run at most MAX_BLOCK_CHANNELS."""
+    runs = []
+    for channel in sorted(channels):
+        if runs and channel == runs[-1][-1] + 1 and len(runs[-1]) < MAX_BLOCK_CHANNELS:
+            runs[-1].append(channel)
+        else:
+            runs.append([channel])
+    return runs
+
+
+def _write_many(bus, address, offs, coalesce=True):
+    """Write several channels of one chip in the fewest I2C transactions.
+
+    `offs` is {channel: off}. Every channel gets exactly the treatment _write
+    would give it — broken-part deny, dedup, frame coalescing — and what is left
+    goes out as one block write per run of adjacent channels, or as a single
+    ALL_LED write when all sixteen channels take the same value.
+
+    Error isolation is per channel, as if each had been written alone: a block
+    that fails is retried channel by channel through _write, so only the
+    channel that really cannot be written is released and reported. Returns
+    {channel: exception} for the channels that failed.
+    """
+    errors = {}
+    try:
+        _ensure(bus, address)
+    except OSError:
+        # Nothing has been written; let each channel find and report its own fate.
+        for channel, off in offs.items():
+            try:
+                _write(bus, address, channel, off, coalesce)
+            except Exception as exc:
+                errors[channel] = exc
+        return errors
+
+    now = time.monotonic()
+    due = {}
+    for channel, off in offs.items():
+        if _refused(channel, off):
+            continue
+        if _admit(bus, (address, channel), off, coalesce, now):
+            due[channel] = off
+    if not due:
+        return errors
+
+    if len(due) == 16 and len(set(due.values())) == 1:
+        runs = [sorted(due)]
+    else:
+        runs = _contiguous_runs(due)
+
+    for index, run in enumerate(runs):
+        if index and bus.lock.yield_to_realtime():
+            # A realtime command wrote in between. Whatever it touched is newer
+            # than this job and must not be overwritten by it.
+            run = [channel for channel in run
+                   if bus.written_at.get((address, channel), float('-inf')) < now
+                   and (address, channel) not in bus.pending]
+            if not run:
+                continue
+        values = [due[channel] for channel in run]
+        started = time.monotonic()
+        try:
+            for channel, off in zip(run, values):
+                _trace(bus, address, channel, off)
+            if len(run) == 16:
+                write_all_channels(bus.get(), address, 0, values[0])
+            else:
+                write_channels(bus.get(), address, run[0], values)
+        except OSError as exc:
+            _stats['errors'] += 1
+            _stats['block_fallbacks'] += 1
+            _log(f"I2C error on block ch{run[0]}-ch{run[-1]}: {exc} — "
+                 f"rewriting those channels one at a time")
+            for channel, off in zip(run, values):
+                try:
+                    _write(bus, address, channel, off, coalesce=False)
+                except Exception as channel_exc:
+                    errors[channel] = channel_exc
+            continue
+        _committed(bus, address, run, values, started)
+    return errors
+
+
+def _write_chips(bus, chips):
+    """One bus's share of a batched write: {address: {channel: off}}.
+
+    Running motions on those channels are preempted, and the whole share goes
+    out under one hold of the bus lock. Returns {(address, channel): exception}.
+    """
+    errors = {}
+    with bus.lock:
+        for address, offs in chips.items():
+            for channel in offs:
+                _cancel_motion(bus, address, channel)
+        for address, offs in chips.items():
+            for channel, exc in _write_many(bus, address, offs).items():
+                errors[(address, channel)] = exc
+    return errors
+
+
+def _charged_on_worker(priority, fn, *args):
+    """Run fn on a pool worker at the caller's priority; hand back what it spent."""
+    _begin_call(priority)
+    try:
+        return fn(*args), _call.spent
+    finally:
+        _call.spent = None
+
+
+def _write_across_buses(groups):
+    """Batched write spanning buses: {_Bus: {address: {channel: off}}}.
+
+    Separate buses are separate wires with separate locks, so each bus's share
+    runs on its own worker and a move spanning two buses costs the slower
+    bus's time rather than the sum. Returns {(bus, address, channel): exception}.
+    """
+    if len(groups) == 1:
+        jobs = [(bus, _write_chips(bus, chips)) for bus, chips in groups.items()]
+    else:
+        priority = getattr(_call, 'priority', INTERACTIVE)
+        futures = [(bus, _bus_pool.submit(_charged_on_worker, priority, _write_chips, bus, chips))
+                   for bus, chips in groups.items()]
+        jobs = []
+        for bus, future in futures:
+            errors, spent = future.result()
+            for kind, seconds in spent.items():
+                _charge(kind, seconds)
+            jobs.append((bus, errors))
+    return {(bus.number,) + key: exc for bus, errors in jobs for key, exc in errors.items()}
+
+
 def _clamp_angle(angle, lo=None, hi=None):
     """0-180 always; an optional caller window narrows it further, never widens."""
     angle = max(0.0, min(180.0, float(angle)))
@@ -242,13 +1283,38 @@ def _clamp_angle(angle, lo=None, hi=None):
     return max(0.0, min(180.0, angle))
 
 
-def _address_of(cmd):
-    address = cmd.get('address', PCA9685_DEFAULT_ADDRESS)
+def _address_of(cmd, outer=None):
+    """The chip a command (or one move inside it) targets; a move inherits `outer`'s."""
+    address = cmd.get('address')
+    if address is None and outer is not None:
+        address = outer.get('address')
+    if address is None:
+        address = PCA9685_DEFAULT_ADDRESS
     if isinstance(address, str):
         address = int(address, 0)
     return int(address)
 
 
+def _bus_of(cmd, outer=None):
+    """The _Bus a command (or one move inside it) targets; default is the first configured."""
+    number = cmd.get('bus')
+    if number is None and outer is not None:
+        number = outer.get('bus')
+    number = DEFAULT_BUS if number is None else int(number)
+    bus = _buses.get(number)
+    if bus is None:
+        raise ValueError(f"I2C bus {number} is not configured "
+                         f"(MB_SERVO_BUSES has {','.join(map(str, BUS_NUMBERS))})")
+    return bus
+
+
+def _label(bus, address, channel):
+    """"address:channel" as `state` and `cancel` report it, prefixed by the bus off the default."""
+    if bus.number == DEFAULT_BUS:
+        return f"{address}:{channel}"
+    return f"{bus.number}:{address}:{channel}"
+
+
 def _validate_channel(channel):
     channel = int(channel)
     if not 0 <= channel <= 15:
@@ -256,10 +1322,963 @@ def _validate_channel(channel):
     return channel
 
 
+def _part_move(cmd):
+    """set_part's part id resolved to (bus, address, channel, angle, lo, hi, part).
+
+    Resolution is mb_safety.servo_part(), cached per version of parts.json,
+    calibration_profiles.json and hardware-safety.json. The order is Node's:
+    the angle is clamped to the part's window (and the caller's min/max, in
+    the same, uninverted degrees), an inverted part is then mirrored within its
+    calibrated bounds, and the part's window goes along as the write's own
+    min/max. A quarantined part, or one that is not a servo on a channel, is
+    refused.
+    """
+    import mb_safety
+    character = mb_safety.resolve_character_id(cmd.get('character'))
+    part = mb_safety.servo_part(character, cmd['part'])
+    if part is None:
+        raise ValueError(f"No part {cmd['part']} in character {character}'s parts.json")
+    if part['type'] not in mb_safety.ANGULAR_TYPES or part['controller'] not in ('pca9685', ''):
+        raise ValueError(f"Part {part['id']} ({part['name']}) is not a PCA9685 servo")
+    if part['channel'] is None:
+        raise ValueError(f"Part {part['id']} ({part['name']}) has no channel in parts.json")
+    if part['blocked']:
+        raise ValueError(part['blocked'])
+    channel = _validate_channel(part['channel'])
+    address = part['address'] if part['address'] is not None else _address_of(cmd)
+    lo, hi = part['min'], part['max']
+    angle = _clamp_angle(_clamp_angle(cmd['angle'], cmd.get('min'), cmd.get('max')), lo, hi)
+    if part['mirror'] is not None:
+        angle = part['mirror'][0] + part['mirror'][1] - angle
+    return _bus_of(cmd), address, channel, angle, lo, hi, part
+
+
+# ---------------------------------------------------------------------------
+# Motion engine — trajectories interpolated here, on a fixed frame clock
+# ---------------------------------------------------------------------------
+
+class _Motion:
+    """A keyframed track running on one channel, with its caller's window."""
+
+    __slots__ = ('track', 'started', 'lo', 'hi')
+
+    def __init__(self, track, lo, hi):
+        self.track = track
+        self.started = time.monotonic()
+        self.lo = lo
+        self.hi = hi
+
+    def position(self, now):
+        return self.track.sample(now - self.started)
+
+    def velocity(self, now):
+        """Degrees per second over the last frame, so a goal taking over keeps going."""
+        elapsed = now - self.started
+        if elapsed >= self.track.duration:
+            return 0.0
+        return (self.track.sample(elapsed) - self.track.sample(elapsed - FRAME_S)) / FRAME_S
+
+    def advance(self, now, curve):
+        """(off-count for this frame, whether the motion is over), through the channel's `curve`."""
+        elapsed = now - self.started
+        angle = _clamp_angle(self.track.sample(elapsed), self.lo, self.hi)
+        return _curve_off(curve, angle), elapsed >= self.track.duration
+
+
+class _Goal:
+    """A set_angle on a channel with motion limits, followed one frame at a time.
+
+    A channel given limits (max_velocity in deg/s, max_accel in deg/s^2,
+    optionally "profile":"s_curve" with a max_jerk) no longer steps to a
+    set_angle or set_angles target: the target becomes its goal, and the
+    frame thread walks it there, trapezoidal or S-shaped. A new goal mid-move
+    carries on from the current position and speed, so the caller only ever
+    sends where a part should end up. `state` lists goals under "seeking".
+    move_to and trajectory keep their own timing, set_raw/set_pulse still
+    write at once, and "clear": true puts a channel back to plain writes.
+
+    The profile advances exactly FRAME_S per frame tick rather than by the wall
+    clock, so a frame thread running late slows the move instead of jumping it.
+    """
+
+    __slots__ = ('profile', 'lo', 'hi')
+
+    def __init__(self, profile, lo, hi):
+        self.profile = profile
+        self.lo = lo
+        self.hi = hi
+
+    def position(self, _now):
+        return self.profile.position
+
+    def velocity(self, _now):
+        return self.profile.velocity
+
+    def advance(self, _now, curve):
+        angle = _clamp_angle(self.profile.step(), self.lo, self.hi)
+        return _curve_off(curve, angle), self.profile.done
+
+
+class _Clip:
+    """One track of a library clip playing on one channel (see _compile_clip).
+
+    Every frame is a lookup in the track's precompiled off-count table, not an
+    easing evaluation; a clip played at another speed reads between two
+    entries. The Track is kept for where a later command takes over from.
+    """
+
+    __slots__ = ('table', 'track', 'scale', 'started')
+
+    def __init__(self, table, track, scale):
+        self.table = table
+        self.track = track
+        self.scale = scale
+        self.started = time.monotonic()
+
+    def position(self, now):
+        return self.track.sample((now - self.started) * self.scale)
+
+    def velocity(self, now):
+        elapsed = (now - self.started) * self.scale
+        if elapsed >= self.track.duration:
+            return 0.0
+        step = FRAME_S * self.scale
+        return (self.track.sample(elapsed) - self.track.sample(elapsed - step)) / FRAME_S
+
+    def advance(self, now, _curve):
+        index = (now - self.started) * self.scale / FRAME_S
+        last = len(self.table) - 1
+        if index >= last:
+            return self.table[last], True
+        whole = int(index)
+        off, following = self.table[whole], self.table[whole + 1]
+        return int(round(off + (following - off) * (index - whole))), False
+
+
+class _Layers:
+    """Every source's layer on one channel, blended to one value each frame.
+
+    Sources that share a channel (a base pose, idle noise, a gesture, head
+    tracking) each own a named layer instead of taking turns sending absolute
+    angles. A layer is an absolute angle or an additive offset with a
+    "rank" and a weight (0-1): absolute layers blend in rank order,
+    each pulling the value towards its angle by its weight, and additive
+    layers go on top. Weights ramp over fade_ms, in and out. A command other
+    than `layer` takes the channel back, as it would from a motion. The rank
+    is not "priority": that key is the command's scheduling class, on `layer`
+    as on any other command (_priority_of).
+
+    `floor` is where the channel was when its first layer arrived, the value
+    absolute layers blend up from (servo_motion.blend). A layer given a ttl
+    that hears nothing for that long fades out as if cleared, so a source
+    that dies without clearing its layer cannot hold the channel forever.
+    The output is clamped to the narrowest min/max any layer asked for.
+
+    A layer with a generator (the `idle` command) has its offset computed
+    here every frame from a servo_motion.IdleMotion instead of sent in.
+    """
+
+    __slots__ = ('layers', 'seen', 'ttl', 'windows', 'generators', 'floor', 'angle')
+
+    def __init__(self, floor):
+        self.layers = {}    # name -> servo_motion.Layer
+        self.seen = {}      # name -> monotonic time of its last update
+        self.ttl = {}       # name -> seconds of silence before it fades out, or None
+        self.windows = {}   # name -> (min, max) its source asked for
+        self.generators = {}  # name -> (servo_motion.IdleMotion, monotonic start)
+        self.floor = floor
+        self.angle = floor
+
+    def position(self, _now):
+        return self.angle
+
+    def velocity(self, _now):
+        return 0.0
+
+    def update(self, name, value, additive, priority, weight, fade_s, ttl_s, lo, hi, now,
+               generator=None):
+        if generator is not None:
+            self.generators[name] = (generator, now)
+        else:
+            self.generators.pop(name, None)
+        layer = self.layers.get(name)
+        if layer is None or layer.additive != additive:
+            layer = servo_motion.Layer(value, 0 if priority is None else priority,
+                                       additive, weight, fade_s)
+            self.layers[name] = layer
+        else:
+            layer.value = float(value)
+            if priority is not None:
+                layer.priority = int(priority)
+            layer.fade_to(weight, fade_s)
+        self.seen[name] = now
+        self.ttl[name] = ttl_s
+        self.windows[name] = (lo, hi)
+
+    def clear(self, name, fade_s):
+        layer = self.layers.get(name)
+        if layer is not None:
+            layer.fade_to(0.0, fade_s)
+            self.ttl[name] = None
+
+    def advance(self, now, curve):
+        for name, layer in list(self.layers.items()):
+            ttl = self.ttl.get(name)
+            if ttl is not None and now - self.seen[name] > ttl:
+                layer.fade_to(0.0, layer.fade_s)
+                self.ttl[name] = None
+            layer.step(FRAME_S)
+            if layer.gone:
+                for table in (self.layers, self.seen, self.ttl, self.windows):
+                    del table[name]
+                self.generators.pop(name, None)
+                continue
+            if name in self.generators:
+                generator, started = self.generators[name]
+                layer.value = generator.sample(now - started)
+        angle = servo_motion.blend(self.floor, list(self.layers.values()))
+        finished = not self.layers
+        if angle is None:
+            return None, finished
+        lows = [lo for lo, _hi in self.windows.values() if lo is not None]
+        highs = [hi for _lo, hi in self.windows.values() if hi is not None]
+        self.angle = _clamp_angle(angle, max(lows) if lows else None,
+                                  min(highs) if highs else None)
+        return _curve_off(curve, self.angle), finished
+
+
+class _Jaw:
+    """A jaw driven by an audio stream on the jaw socket (_serve_jaw).
+
+    The stream's thread feeds loudness levels, each stamped with when it is
+    due; every frame takes the loudest level that has come due (or holds the
+    last one while it lasts), runs it through the envelope and maps the
+    openness onto closed..opened degrees. Once the stream has ended and the
+    jaw has settled shut, the motion is over.
+    """
+
+    __slots__ = ('envelope', 'levels', 'closed', 'opened', 'lo', 'hi', 'level',
+                 'held_until', 'angle', 'ended')
+
+    def __init__(self, envelope, closed, opened, lo, hi):
+        self.envelope = envelope
+        self.levels = collections.deque()   # (due, level, step_s); appended by the stream thread
+        self.closed = closed
+        self.opened = opened
+        self.lo = lo
+        self.hi = hi
+        self.level = 0.0
+        self.held_until = 0.0
+        self.angle = closed
+        self.ended = False
+
+    def position(self, _now):
+        return self.angle
+
+    def velocity(self, _now):
+        return 0.0
+
+    def advance(self, now, curve):
+        level = None
+        while self.levels and self.levels[0][0] <= now:
+            due, value, step_s = self.levels.popleft()
+            level = value if level is None else max(level, value)
+            self.held_until = due + step_s
+        if level is not None:
+            self.level = level
+        elif now >= self.held_until:
+            self.level = 0.0   # the stream stalled or ended: that is silence
+        openness = self.envelope.step(self.level, FRAME_S)
+        finished = self.ended and not self.levels and openness < 0.005
+        if finished:
+            openness = 0.0
+        self.angle = _clamp_angle(self.closed + (self.opened - self.closed) * openness,
+                                  self.lo, self.hi)
+        return _curve_off(curve, self.angle), finished
+
+
+# What a subscriber is told moved a channel, per kind of running motion.
+_MOTION_SOURCES = {_Motion: 'motion', _Goal: 'goal', _Clip: 'clip', _Layers: 'layers', _Jaw: 'jaw'}
+
+
+def _cancel_motion(bus, address, channel):
+    """Stop any running motion on the channel. Caller holds bus.lock.
+
+    A rotation's pending auto-stop goes too: whatever command preempts it now
+    decides what the channel does.
+    """
+    rotating = bus.timers.cancel((address, channel))
+    return bus.motions.pop((address, channel), None) is not None or rotating
+
+
+def _current_angle(bus, address, channel):
+    """Where the channel was last driven, or None if unknown or released."""
+    off = bus.last_off.get((address, channel))
+    if not off:
+        return None
+    return off_to_angle(off, channel, address, bus.number)
+
+
+def _angle_off(bus, address, channel, angle):
+    """A channel's angle as an off-count, through its calibration curve if it has one.
+
+    Curves are measured angle/pulse points in data/servo_curves.json
+    ($MB_SERVO_CURVES), compiled by pca9685_control into 0.1 degree tables
+    (servo_curves) and reloaded within a second of an edit, so this is a
+    table index. Poses and clips compiled through older tables are compiled
+    again when next played (_lookup).
+    """
+    return angle_to_off(angle, channel, address, bus.number)
+
+
+def _curve_off(curve, angle):
+    """Frame-path form of _angle_off, with the curve already looked up."""
+    return curve.off(angle) if curve is not None else angle_to_off(angle)
+
+
+def _start_motion(bus, address, channel, keyframes, lo, hi):
+    """Install a track on a channel, preempting whatever it was doing.
+
+    `keyframes` is [(t_s, angle, easing_fn)] with angles already clamped. If
+    the first keyframe is not at t=0 the track starts from where the channel
+    is now; a channel whose position is unknown starts at its first keyframe,
+    because there is nothing truthful to ease from. Caller holds bus.lock.
+    """
+    denied = _broken_channels().get(channel)
+    if denied:
+        raise ValueError(f"ch{channel} refused — {denied}")
+
+    if keyframes[0][0] > 0.0:
+        start = _current_angle(bus, address, channel)
+        if start is None:
+            start = keyframes[0][1]
+        keyframes = [(0.0, start, servo_motion.easing('linear'))] + keyframes
+    track = servo_motion.Track(keyframes)
+    if track.duration > MAX_MOTION_S:
+        raise ValueError(f"motion lasts {track.duration:.1f}s, limit is {MAX_MOTION_S:.0f}s")
+
+    bus.motions[(address, channel)] = _Motion(track, lo, hi)
+    bus.pending.pop((address, channel), None)  # an older parked value must not land mid-motion
+    _stats['trajectories'] += 1
+    bus.wake.set()
+    return track
+
+
+def _seek(bus, address, channel, angle, lo, hi):
+    """Send a channel that has motion limits towards `angle`. Caller holds bus.lock.
+
+    A goal already running is retargeted and carries on from its current
+    position and velocity; a move_to or trajectory in flight is taken over
+    the same way. Returns False when there is nothing truthful to start from
+    (position unknown, or the channel is refused): the caller then writes
+    `angle` the ordinary way, as a channel without limits would be.
+    """
+    key = (address, channel)
+    if _broken_channels().get(channel):
+        return False
+    running = bus.motions.get(key)
+    if isinstance(running, _Goal):
+        running.profile.retarget(angle)
+        running.lo, running.hi = lo, hi
+        _stats['goals'] += 1
+        return True
+
+    now = time.monotonic()
+    if running is not None:
+        position, velocity = running.position(now), running.velocity(now)
+    else:
+        position, velocity = _current_angle(bus, address, channel), 0.0
+    _cancel_motion(bus, address, channel)
+    if position is None:
+        return False
+    profile = servo_motion.Profile(position, angle, *bus.limits[key], velocity=velocity,
+                                   tick=FRAME_S)
+    bus.motions[key] = _Goal(profile, lo, hi)
+    bus.pending.pop(key, None)
+    _stats['goals'] += 1
+    bus.wake.set()
+    return True
+
+
+def _seek_many(bus, items):
+    """set_angles' share for channels with motion limits: [(address, channel, angle, lo, hi)].
+
+    All of a bus's goals start on the same frame. Returns {(address, channel): exception}.
+    """
+    errors = {}
+    with bus.lock:
+        for address, channel, angle, lo, hi in items:
+            try:
+                if not _seek(bus, address, channel, angle, lo, hi):
+                    _write(bus, address, channel, _angle_off(bus, address, channel, angle))
+            except Exception as exc:
+                errors[(address, channel)] = exc
+    return errors
+
+
+def _set_angle(bus, address, channel, angle, lo=None, hi=None, release=False):
+    """One set_angle (or set_part, once resolved); returns its reply."""
+    angle = _clamp_angle(angle, lo, hi)
+    with bus.lock:
+        if ((address, channel) in bus.limits and not release
+                and _seek(bus, address, channel, angle, lo, hi)):
+            return {'status': 'ok', 'channel': channel, 'angle': angle,
+                    'profile': _limits_reply(bus, address, channel)['profile']}
+        _cancel_motion(bus, address, channel)
+        if release:
+            # Continuous servos are pulsed, then released so they stop. The
+            # pulse goes out now: parked, the release would coalesce it away.
+            _write(bus, address, channel, _angle_off(bus, address, channel, angle), coalesce=False)
+            _write(bus, address, channel, 0)
+        else:
+            _write(bus, address, channel, _angle_off(bus, address, channel, angle))
+    return {'status': 'ok', 'channel': channel, 'angle': angle}
+
+
+def _set_many(items):
+    """The batched write behind set_angles and pose: [(bus, address, channel, angle, off, lo, hi)].
+
+    Channels without motion limits go out in one lock hold per bus and block
+    transactions (_write_across_buses); channels with limits get their goal
+    (_seek_many). Returns {(bus number, address, channel): exception}.
+    """
+    groups, seeks = {}, {}
+    for bus, address, channel, angle, off, lo, hi in items:
+        if (address, channel) in bus.limits:
+            seeks.setdefault(bus, []).append((address, channel, angle, lo, hi))
+        else:
+            groups.setdefault(bus, {}).setdefault(address, {})[channel] = off
+    # One lock hold per bus for the whole group, and adjacent channels in one
+    # block transaction: this is what makes the channels move together instead
+    # of being interleaved by other callers or skewed by per-channel writes.
+    # Boards on different buses are written at the same time.
+    errors = _write_across_buses(groups) if groups else {}
+    for bus, entries in seeks.items():
+        errors.update({(bus.number,) + key: exc
+                       for key, exc in _seek_many(bus, entries).items()})
+    return errors
+
+
+def _set_results(items, errors):
+    results = []
+    for bus, address, channel, angle, _off, _lo, _hi in items:
+        exc = errors.get((bus.number, address, channel))
+        if exc is not None:
+            results.append({'channel': channel, 'angle': angle,
+                            'status': 'error', 'error': str(exc)})
+        else:
+            results.append({'channel': channel, 'angle': angle, 'status': 'success'})
+    return results
+
+
+def _validate_rank(name, rank):
+    """A layer's rank: None (keep it, or 0 for a new layer) or an integer."""
+    if rank is None:
+        return None
+    if isinstance(rank, bool) or not isinstance(rank, (int, float)) or rank != int(rank):
+        raise ValueError(f"layer {name}: rank must be an integer, got {rank!r}")
+    return int(rank)
+
+
+def _update_layers(bus, entries):
+    """Apply one bus's share of a `layer` command under one hold of its lock.
+
+    `entries` is [(index, address, channel, name, spec, generator)], with
+    generator None except for `idle`. A channel's first layer takes it over
+    from whatever was driving it, starting from where that left it. Returns
+    {index: result}.
+    """
+    results = {}
+    now = time.monotonic()
+    with bus.lock:
+        for index, address, channel, name, spec, generator in entries:
+            key = (address, channel)
+            result = {'channel': channel, 'layer': name, 'status': 'ok'}
+            results[index] = result
+            fade_s = max(0.0, float(spec.get('fade_ms', 0))) / 1000.0
+            stack = bus.motions.get(key)
+            if spec.get('clear'):
+                if isinstance(stack, _Layers):
+                    stack.clear(name, fade_s)
+                    bus.wake.set()
+                continue
+            denied = _broken_channels().get(channel)
+            if denied:
+                result.update(status='error', error=f"ch{channel} refused — {denied}")
+                continue
+            if not isinstance(stack, _Layers):
+                floor = (stack.position(now) if stack is not None
+                         else _current_angle(bus, address, channel))
+                _cancel_motion(bus, address, channel)
+                stack = bus.motions[key] = _Layers(floor)
+                bus.pending.pop(key, None)
+            additive = spec.get('offset') is not None
+            value = float(spec['offset']) if additive else float(spec['angle'])
+            ttl_ms = spec.get('ttl_ms')
+            stack.update(name, value, additive, spec.get('rank'),
+                         spec.get('weight', 1.0), fade_s,
+                         None if ttl_ms is None else max(FRAME_S, float(ttl_ms) / 1000.0),
+                         spec.get('min'), spec.get('max'), now, generator)
+            _stats['layer_updates'] += 1
+            bus.wake.set()
+    return results
+
+
+def _idle_from(spec, outer, index):
+    """An `idle` entry -> servo_motion.IdleMotion.
+
+    `idle` is an additive "idle" layer whose offset the daemon computes itself
+    each frame (noise for fidgets, sine for breathing, dart for eye darts), so
+    Node sends one command to start or stop it, with a fade, and nothing in
+    between; the frame thread writes only when the off-count moves.
+    "bands" lists {"kind","amplitude","frequency_hz","transition_ms"}; without
+    it, "amplitude" and "frequency_hz" on the entry make one noise band. With
+    no "seed" each channel gets its own, so channels never move in lockstep.
+    Its layer's rank is "rank", as for `layer`.
+    """
+    bands = spec.get('bands', outer.get('bands'))
+    if bands is None:
+        bands = [{'amplitude': spec.get('amplitude', outer.get('amplitude', 2.0)),
+                  'frequency_hz': spec.get('frequency_hz', outer.get('frequency_hz', 0.5))}]
+    if not isinstance(bands, list) or not bands:
+        raise ValueError('idle bands must be a non-empty list')
+    if len(bands) > MAX_IDLE_BANDS:
+        raise ValueError(f"too many idle bands ({len(bands)} > {MAX_IDLE_BANDS})")
+    seed = spec.get('seed', outer.get('seed'))
+    if seed is None:
+        seed = index * 7919 + int(spec['channel'])
+    return servo_motion.IdleMotion(
+        [(band.get('kind', 'noise'), float(band['amplitude']), float(band['frequency_hz']),
+          max(0.0, float(band.get('transition_ms', 80))) / 1000.0) for band in bands],
+        seed)
+
+
+def _stop_idle(name, fade_s):
+    """Fade out every generated layer called `name` on every bus."""
+    stopped = []
+    for bus in _buses.values():
+        with bus.lock:
+            for (address, channel), motion in bus.motions.items():
+                if isinstance(motion, _Layers) and name in motion.generators:
+                    motion.clear(name, fade_s)
+                    stopped.append(_label(bus, address, channel))
+            bus.wake.set()
+    return stopped
+
+
+def _limits_from(spec):
+    """A `limits` entry -> (max_velocity, max_accel, max_jerk), or None to clear.
+
+    max_jerk is only used by the s_curve profile; left out, the acceleration
+    ramps up over a tenth of a second.
+    """
+    if spec.get('clear') or spec.get('max_velocity') is None:
+        return None
+    if spec.get('max_accel') is None:
+        raise ValueError('limits need max_accel (deg/s^2) alongside max_velocity (deg/s)')
+    max_velocity, max_accel = float(spec['max_velocity']), float(spec['max_accel'])
+    name = str(spec.get('profile', 'trapezoid')).strip().lower().replace('-', '_')
+    if name == 'scurve':
+        name = 's_curve'
+    if name not in servo_motion.PROFILES:
+        raise ValueError(f"Unknown profile: {spec.get('profile')} "
+                         f"(use one of {', '.join(servo_motion.PROFILES)})")
+    max_jerk = None
+    if name == 's_curve':
+        max_jerk = float(spec.get('max_jerk') or max_accel * 10.0)
+    if max_velocity <= 0 or max_accel <= 0 or (max_jerk is not None and max_jerk <= 0):
+        raise ValueError('motion limits must be positive')
+    return (max_velocity, max_accel, max_jerk)
+
+
+def _limits_reply(bus, address, channel):
+    max_velocity, max_accel, max_jerk = bus.limits[(address, channel)]
+    reply = {'max_velocity': max_velocity, 'max_accel': max_accel,
+             'profile': 'trapezoid' if max_jerk is None else 's_curve'}
+    if max_jerk is not None:
+        reply['max_jerk'] = max_jerk
+    return reply
+
+
+def _advance_motions(bus, now, parked=None):
+    """Write one frame of every running motion on the bus. Caller holds bus.lock.
+
+    All channels of a chip that moved this frame go out together through
+    _write_many, so a multi-channel move lands in the same transaction.
+    `parked` is the frame scheduler's table of pending writes, {(address,
+    channel): off}, sent in the same burst.
+    """
+    frame = {}
+    for (address, channel), off in (parked or {}).items():
+        frame.setdefault(address, {})[channel] = off
+    if parked:
+        _stats['bursts'] += 1
+    for key, motion in list(bus.motions.items()):
+        off, finished = motion.advance(now, servo_curve(key[1], key[0], bus.number))
+        if finished:
+            del bus.motions[key]
+        if off is not None and off != bus.last_off.get(key):
+            frame.setdefault(key[0], {})[key[1]] = off
+            if _subscribers:
+                bus.origins[key] = _MOTION_SOURCES.get(type(motion), 'motion')
+    for address, offs in frame.items():
+        for channel in _write_many(bus, address, offs, coalesce=False):
+            # Already released by the failed write; a motion that cannot reach
+            # the chip must not keep retrying it every frame.
+            bus.motions.pop((address, channel), None)
+
+
+def _flush_pending(bus, now):
+    """Write every parked value on the bus whose frame is over. Caller holds bus.lock.
+
+    Returns the seconds until the next parked value is due, or None.
+    """
+    soonest = None
+    ready = {}
+    for key, off in list(bus.pending.items()):
+        due = bus.written_at.get(key, float('-inf')) + FRAME_S
+        if due > now:
+            soonest = due - now if soonest is None else min(soonest, due - now)
+            continue
+        del bus.pending[key]
+        ready.setdefault(key[0], {})[key[1]] = off
+    for address, offs in ready.items():
+        # Failures are logged, counted and released inside; nobody is waiting on them.
+        _write_many(bus, address, offs, coalesce=False)
+    return soonest
+
+
+def _fire_timers(bus, now):
+    """Stop every rotation whose time is up. Caller holds bus.lock.
+
+    Returns the seconds until the next deadline, or None.
+    """
+    stops = {}
+    for address, channel in bus.timers.expire(now):
+        # A start still parked for its frame must not land after the stop.
+        bus.pending.pop((address, channel), None)
+        stops.setdefault(address, {})[channel] = 0
+    for address, offs in stops.items():
+        _stats['rotation_stops'] += len(offs)
+        # Failures are logged and released inside; a failed stop is a release too.
+        _write_many(bus, address, offs, coalesce=False)
+    due = bus.timers.next_due()
+    return None if due is None else max(0.001, due - now)
+
+
+def _start_rotation(bus, address, channel, off, duration_s):
+    """Drive a continuous servo at `off` now and stop it `duration_s` from now.
+
+    The stop lives on the bus's timer wheel, so nothing has to stay connected,
+    let alone alive, for it to happen. A later rotate replaces both speed and
+    stop, one with only extend_ms moves the stop, and any other command for
+    the channel takes it over; cancel stops it. A rotation always needs a
+    duration, of at most MAX_MOTION_S including any extension. Caller holds
+    bus.lock.
+    """
+    _cancel_motion(bus, address, channel)
+    _write(bus, address, channel, off)
+    bus.timers.schedule((address, channel), time.monotonic() + duration_s)
+    _stats['rotations'] += 1
+    bus.wake.set()
+
+
+def _frame_loop(bus):
+    """One bus's frame clock: advances its motions and flushes its coalesced writes.
+
+    Rotation auto-stops fire here too, on the bus's timer wheel.
+    Every bus gets its own, so a busy bus never delays another bus's frames.
+    Sleeps on bus.wake while there is nothing to do, so an idle box costs no
+    CPU at all. Motion ticks are scheduled against a fixed timeline rather than
+    "sleep 20ms after the last one", so write timing does not drift with load;
+    a tick that falls badly behind resynchronises instead of bursting.
+
+    In frame-scheduler mode (--frame-scheduler, or MB_SERVO_FRAME_SCHEDULER=1)
+    parked writes wait for the tick too, rather than for the end of their own
+    channel's frame, so everything a bus writes goes out in one burst per
+    frame under one hold of its lock, at the price of up to one frame of
+    latency. An I2C error on a parked write is logged and counted, not
+    returned to the command that parked it.
+    """
+    next_tick = time.monotonic()
+    while not _shutdown_event.is_set():
+        with bus.lock:
+            idle = not bus.motions and not bus.pending and not bus.timers
+        if idle:
+            bus.wake.wait(0.5)
+            bus.wake.clear()
+            # Back on the frame timeline, never sooner than one frame after the
+            # last tick: a write arriving just after a burst waits for the next.
+            next_tick = max(next_tick, time.monotonic())
+            continue
+
+        now = time.monotonic()
+        started = time.perf_counter()
+        _begin_call(source='frame')
+        with bus.lock:
+            flush_in = None
+            if now >= next_tick:
+                bus.frame_at = now
+                parked = None
+                if _frame_scheduler and bus.pending:
+                    parked = dict(bus.pending)
+                    bus.pending.clear()
+                _advance_motions(bus, now, parked)
+                next_tick += FRAME_S
+                if next_tick < now:
+                    next_tick = now + FRAME_S
+            if not _frame_scheduler:
+                flush_in = _flush_pending(bus, now)
+            timer_in = _fire_timers(bus, now)
+            moving = bool(bus.motions) or (_frame_scheduler and bool(bus.pending))
+        _end_call('frame', started)
+
+        delay = next_tick - time.monotonic() if moving else None
+        for wait_s in (flush_in, timer_in):
+            if wait_s is not None:
+                delay = wait_s if delay is None else min(delay, wait_s)
+        if delay is not None and delay > 0:
+            bus.wake.wait(delay)
+            bus.wake.clear()
+
+
+def _keyframes_from(raw, lo, hi, default_easing='linear'):
+    """[{"t_ms":0,"angle":90,"easing":"ease_out"}, ...] -> [(t_s, angle, fn)]."""
+    if not isinstance(raw, list) or not raw:
+        raise ValueError('keyframes must be a non-empty list')
+    if len(raw) > MAX_KEYFRAMES:
+        raise ValueError(f"too many keyframes ({len(raw)} > {MAX_KEYFRAMES})")
+    frames = []
+    for frame in raw:
+        t_s = max(0.0, float(frame.get('t_ms', 0))) / 1000.0
+        angle = _clamp_angle(frame['angle'], lo, hi)
+        frames.append((t_s, angle, servo_motion.easing(frame.get('easing', default_easing))))
+    frames.sort(key=lambda f: f[0])
+    return frames
+
+
+def _motion_result(channel, track, start):
+    return {'channel': channel, 'from': None if start is None else round(start, 2),
+            'angle': round(track.target, 2), 'duration_ms': int(round(track.duration * 1000)),
+            'status': 'running'}
+
+
+def _install_motions(prepared):
+    """Start move_to/trajectory tracks; results come back in request order.
+
+    `prepared` is [(index, bus, address, channel, angle, keyframes, lo, hi)].
+    Every channel on a bus starts on the same frame: one hold of that bus's
+    lock installs them all.
+
+    The command returns at once; the bus's frame thread interpolates one
+    tick per 20ms PWM frame and writes a channel only when its off-count
+    actually changes. Any later command for the same channel (set_angle,
+    another move_to, release, ...) preempts the track; cancel stops it where
+    it is.
+    """
+    by_bus = {}
+    for item in prepared:
+        by_bus.setdefault(item[1], []).append(item)
+    results = {}
+    for bus, items in by_bus.items():
+        with bus.lock:
+            for index, _bus, address, channel, angle, frames, lo, hi in items:
+                start = _current_angle(bus, address, channel)
+                try:
+                    track = _start_motion(bus, address, channel, frames, lo, hi)
+                    results[index] = _motion_result(channel, track, start)
+                except Exception as exc:
+                    results[index] = {'channel': channel, 'status': 'error', 'error': str(exc)}
+                    if angle is not None:
+                        results[index]['angle'] = angle
+    return [results[index] for index in sorted(results)]
+
+
+# ---------------------------------------------------------------------------
+# Pose and clip library — uploaded once, triggered by name
+# ---------------------------------------------------------------------------
+
+# kind ('pose' | 'clip') -> {name: (spec as uploaded, compiled form, curves
+# generation)}. The spec is kept so a --takeover replacement can compile the
+# library again, and so can _lookup once the calibration curves change.
+_library = {'pose': {}, 'clip': {}}
+_library_lock = threading.Lock()
+
+
+def _compile_pose(spec):
+    """{"moves":[{"channel":0,"angle":100}, ...]} -> set_angles items, angles already off-counts."""
+    moves = spec.get('moves')
+    if not isinstance(moves, list) or not moves:
+        raise ValueError('a pose needs a non-empty list of moves')
+    items = []
+    for move in moves:
+        bus, address = _bus_of(move, spec), _address_of(move, spec)
+        channel = _validate_channel(move['channel'])
+        lo, hi = move.get('min', spec.get('min')), move.get('max', spec.get('max'))
+        angle = _clamp_angle(move['angle'], lo, hi)
+        items.append((bus, address, channel, angle, _angle_off(bus, address, channel, angle), lo, hi))
+    return items
+
+
+def _compile_clip(spec):
+    """{"tracks":[{"channel":3,"keyframes":[...]}, ...]} -> [(bus, address, channel, table, track)].
+
+    `table` is the track's off-count at every frame tick from 0 to its end,
+    clamped to its window. A clip is compiled before anyone knows where its
+    servos will be when it plays, so every track must start at t_ms 0.
+    """
+    tracks = spec.get('tracks')
+    if not isinstance(tracks, list) or not tracks:
+        raise ValueError('a clip needs a non-empty list of tracks')
+    compiled = []
+    for track_spec in tracks:
+        bus, address = _bus_of(track_spec, spec), _address_of(track_spec, spec)
+        channel = _validate_channel(track_spec['channel'])
+        lo = track_spec.get('min', spec.get('min'))
+        hi = track_spec.get('max', spec.get('max'))
+        frames = _keyframes_from(track_spec.get('keyframes'), lo, hi,
+                                 track_spec.get('easing', spec.get('easing', 'linear')))
+        if frames[0][0] > 0.0:
+            raise ValueError(f"ch{channel}: a clip track must start with a keyframe at t_ms 0")
+        track = servo_motion.Track(frames)
+        if track.duration > MAX_MOTION_S:
+            raise ValueError(f"clip lasts {track.duration:.1f}s, limit is {MAX_MOTION_S:.0f}s")
+        ticks = int(math.ceil(track.duration / FRAME_S))
+        curve = servo_curve(channel, address, bus.number)
+        table = tuple(_curve_off(curve, track.sample(tick * FRAME_S)) for tick in range(ticks + 1))
+        compiled.append((bus, address, channel, table, track))
+    return compiled
+
+
+def _define(kind, spec):
+    """Compile and store a define_pose / define_clip upload; returns (name, compiled).
+
+    A pose is a set of channel angles compiled to off-counts here, once;
+    `pose` writes it like set_angles, in one lock hold per bus, or eases into
+    it over duration_ms. A clip is a set of keyframed tracks starting at t_ms
+    0, each compiled to a table of off-counts, one per frame; `play` starts
+    them all on the same frame, faster or slower by time_scale, and the frame
+    thread only looks values up. A clip plays, and is preempted or cancelled,
+    like a trajectory. The library lives as long as the daemon, up to
+    MAX_LIBRARY_ENTRIES of each kind.
+    """
+    name = spec.get('name')
+    if not isinstance(name, str) or not name:
+        raise ValueError(f"a {kind} needs a name")
+    generation = curves_generation()
+    compiled = _compile_pose(spec) if kind == 'pose' else _compile_clip(spec)
+    with _library_lock:
+        entries = _library[kind]
+        if name not in entries and len(entries) >= MAX_LIBRARY_ENTRIES:
+            raise ValueError(f"too many {kind}s (limit {MAX_LIBRARY_ENTRIES}); forget one first")
+        entries[name] = (spec, compiled, generation)
+    return name, compiled
+
+
+def _lookup(kind, name):
+    """A library entry's compiled form, compiled again if the curves changed since."""
+    with _library_lock:
+        entry = _library[kind].get(name)
+    if entry is None:
+        raise ValueError(f"Unknown {kind}: {name}")
+    spec, compiled, generation = entry
+    current = curves_generation()
+    if generation != current:
+        compiled = _compile_pose(spec) if kind == 'pose' else _compile_clip(spec)
+        with _library_lock:
+            if _library[kind].get(name) is entry:
+                _library[kind][name] = (spec, compiled, current)
+    return compiled
+
+
+def _play_clip(compiled, scale):
+    """Start every track of a clip; each bus's tracks start on the same frame."""
+    by_bus = {}
+    for index, item in enumerate(compiled):
+        by_bus.setdefault(item[0], []).append((index,) + item[1:])
+    results = {}
+    for bus, items in by_bus.items():
+        with bus.lock:
+            for index, address, channel, table, track in items:
+                denied = _broken_channels().get(channel)
+                if denied:
+                    results[index] = {'channel': channel, 'status': 'error',
+                                      'error': f"ch{channel} refused — {denied}"}
+                    continue
+                _cancel_motion(bus, address, channel)
+                bus.motions[(address, channel)] = _Clip(table, track, scale)
+                bus.pending.pop((address, channel), None)
+                results[index] = {'channel': channel, 'status': 'running',
+                                  'duration_ms': int(round(track.duration / scale * 1000))}
+            bus.wake.set()
+    _stats['clips'] += 1
+    return [results[index] for index in sorted(results)]
+
+
 # ---------------------------------------------------------------------------
 # Command dispatch
 # ---------------------------------------------------------------------------
 
+def _stats_reply():
+    """The `stats` reply: counters, per-command latency, lock contention, write counts.
+
+    It answers "who is starving the bus": per command type (plus "frame" for
+    the frame thread) latency histograms of time queued on the bus lock, time
+    in I2C and end to end, with per-bus lock contention and per-channel write
+    counts. MB_SERVO_STATS_FILE appends it as a JSON line every
+    MB_SERVO_STATS_INTERVAL_S seconds (_stats_dump_loop).
+    """
+    stats = dict(_stats)
+    # Bus time not spent, estimated at the average cost of a write we did make.
+    saved = stats['writes_skipped'] + stats['writes_coalesced']
+    per_write_ms = (stats['write_s'] * 1000.0 / stats['writes']) if stats['writes'] else 0.0
+    stats['bus_ms_saved_est'] = round(saved * per_write_ms, 2)
+    stats['write_s'] = round(stats['write_s'], 4)
+    stats['verify_ms_avg'] = (round(stats['verify_s'] * 1000.0 / stats['verifications'], 3)
+                              if stats['verifications'] else None)
+    stats['verify_s'] = round(stats['verify_s'], 4)
+    stats['snapshot_s'] = round(stats['snapshot_s'], 4)
+    stats['positions_save_s'] = round(stats['positions_save_s'], 4)
+    stats['subscribers'] = len(_subscribers)
+    stats['buses'] = list(BUS_NUMBERS)
+    stats['frame_scheduler'] = _frame_scheduler
+    stats['chips'] = {str(bus.number): [f"0x{a:02x}" for a in sorted(bus.initialized)]
+                      for bus in _buses.values()}
+    stats['chips_dirty'] = {str(bus.number): [f"0x{a:02x}" for a in sorted(bus.dirty)]
+                            for bus in _buses.values() if bus.dirty}
+    with _metrics_lock:
+        latency = {name: {kind: h.summary() for kind, h in histograms.items()}
+                   for name, histograms in sorted(_metrics.items())}
+    locks, channel_writes = {}, {}
+    for bus in _buses.values():
+        locks[str(bus.number)] = bus.lock.summary()
+        for (address, channel), count in list(bus.channel_writes.items()):
+            channel_writes[_label(bus, address, channel)] = count
+    return {'status': 'ok', 'stats': stats,
+            'uptime_s': round(time.time() - _stats['started_at'], 1),
+            'latency': latency, 'locks': locks, 'channel_writes': channel_writes,
+            'curves': curves_loaded()[1]}
+
+
+def _stats_dump_loop(path):
+    """Append the `stats` reply to `path` as one JSON line every STATS_INTERVAL_S.
+
+    Best effort: a full disk or a bad path is logged once and retried, and never
+    touches the bus or the command path.
+    """
+    failing = False
+    while not _shutdown_event.wait(STATS_INTERVAL_S):
+        line = dict(_stats_reply(), ts=round(time.time(), 3))
+        line.pop('status', None)
+        try:
+            with open(path, 'a') as handle:
+                handle.write(json.dumps(line) + '\n')
+            failing = False
+        except OSError as exc:
+            if not failing:
+                _log(f"cannot write stats to {path}: {exc}")
+            failing = True
+
 def handle_command(cmd):
     """Execute one decoded command and return the reply dict."""
     action = cmd.get('cmd', '')
@@ -269,81 +2288,315 @@ def handle_command(cmd):
         return {'status': 'pong'}
 
     if action == 'stats':
-        return {'status': 'ok', 'stats': dict(_stats),
-                'uptime_s': round(time.time() - _stats['started_at'], 1)}
+        return _stats_reply()
 
     if action == 'state':
-        with _bus_lock:
-            channels = {f"{addr}:{ch}": off for (addr, ch), off in _last_off.items()}
-        return {'status': 'ok', 'channels': channels}
+        channels, driven, rotating, seeking, layers, jaw = {}, {}, {}, {}, {}, {}
+        now = time.monotonic()
+        for bus in _buses.values():
+            with bus.lock:
+                channels.update({_label(bus, addr, ch): off
+                                 for (addr, ch), off in bus.last_off.items()})
+                driven.update({_label(bus, addr, ch):
+                               round(off_to_angle(off, ch, addr, bus.number), 2)
+                               for (addr, ch), off in bus.driven.items()})
+                seeking.update({_label(bus, addr, ch): round(motion.profile.goal, 2)
+                                for (addr, ch), motion in bus.motions.items()
+                                if isinstance(motion, _Goal)})
+                jaw.update({_label(bus, addr, ch): round(motion.angle, 2)
+                            for (addr, ch), motion in bus.motions.items()
+                            if isinstance(motion, _Jaw)})
+                for (addr, ch), motion in bus.motions.items():
+                    if isinstance(motion, _Layers):
+                        layers[_label(bus, addr, ch)] = {
+                            name: {'offset' if layer.additive else 'angle': round(layer.value, 2),
+                                   'rank': layer.priority,
+                                   'weight': round(layer.weight, 3),
+                                   'generated': name in motion.generators}
+                            for name, layer in motion.layers.items()}
+                rotating.update({_label(bus, addr, ch):
+                                 max(0, int(round((bus.timers.due((addr, ch)) - now) * 1000)))
+                                 for addr, ch in bus.timers.keys()})
+        return {'status': 'ok', 'buses': list(BUS_NUMBERS), 'channels': channels,
+                'driven': driven, 'rotating': rotating, 'seeking': seeking, 'layers': layers, 'jaw': jaw}
+
+    if action == 'limits':
+        entries = cmd.get('channels')
+        if entries is None:
+            entries = [cmd] if cmd.get('channel') is not None else []
+        # Parse everything first, so one bad entry changes nothing.
+        changes = []
+        for entry in entries:
+            bus, address = _bus_of(entry, cmd), _address_of(entry, cmd)
+            channel = _validate_channel(entry['channel'])
+            changes.append((bus, address, channel, _limits_from(entry)))
+        for bus, address, channel, limits in changes:
+            key = (address, channel)
+            with bus.lock:
+                if limits is None:
+                    # A goal already under way finishes under the limits it had.
+                    bus.limits.pop(key, None)
+                    continue
+                bus.limits[key] = limits
+                running = bus.motions.get(key)
+                if isinstance(running, _Goal):
+                    running.profile.set_limits(*limits)
+        listed = {}
+        for bus in _buses.values():
+            with bus.lock:
+                listed.update({_label(bus, addr, ch): _limits_reply(bus, addr, ch)
+                               for addr, ch in sorted(bus.limits)})
+        return {'status': 'ok', 'limits': listed}
 
     if action == 'set_angle':
         channel = _validate_channel(cmd['channel'])
-        angle = _clamp_angle(cmd['angle'], cmd.get('min'), cmd.get('max'))
-        address = _address_of(cmd)
-        with _bus_lock:
-            _write(address, channel, angle_to_off(angle))
-            if cmd.get('release'):
-                # Continuous servos are pulsed, then released so they stop.
-                _write(address, channel, 0)
-        return {'status': 'ok', 'channel': channel, 'angle': angle}
+        return _set_angle(_bus_of(cmd), _address_of(cmd), channel, cmd['angle'],
+                          cmd.get('min'), cmd.get('max'), cmd.get('release'))
+
+    if action == 'set_part':
+        bus, address, channel, angle, lo, hi, part = _part_move(cmd)
+        reply = _set_angle(bus, address, channel, angle, lo, hi, cmd.get('release'))
+        reply.update(part=part['id'], address=address, inverted=part['mirror'] is not None)
+        return reply
 
     if action == 'set_angles':
         moves = cmd.get('moves') or []
-        address = _address_of(cmd)
         prepared = []
         for move in moves:
+            bus, address = _bus_of(move, cmd), _address_of(move, cmd)
             channel = _validate_channel(move['channel'])
             angle = _clamp_angle(move['angle'], move.get('min'), move.get('max'))
-            prepared.append((channel, angle))
-
-        results = []
-        # One lock hold for the whole group: this is what makes the channels
-        # move together instead of being interleaved by other callers.
-        with _bus_lock:
-            for channel, angle in prepared:
-                try:
-                    _write(address, channel, angle_to_off(angle))
-                    results.append({'channel': channel, 'angle': angle, 'status': 'success'})
-                except Exception as exc:
-                    results.append({'channel': channel, 'angle': angle,
-                                    'status': 'error', 'error': str(exc)})
-        return {'status': 'ok', 'results': results}
+            prepared.append((bus, address, channel, angle, _angle_off(bus, address, channel, angle),
+                             move.get('min'), move.get('max')))
+        return {'status': 'ok', 'results': _set_results(prepared, _set_many(prepared))}
 
     if action == 'set_pulse':
         channel = _validate_channel(cmd['channel'])
-        address = _address_of(cmd)
-        with _bus_lock:
-            _write(address, channel, us_to_off(cmd['pulse_us']))
-            if cmd.get('release'):
-                _write(address, channel, 0)
+        bus, address = _bus_of(cmd), _address_of(cmd)
+        with bus.lock:
+            _cancel_motion(bus, address, channel)
+            release = bool(cmd.get('release'))
+            _write(bus, address, channel, us_to_off(cmd['pulse_us']), coalesce=not release)
+            if release:
+                _write(bus, address, channel, 0)
         return {'status': 'ok', 'channel': channel}
 
     if action == 'set_raw':
         channel = _validate_channel(cmd['channel'])
-        address = _address_of(cmd)
+        bus, address = _bus_of(cmd), _address_of(cmd)
         off = max(0, min(4095, int(cmd['off'])))
-        with _bus_lock:
-            _write(address, channel, off)
+        with bus.lock:
+            _cancel_motion(bus, address, channel)
+            _write(bus, address, channel, off)
         return {'status': 'ok', 'channel': channel, 'off': off}
 
     if action == 'release':
         channel = _validate_channel(cmd['channel'])
-        address = _address_of(cmd)
-        with _bus_lock:
-            _write(address, channel, 0)
+        bus, address = _bus_of(cmd), _address_of(cmd)
+        with bus.lock:
+            _cancel_motion(bus, address, channel)
+            _write(bus, address, channel, 0)
         return {'status': 'ok', 'channel': channel, 'released': True}
 
     if action == 'release_all':
-        address = _address_of(cmd)
-        with _bus_lock:
+        bus, address = _bus_of(cmd), _address_of(cmd)
+        with bus.lock:
             for channel in range(16):
-                try:
-                    _write(address, channel, 0)
-                except Exception:
-                    pass
+                _cancel_motion(bus, address, channel)
+            # Failures are already logged; the reply has always been best-effort.
+            _write_many(bus, address, {channel: 0 for channel in range(16)})
         return {'status': 'ok', 'released': 'all'}
 
+    if action == 'rotate':
+        channel = _validate_channel(cmd['channel'])
+        bus, address = _bus_of(cmd), _address_of(cmd)
+        key = (address, channel)
+        if cmd.get('off') is not None:
+            off = max(0, min(4095, int(cmd['off'])))
+        elif cmd.get('pulse_us') is not None:
+            off = us_to_off(cmd['pulse_us'])
+        elif cmd.get('direction') is not None:
+            if cmd['direction'] not in ('cw', 'ccw', 'stop'):
+                raise ValueError(f"Invalid direction: {cmd['direction']}")
+            off = (0 if cmd['direction'] == 'stop'
+                   else us_to_off(continuous_pulse_us(cmd['direction'], cmd.get('speed', 50))))
+        else:
+            off = None
+
+        with bus.lock:
+            if off is None:
+                # Extension only: the channel keeps its speed, the stop moves out.
+                due = bus.timers.due(key)
+                if due is None:
+                    raise ValueError(f"ch{channel} is not rotating")
+                extend_s = max(0.0, float(cmd.get('extend_ms', 0))) / 1000.0
+                remaining_s = due + extend_s - time.monotonic()
+                if remaining_s > MAX_MOTION_S:
+                    raise ValueError(f"rotation would run another {remaining_s:.1f}s, "
+                                     f"limit is {MAX_MOTION_S:.0f}s")
+                due += extend_s
+                bus.timers.schedule(key, due)
+                bus.wake.set()
+            elif off == 0:
+                _cancel_motion(bus, address, channel)
+                _write(bus, address, channel, 0)
+                return {'status': 'ok', 'channel': channel, 'off': 0, 'stop_in_ms': 0}
+            else:
+                duration_s = max(0.0, float(cmd.get('duration_ms', 0))) / 1000.0
+                if duration_s <= 0.0:
+                    # A continuous servo never starts without its stop already booked.
+                    raise ValueError('rotate needs a duration_ms > 0')
+                if duration_s > MAX_MOTION_S:
+                    raise ValueError(f"rotation lasts {duration_s:.1f}s, limit is {MAX_MOTION_S:.0f}s")
+                _start_rotation(bus, address, channel, off, duration_s)
+                due = bus.timers.due(key)
+        return {'status': 'ok', 'channel': channel, 'off': bus.last_off.get(key, off),
+                'stop_in_ms': max(0, int(round((due - time.monotonic()) * 1000)))}
+
+    if action == 'move_to':
+        moves = cmd.get('moves')
+        if moves is None:
+            moves = [cmd]
+        default_ms = cmd.get('duration_ms', 0)
+        default_easing = cmd.get('easing', 'ease_in_out')
+        prepared = []
+        for index, move in enumerate(moves):
+            bus, address = _bus_of(move, cmd), _address_of(move, cmd)
+            channel = _validate_channel(move['channel'])
+            lo, hi = move.get('min', cmd.get('min')), move.get('max', cmd.get('max'))
+            angle = _clamp_angle(move['angle'], lo, hi)
+            duration_s = max(0.0, float(move.get('duration_ms', default_ms))) / 1000.0
+            fn = servo_motion.easing(move.get('easing', default_easing))
+            prepared.append((index, bus, address, channel, angle,
+                             [(duration_s, angle, fn)], lo, hi))
+        return {'status': 'ok', 'results': _install_motions(prepared)}
+
+    if action == 'trajectory':
+        tracks = cmd.get('tracks')
+        if tracks is None:
+            tracks = [cmd]
+        prepared = []
+        for index, spec in enumerate(tracks):
+            bus, address = _bus_of(spec, cmd), _address_of(spec, cmd)
+            channel = _validate_channel(spec['channel'])
+            lo, hi = spec.get('min', cmd.get('min')), spec.get('max', cmd.get('max'))
+            frames = _keyframes_from(spec.get('keyframes'), lo, hi,
+                                     spec.get('easing', cmd.get('easing', 'linear')))
+            prepared.append((index, bus, address, channel, None, frames, lo, hi))
+        return {'status': 'ok', 'results': _install_motions(prepared)}
+
+    if action == 'layer':
+        specs = cmd.get('layers')
+        if specs is None:
+            specs = [cmd]
+        by_bus = {}
+        for index, spec in enumerate(specs):
+            bus, address = _bus_of(spec, cmd), _address_of(spec, cmd)
+            channel = _validate_channel(spec['channel'])
+            name = spec.get('layer', cmd.get('layer'))
+            if not isinstance(name, str) or not name:
+                raise ValueError('a layer needs a name ("layer")')
+            if not spec.get('clear') and (spec.get('angle') is None) == (spec.get('offset') is None):
+                raise ValueError(f"layer {name}: give exactly one of angle or offset")
+            _validate_rank(name, spec.get('rank'))
+            by_bus.setdefault(bus, []).append((index, address, channel, name, spec, None))
+        results = {}
+        for bus, entries in by_bus.items():
+            results.update(_update_layers(bus, entries))
+        return {'status': 'ok', 'results': [results[index] for index in sorted(results)]}
+
+    if action == 'idle':
+        name = cmd.get('layer', 'idle')
+        fade_s = max(0.0, float(cmd.get('fade_ms', 0))) / 1000.0
+        specs = cmd.get('channels')
+        if specs is None:
+            if cmd.get('channel') is None:
+                if not cmd.get('stop'):
+                    raise ValueError('idle needs a channel, or channels')
+                return {'status': 'ok', 'stopped': _stop_idle(name, fade_s)}
+            specs = [cmd]
+        by_bus = {}
+        for index, spec in enumerate(specs):
+            bus, address = _bus_of(spec, cmd), _address_of(spec, cmd)
+            channel = _validate_channel(spec['channel'])
+            entry = {'offset': 0.0, 'min': spec.get('min', cmd.get('min')),
+                     'max': spec.get('max', cmd.get('max')),
+                     'rank': _validate_rank(name, spec.get('rank', cmd.get('rank'))),
+                     'fade_ms': spec.get('fade_ms', cmd.get('fade_ms', 0))}
+            generator = None
+            if spec.get('stop', cmd.get('stop')):
+                entry['clear'] = True
+            else:
+                generator = _idle_from(spec, cmd, index)
+            by_bus.setdefault(bus, []).append((index, address, channel, name, entry, generator))
+        results = {}
+        for bus, entries in by_bus.items():
+            results.update(_update_layers(bus, entries))
+        return {'status': 'ok', 'results': [results[index] for index in sorted(results)]}
+
+    if action in ('define_pose', 'define_clip'):
+        kind = action[len('define_'):]
+        name, compiled = _define(kind, cmd)
+        reply = {'status': 'ok', kind: name, 'channels': len(compiled)}
+        if kind == 'clip':
+            reply['duration_ms'] = int(round(max(t.duration for *_r, t in compiled) * 1000))
+        return reply
+
+    if action == 'pose':
+        items = _lookup('pose', cmd.get('name'))
+        _stats['poses'] += 1
+        if cmd.get('duration_ms'):
+            # A timed transition into the pose, eased like move_to.
+            duration_s = max(0.0, float(cmd['duration_ms'])) / 1000.0
+            fn = servo_motion.easing(cmd.get('easing', 'ease_in_out'))
+            prepared = [(index, bus, address, channel, angle, [(duration_s, angle, fn)], lo, hi)
+                        for index, (bus, address, channel, angle, _off, lo, hi)
+                        in enumerate(items)]
+            return {'status': 'ok', 'pose': cmd['name'], 'results': _install_motions(prepared)}
+        return {'status': 'ok', 'pose': cmd['name'],
+                'results': _set_results(items, _set_many(items))}
+
+    if action == 'play':
+        compiled = _lookup('clip', cmd.get('name'))
+        scale = float(cmd.get('time_scale', 1.0))
+        if scale <= 0.0:
+            raise ValueError('time_scale must be > 0')
+        longest = max(track.duration for *_r, track in compiled)
+        if longest / scale > MAX_MOTION_S:
+            raise ValueError(f"clip would last {longest / scale:.1f}s, "
+                             f"limit is {MAX_MOTION_S:.0f}s")
+        return {'status': 'ok', 'clip': cmd['name'], 'results': _play_clip(compiled, scale)}
+
+    if action == 'library':
+        with _library_lock:
+            return {'status': 'ok', 'poses': sorted(_library['pose']),
+                    'clips': sorted(_library['clip'])}
+
+    if action == 'forget':
+        with _library_lock:
+            forgotten = [kind for kind in ('pose', 'clip')
+                         if _library[kind].pop(cmd.get('name'), None) is not None]
+        return {'status': 'ok', 'forgotten': forgotten}
+
+    if action == 'cancel':
+        # Stops the motion where it is; the channel keeps holding that position.
+        if cmd.get('channel') is None:
+            targets = [(bus, None) for bus in _buses.values()]
+        else:
+            targets = [(_bus_of(cmd), (_address_of(cmd), _validate_channel(cmd['channel'])))]
+        cancelled = []
+        for bus, key in targets:
+            with bus.lock:
+                keys = set(bus.motions) | set(bus.timers.keys()) if key is None else {key}
+                for addr, ch in sorted(keys):
+                    rotating = (addr, ch) in bus.timers
+                    if _cancel_motion(bus, addr, ch):
+                        cancelled.append(_label(bus, addr, ch))
+                        if rotating:
+                            # Holding a rotation "where it is" means spinning forever.
+                            _write(bus, addr, ch, 0)
+        return {'status': 'ok', 'cancelled': cancelled}
+
     if action == 'shutdown':
         _shutdown_event.set()
         return {'status': 'shutdown'}
@@ -351,35 +2604,323 @@ def handle_command(cmd):
     return {'status': 'error', 'message': f"Unknown command: {action}"}
 
 
-def dispatch_line(line):
-    """Decode one protocol line and return the reply dict (never raises)."""
+def _priority_of(cmd, default):
+    name = cmd.get('priority')
+    if name is None:
+        return default
     try:
-        cmd = json.loads(line)
-    except (json.JSONDecodeError, ValueError) as exc:
-        return {'status': 'error', 'message': f"Invalid JSON: {exc}"}
+        return PRIORITIES.index(str(name).lower())
+    except ValueError:
+        raise ValueError(f"Unknown priority: {name} (use one of {', '.join(PRIORITIES)})")
 
-    if not isinstance(cmd, dict):
-        return {'status': 'error', 'message': 'Command must be a JSON object'}
 
+def _dispatch(cmd, started, default_priority=INTERACTIVE):
+    """Run one decoded command, timed from `started`. Never raises."""
+    _begin_call(default_priority)
     try:
+        _call.source = str(cmd.get('cmd', ''))[:32]
+        _call.priority = _priority_of(cmd, default_priority)
         reply = handle_command(cmd)
     except Exception as exc:
         _stats['errors'] += 1
         reply = {'status': 'error', 'message': str(exc)}
+    _end_call(cmd.get('cmd', ''), started)
+    return reply
+
+
+def dispatch_line(line, received=None, on_socket=False, default_priority=INTERACTIVE):
+    """Decode one protocol line and return the reply dict (never raises).
+
+    `received` is when the front end read the line (time.perf_counter()), so
+    time spent queued for a worker counts towards the command's total.
+    `on_socket` is set by the socket front ends, the only ones that can switch
+    a connection to binary frames (see _BINARY_ACCEPTED), to a stream of state
+    changes (a "subscription" in the reply, see _Subscriber) or hand the
+    daemon over (see _hand_off). `default_priority` applies to a command that does not
+    name its own "priority".
+    """
+    started = time.perf_counter() if received is None else received
+    try:
+        cmd = json.loads(line)
+    except (json.JSONDecodeError, ValueError) as exc:
+        return {'status': 'error', 'message': f"Invalid JSON: {exc}"}
+
+    if not isinstance(cmd, dict):
+        return {'status': 'error', 'message': 'Command must be a JSON object'}
+
+    if on_socket and cmd.get('cmd') == 'binary':
+        reply = dict(_BINARY_ACCEPTED)
+    elif cmd.get('cmd') == 'subscribe':
+        if not on_socket:
+            reply = {'status': 'error', 'message': 'subscribe needs a socket connection of its own'}
+        else:
+            try:
+                subscriber = _subscribe(cmd)
+                reply = {'status': 'ok', 'subscribed': subscriber.labels(),
+                         'max_rate_hz': cmd.get('max_rate_hz'), 'subscription': subscriber}
+            except (ValueError, KeyError, TypeError) as exc:
+                reply = {'status': 'error', 'message': str(exc)}
+    elif on_socket and cmd.get('cmd') == 'handoff':
+        if _handoff.is_set() or _listener is None:
+            reply = {'status': 'error', 'message': 'this daemon is not in a position to hand off'}
+        elif cmd.get('on_demand_only') and not _on_demand:
+            reply = {'status': 'error', 'message': 'this daemon was not started on demand'}
+        else:
+            reply = {'status': 'ok', 'handoff': True, 'pid': os.getpid()}
+    else:
+        reply = _dispatch(cmd, started, default_priority)
 
     if 'id' in cmd:
         reply['id'] = cmd['id']
     return reply
 
 
+# Reply to {"cmd":"binary"} on a socket. A front end that sends it switches the
+# connection to servo_protocol frames straight after.
+_BINARY_ACCEPTED = {'status': 'ok', 'protocol': 'binary', 'version': servo_protocol.VERSION}
+
+
+def dispatch_frame(frame, received=None):
+    """Binary counterpart of dispatch_line: one request frame in, reply bytes out.
+
+    Returns None for a fire-and-forget request. Raises ValueError only for a
+    frame that cannot be decoded at all, after which the connection is closed.
+    """
+    started = time.perf_counter() if received is None else received
+    cmd, request_id, no_reply = servo_protocol.decode_request(frame)
+    reply = _dispatch(cmd, started)
+    if no_reply:
+        return None
+    return servo_protocol.encode_reply(frame[0], request_id, reply)
+
+
+# ---------------------------------------------------------------------------
+# State subscriptions — what the chips are driving, pushed as it changes
+# ---------------------------------------------------------------------------
+
+# Subscribed connections. Replaced, never mutated, so the write path reads it
+# without a lock: with nobody subscribed a write pays one truth test.
+_subscribers = ()
+_subscribers_lock = threading.Lock()
+
+
+class _Subscriber:
+    """One subscribed connection: which channels it watches and what it has not been sent yet.
+
+    Changes are coalesced per channel, latest wins. A dashboard wants what a
+    channel is driving now, not every frame on the way there, so what is held
+    is bounded by the channels watched however fast they move and however
+    slowly the client reads. `interval` spaces the batches out for a client
+    that asked for max_rate_hz. `notify` is the front end's wake-up, called
+    when the first change of a batch arrives.
+    """
+
+    __slots__ = ('keys', 'interval', 'pending', 'lock', 'notify', 'sent_at')
+
+    def __init__(self, keys, interval):
+        self.keys = keys            # {(bus, address, channel)}, or None for every channel
+        self.interval = interval
+        self.pending = {}           # (bus, address, channel) -> (off, source, wall time)
+        self.lock = threading.Lock()
+        self.notify = None
+        self.sent_at = float('-inf')
+
+    def labels(self):
+        if self.keys is None:
+            return 'all'
+        return [_label(_buses[number], address, channel)
+                for number, address, channel in sorted(self.keys)]
+
+    def offer(self, key, off, source, ts, replace=True):
+        if self.keys is not None and key not in self.keys:
+            return
+        with self.lock:
+            first = not self.pending
+            if replace or key not in self.pending:
+                self.pending[key] = (off, source, ts)
+            notify = self.notify if first else None
+        if notify is not None:
+            notify()
+
+    def attach(self, notify):
+        """Install the front end's wake-up; wakes it at once if changes are waiting."""
+        with self.lock:
+            self.notify = notify
+            waiting = bool(self.pending)
+        if waiting:
+            notify()
+
+    def wait_s(self):
+        """Seconds until the next batch may go out under max_rate_hz."""
+        return max(0.0, self.sent_at + self.interval - time.monotonic())
+
+    def take(self):
+        """Every waiting change as event lines, ready to send; b'' if none."""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        self.sent_at = time.monotonic()
+        if not pending:
+            return b''
+        lines = []
+        for (number, address, channel), (off, source, ts) in sorted(pending.items()):
+            lines.append(json.dumps({
+                'event': 'change', 'channel': channel, 'address': address, 'bus': number,
+                'label': _label(_buses[number], address, channel), 'off': off,
+                'angle': round(off_to_angle(off, channel, address, number), 2) if off else None,
+                'source': source or 'daemon', 'ts': round(ts, 4)}))
+        _stats['events_sent'] += len(lines)
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _publish(bus, address, channels, offs):
+    """Offer writes that just reached a chip to every subscriber. Caller holds bus.lock.
+
+    Each becomes one event line on the subscriber's connection:
+
+      {"event":"change","channel":4,"address":64,"bus":1,"label":"64:4","off":307,
+       "angle":90.0,"source":"set_angle","ts":1730000000.1234}
+
+    "source" is the command that wrote it ("snapshot" for the values sent
+    first), angle is null for a released channel. Publishing is a dict store
+    per subscriber, never a socket write under the bus lock, and nothing at
+    all when no one has subscribed.
+
+    A write made by the frame thread is put down to what parked it, or to
+    the kind of motion that made it (bus.origins).
+    """
+    ts = time.time()
+    source = getattr(_call, 'source', None)
+    for channel, off in zip(channels, offs):
+        key = (address, channel)
+        origin = bus.origins.pop(key, None) if source == 'frame' else None
+        for subscriber in _subscribers:
+            subscriber.offer((bus.number, address, channel), off, origin or source, ts)
+
+
+def _subscribe(cmd):
+    """Register a subscription from a subscribe command, primed with the current values.
+
+    "channels" narrows it: each entry a channel number, or {"channel", "address",
+    "bus"} like a move; without it every channel on every bus is watched.
+    "max_rate_hz" caps how often a batch of changes is sent. The subscriber
+    is registered before the current values are read, so nothing written in
+    between is lost, and the values read never overwrite a newer change.
+    """
+    global _subscribers
+    keys = None
+    if cmd.get('channels') is not None:
+        keys = set()
+        for entry in cmd['channels']:
+            entry = entry if isinstance(entry, dict) else {'channel': entry}
+            keys.add((_bus_of(entry, cmd).number, _address_of(entry, cmd),
+                      _validate_channel(entry['channel'])))
+    rate = cmd.get('max_rate_hz')
+    if rate is not None and float(rate) <= 0:
+        raise ValueError('max_rate_hz must be > 0')
+    subscriber = _Subscriber(keys, 1.0 / float(rate) if rate else 0.0)
+    with _subscribers_lock:
+        if len(_subscribers) >= MAX_SUBSCRIBERS:
+            raise ValueError(f"too many subscribers (limit {MAX_SUBSCRIBERS})")
+        _subscribers = _subscribers + (subscriber,)
+    _stats['subscriptions'] += 1
+    ts = time.time()
+    for bus in _buses.values():
+        with bus.lock:
+            current = list(bus.last_off.items())
+        for (address, channel), off in current:
+            subscriber.offer((bus.number, address, channel), off, 'snapshot', ts, replace=False)
+    return subscriber
+
+
+def _unsubscribe(subscriber):
+    global _subscribers
+    with _subscribers_lock:
+        _subscribers = tuple(other for other in _subscribers if other is not subscriber)
+
+
+def _stream_events(conn, subscriber):
+    """Threaded front end: push a subscription down `conn` until either side stops.
+
+    Anything the client sends is read and ignored; its hanging up ends the
+    stream. So does a handoff, so the client reconnects to the new daemon.
+    """
+    ready = threading.Event()
+    subscriber.attach(ready.set)
+    while not _shutdown_event.is_set() and not _handoff.is_set():
+        if ready.wait(0.5):
+            ready.clear()
+            delay = subscriber.wait_s()
+            if delay:
+                time.sleep(delay)
+            out = subscriber.take()
+            if out:
+                conn.sendall(out)
+        if select.select([conn], [], [], 0)[0] and not conn.recv(4096):
+            return
+
+
+async def _async_stream_events(reader, writer, subscriber):
+    """asyncio front end counterpart of _stream_events."""
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+    subscriber.attach(lambda: loop.call_soon_threadsafe(ready.set))
+    hangup = asyncio.ensure_future(_async_until_eof(reader))
+    try:
+        while not _shutdown_event.is_set() and not _handoff.is_set() and not hangup.done():
+            try:
+                await asyncio.wait_for(ready.wait(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            ready.clear()
+            delay = subscriber.wait_s()
+            if delay:
+                await asyncio.sleep(delay)
+            out = subscriber.take()
+            if out:
+                writer.write(out)
+                await writer.drain()
+    finally:
+        hangup.cancel()
+
+
+async def _async_until_eof(reader):
+    while await reader.read(4096):
+        pass
+
+
 # ---------------------------------------------------------------------------
 # Front end 1 — Unix socket (serves every other process on the box)
 # ---------------------------------------------------------------------------
 
+def _serve_frames(conn, buf):
+    """Answer every complete binary frame at the front of buf; return the rest."""
+    while len(buf) >= servo_protocol.HEADER_SIZE:
+        size = servo_protocol.request_size(buf)
+        if len(buf) < size:
+            break
+        out = dispatch_frame(buf[:size])
+        buf = buf[size:]
+        if out is not None:
+            conn.sendall(out)
+    return buf
+
+
+def _track(sock):
+    with _clients_lock:
+        _clients.add(sock)
+
+
+def _untrack(sock):
+    with _clients_lock:
+        _clients.discard(sock)
+
+
 def _serve_connection(conn):
+    _track(conn)
     try:
-        conn.settimeout(30.0)
+        conn.settimeout(CLIENT_IDLE_TIMEOUT_S)
         buf = b''
+        binary = False
         while not _shutdown_event.is_set():
             try:
                 data = conn.recv(4096)
@@ -388,24 +2929,47 @@ def _serve_connection(conn):
             if not data:
                 break
             buf += data
+            if binary:
+                buf = _serve_frames(conn, buf)
+                continue
             while b'\n' in buf:
                 raw, buf = buf.split(b'\n', 1)
                 raw = raw.strip()
                 if not raw:
                     continue
-                reply = dispatch_line(raw.decode('utf-8', 'replace'))
+                reply = dispatch_line(raw.decode('utf-8', 'replace'), on_socket=True)
+                if reply.get('handoff'):
+                    _untrack(conn)
+                    _hand_off(conn, reply)
+                    return
+                subscriber = reply.pop('subscription', None)
                 conn.sendall((json.dumps(reply) + '\n').encode('utf-8'))
-    except OSError:
-        pass  # client hung up mid-command; nothing to recover
+                if subscriber is not None:
+                    try:
+                        _stream_events(conn, subscriber)
+                    finally:
+                        _unsubscribe(subscriber)
+                    return
+                if reply.get('protocol') == 'binary':
+                    binary = True
+                    buf = _serve_frames(conn, buf)
+                    break
+    except (OSError, ValueError):
+        pass  # client hung up mid-command, or its binary framing is beyond repair
     finally:
+        _untrack(conn)
         try:
             conn.close()
         except Exception:
             pass
 
 
-def _try_bind(path):
-    """Bind the socket if nobody live is already on it. Returns a socket or None."""
+def _try_bind(path, primary=True):
+    """Bind the socket if nobody live is already on it. Returns a socket or None.
+
+    `primary` is the command socket, the one a handoff passes on; the jaw
+    socket is bound the same way but is not recorded as the listener.
+    """
     if os.path.exists(path):
         probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         probe.settimeout(0.5)
@@ -432,8 +2996,10 @@ def _try_bind(path):
         os.chmod(path, 0o660)
         server.listen(32)
         server.settimeout(0.5)
-        global _bound_socket_path
-        _bound_socket_path = path
+        if primary:
+            global _bound_socket_path, _listener
+            _bound_socket_path = path
+            _listener = server
         return server
     except OSError as exc:
         _log(f"cannot bind {path}: {exc}")
@@ -444,6 +3010,17 @@ def _try_bind(path):
         return None
 
 
+def _claim_inherited(path):
+    """The listening socket handed over by --takeover, once; None otherwise."""
+    global _inherited_listener, _bound_socket_path, _listener
+    server, _inherited_listener = _inherited_listener, None
+    if server is not None:
+        server.settimeout(0.5)
+        _bound_socket_path = path
+        _listener = server
+    return server
+
+
 def _socket_server(path):
     """Own the Unix socket for as long as this daemon lives.
 
@@ -457,8 +3034,17 @@ def _socket_server(path):
     announced_standby = False
     try:
         while not _shutdown_event.is_set():
+            if _handoff.is_set():
+                # Handing over: accept nothing more. The connections already
+                # open keep being served on their own threads meanwhile.
+                if server is not None:
+                    server.close()
+                    server = None
+                _accept_stopped.set()
+                _shutdown_event.wait(0.2)
+                continue
             if server is None:
-                server = _try_bind(path)
+                server = _claim_inherited(path) or _try_bind(path)
                 if server is None:
                     if not announced_standby:
                         _log(f"{path} is owned by another servo daemon — standing by")
@@ -467,6 +3053,7 @@ def _socket_server(path):
                     continue
                 announced_standby = False
                 _log(f"listening on {path}")
+                _listening.set()
 
             try:
                 conn, _ = server.accept()
@@ -493,13 +3080,573 @@ def _socket_server(path):
                 pass
 
 
+# ---------------------------------------------------------------------------
+# Front end 1b — the same Unix socket, multiplexed on one asyncio loop
+# ---------------------------------------------------------------------------
+
+async def _async_serve_client(reader, writer, executor):
+    """One client connection on the event loop.
+
+    StreamReader does the line framing, so there is no per-read byte
+    concatenation, and the command itself runs on the bounded executor — the
+    loop never blocks on I2C. Lines from one client are still answered strictly
+    in order, exactly like the threaded server. After {"cmd":"binary"} the same
+    holds for servo_protocol frames, read by their fixed-size headers.
+    """
+    loop = asyncio.get_running_loop()
+    binary = False
+    sock = writer.get_extra_info('socket')
+    _track(sock)
+    try:
+        while not _shutdown_event.is_set():
+            if binary:
+                try:
+                    header = await asyncio.wait_for(
+                        reader.readexactly(servo_protocol.HEADER_SIZE), CLIENT_IDLE_TIMEOUT_S)
+                except asyncio.TimeoutError:
+                    break
+                rest = servo_protocol.request_size(header) - len(header)
+                frame = header + (await reader.readexactly(rest) if rest else b'')
+                out = await loop.run_in_executor(
+                    executor, dispatch_frame, frame, time.perf_counter())
+                if out is not None:
+                    writer.write(out)
+                    await writer.drain()
+                continue
+
+            try:
+                raw = await asyncio.wait_for(reader.readline(), CLIENT_IDLE_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                break
+            if not raw:
+                break
+            raw = raw.strip()
+            if not raw:
+                continue
+            reply = await loop.run_in_executor(
+                executor, dispatch_line, raw.decode('utf-8', 'replace'),
+                time.perf_counter(), True)
+            if reply.get('handoff'):
+                # Off the loop and off the executor: it blocks until the drain is over.
+                _untrack(sock)
+                await loop.run_in_executor(None, _hand_off, sock.dup(), reply)
+                break
+            subscriber = reply.pop('subscription', None)
+            writer.write((json.dumps(reply) + '\n').encode('utf-8'))
+            await writer.drain()
+            if subscriber is not None:
+                try:
+                    await _async_stream_events(reader, writer, subscriber)
+                finally:
+                    _unsubscribe(subscriber)
+                break
+            binary = reply.get('protocol') == 'binary'
+    except (OSError, ValueError, asyncio.IncompleteReadError):
+        pass  # client hung up mid-command, sent a line past the read limit, or broke framing
+    finally:
+        _untrack(sock)
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
+async def _async_socket_main(path):
+    """Asyncio counterpart of _socket_server: same bind, standby and cleanup rules."""
+    executor = ThreadPoolExecutor(max_workers=ASYNC_WORKERS,
+                                  thread_name_prefix='servo-io')
+    server = None
+    announced_standby = False
+    try:
+        while not _shutdown_event.is_set():
+            if _handoff.is_set():
+                _accept_stopped.set()
+                await asyncio.sleep(0.2)
+                continue
+            listener = _claim_inherited(path) or _try_bind(path)
+            if listener is None:
+                if not announced_standby:
+                    _log(f"{path} is owned by another servo daemon — standing by")
+                    announced_standby = True
+                for _ in range(25):
+                    if _shutdown_event.is_set():
+                        break
+                    await asyncio.sleep(0.2)
+                continue
+
+            listener.setblocking(False)
+            server = await asyncio.start_unix_server(
+                lambda r, w: _async_serve_client(r, w, executor),
+                sock=listener, limit=1 << 20)
+            _log(f"listening on {path} (asyncio, {ASYNC_WORKERS} workers)")
+            _listening.set()
+            while not _shutdown_event.is_set() and not _handoff.is_set():
+                await asyncio.sleep(0.2)
+            if _handoff.is_set():
+                # Accept nothing more, but keep the loop up: the clients already
+                # connected are still being served until they wind down.
+                server.close()
+                server = None
+    finally:
+        if server is not None:
+            server.close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        executor.shutdown(wait=False)
+
+
+def _async_socket_server(path):
+    """The socket front end on one asyncio loop (--asyncio, or MB_SERVO_FRONTEND=asyncio).
+
+    Same protocol as _socket_server, but every client is multiplexed on one
+    selector loop and commands run on a small bounded executor
+    (MB_SERVO_WORKERS, default 2). On a show night the gesture engine, jaw
+    sync and head tracking all connect at once; this keeps that to a fixed
+    handful of threads contending for the bus lock instead of dozens.
+    servo_daemon_bench.py measures one against the other.
+    """
+    asyncio.run(_async_socket_main(path))
+
+
+# ---------------------------------------------------------------------------
+# Handoff — a replacement daemon takes over the socket without a gap
+# ---------------------------------------------------------------------------
+
+def _export_state():
+    """Stop driving every bus for good and describe each one for the replacement.
+
+    Takes each bus lock at realtime priority and never gives it back, so from
+    here on nothing in this process can write to a chip — not the frame
+    thread, not a late stdin line. Running motions, clips, goals and layers,
+    motion limits, parked writes and pending rotation stops are handed over rather
+    than finished, so a gesture carries on in the new daemon from where it was
+    and a spinning part still stops on time. So is the pose and clip library.
+    """
+    buses = {}
+    for bus in _buses.values():
+        bus.lock.acquire(REALTIME)
+        now = time.monotonic()
+        motions, goals, layered = [], [], []
+        for (address, channel), motion in bus.motions.items():
+            if isinstance(motion, _Jaw):
+                continue  # its stream ends with this daemon; the jaw holds where it is
+            if isinstance(motion, _Layers):
+                layered.append([address, channel, motion.floor, [
+                    {'name': name, 'value': layer.value, 'priority': layer.priority,
+                     'additive': layer.additive, 'weight': layer.weight,
+                     'target': layer.target, 'fade_s': layer.fade_s,
+                     'ttl_s': motion.ttl[name], 'silent_s': now - motion.seen[name],
+                     'min': motion.windows[name][0], 'max': motion.windows[name][1],
+                     'idle': ([motion.generators[name][0].seed,
+                               [list(band) for band in motion.generators[name][0].bands],
+                               now - motion.generators[name][1]]
+                              if name in motion.generators else None)}
+                    for name, layer in motion.layers.items()]])
+                continue
+            if isinstance(motion, _Goal):
+                profile = motion.profile
+                goals.append([address, channel, list(profile.window), profile.velocity,
+                              profile.goal, motion.lo, motion.hi])
+                continue
+            track = motion.track
+            # A clip goes over as the plain track it is, at the speed it is playing.
+            scale = motion.scale if isinstance(motion, _Clip) else 1.0
+            lo, hi = (None, None) if isinstance(motion, _Clip) else (motion.lo, motion.hi)
+            motions.append({
+                'address': address, 'channel': channel, 'elapsed_s': now - motion.started,
+                'min': lo, 'max': hi,
+                'keyframes': [[t / scale, angle, servo_motion.easing_name(fn)] for t, angle, fn
+                              in zip(track.times, track.angles, track.easings)],
+            })
+        buses[str(bus.number)] = {
+            'initialized': sorted(bus.initialized),
+            'dirty': sorted(bus.dirty),
+            'last_off': [[a, c, off] for (a, c), off in sorted(bus.last_off.items())],
+            'driven': [[a, c, off] for (a, c), off in sorted(bus.driven.items())],
+            'pending': [[a, c, off] for (a, c), off in sorted(bus.pending.items())],
+            'motions': motions,
+            'goals': goals,
+            'layers': layered,
+            'limits': [[a, c] + list(limits) for (a, c), limits in sorted(bus.limits.items())],
+            'rotations': [[a, c, bus.timers.due((a, c)) - now] for a, c in bus.timers.keys()],
+        }
+        bus.motions.clear()
+        bus.pending.clear()
+        for key in bus.timers.keys():
+            bus.timers.cancel(key)
+        bus.drop()
+    with _library_lock:
+        library = {kind: {name: entry[0] for name, entry in entries.items()}
+                   for kind, entries in _library.items()}
+    return {'status': 'state', 'buses': buses, 'library': library}
+
+
+def _hand_off(conn, reply):
+    """Give this daemon's listening socket, then its bus state, to the daemon on `conn`.
+
+    The socket is never closed along the way, so a caller connecting at any
+    point is queued in its backlog and accepted by one daemon or the other:
+    nobody is refused and nobody falls back to opening the bus directly.
+
+      1. stop accepting, keeping a duplicate of the listening descriptor;
+      2. pass that descriptor over `conn` (SCM_RIGHTS) with `reply` — the
+         replacement accepts from here on, holding its buses until step 4;
+      3. let the connections already open here finish what they have sent, at
+         most HANDOFF_DRAIN_S; their clients reconnect to the replacement;
+      4. stop every bus and send its state (_export_state), then exit without
+         unlinking the socket path, which is the replacement's now.
+
+    A failure before step 2 completes leaves this daemon serving as before.
+    Runs on the requesting connection's thread and owns `conn`.
+    """
+    global _bound_socket_path
+    try:
+        fd = os.dup(_listener.fileno())
+    except (AttributeError, OSError) as exc:
+        _send_reply(conn, {'status': 'error', 'message': f"cannot hand off: {exc}"})
+        conn.close()
+        return
+
+    _handoff.set()
+    _accept_stopped.wait(HANDOFF_DRAIN_S)
+    try:
+        conn.settimeout(HANDOFF_TIMEOUT_S)
+        socket.send_fds(conn, [(json.dumps(reply) + '\n').encode('utf-8')], [fd])
+    except OSError as exc:
+        _log(f"handoff failed ({exc}) — carrying on as the owner")
+        _resume_serving(fd)
+        conn.close()
+        return
+    os.close(fd)
+    _bound_socket_path = None
+
+    with _clients_lock:
+        clients = list(_clients)
+    _log(f"socket handed over; draining {len(clients)} connection(s)")
+    for client in clients:
+        try:
+            # Reads what the client already sent, then sees EOF.
+            client.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+    drain_started = time.monotonic()
+    while time.monotonic() < drain_started + HANDOFF_DRAIN_S:
+        with _clients_lock:
+            if not _clients:
+                break
+        time.sleep(0.01)
+    with _clients_lock:
+        lingering = len(_clients)
+    drained_ms = (time.monotonic() - drain_started) * 1000.0
+
+    try:
+        conn.sendall((json.dumps(_export_state()) + '\n').encode('utf-8'))
+        _log(f"bus state handed over after a {drained_ms:.0f}ms drain "
+             f"({lingering} connection(s) cut off) — exiting")
+    except OSError as exc:
+        # The replacement has the socket either way; it will read its buses back.
+        _log(f"could not send bus state ({exc}) — exiting")
+    finally:
+        conn.close()
+        _shutdown_event.set()
+
+
+def _send_reply(conn, reply):
+    try:
+        conn.sendall((json.dumps(reply) + '\n').encode('utf-8'))
+    except OSError:
+        pass
+
+
+def _resume_serving(fd):
+    """Undo a handoff that never got its descriptor across: accept on `fd` again."""
+    global _inherited_listener
+    _inherited_listener = socket.socket(fileno=fd)
+    _accept_stopped.clear()
+    _handoff.clear()
+
+
+def _take_over(path, on_demand_only=False):
+    """Ask the daemon serving `path` to hand over. Returns (conn, leftover) or None.
+
+    This is --takeover (or MB_SERVO_TAKEOVER=1): upgrading without a gap, see
+    _hand_off; servo_daemon_bench.py --failover measures it under load. A
+    manager feeding the old daemon's stdin has to switch to the new one's once
+    it reports ready; the stdin protocol itself cannot be handed over.
+
+    On success the inherited listening socket is waiting for the socket server
+    to adopt, and `conn` will carry the old daemon's bus state once it has
+    wound down (_adopt_state). None means there is no daemon there, or one
+    that cannot hand off; startup then carries on exactly as without
+    --takeover. With `on_demand_only` only a daemon pca9685_control started
+    on demand agrees, and finding nothing is not worth a log line.
+    """
+    global _inherited_listener
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(HANDOFF_TIMEOUT_S)
+    request = {'cmd': 'handoff', 'on_demand_only': True} if on_demand_only else {'cmd': 'handoff'}
+    try:
+        conn.connect(path)
+        conn.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        data, fds, _flags, _addr = socket.recv_fds(conn, 65536, 1)
+    except OSError as exc:
+        if not on_demand_only:
+            _log(f"--takeover: nothing to take over on {path} ({exc})")
+        conn.close()
+        return None
+    line, _sep, leftover = data.partition(b'\n')
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        reply = {}
+    if not fds:
+        if on_demand_only:
+            conn.close()
+            return None
+        _log(f"--takeover: the daemon on {path} would not hand off "
+             f"({reply.get('message', 'no socket received')})")
+        conn.close()
+        return None
+    _inherited_listener = socket.socket(fileno=fds[0])
+    _log(f"--takeover: took {path} over from pid {reply.get('pid')}")
+    return conn, leftover
+
+
+def _adopt_state(conn, buf):
+    """Install the bus state the old daemon sends once drained. Caller holds every bus lock.
+
+    Each bus is opened (which reads its chips back, as at any startup) and the
+    old daemon's view laid over it, including any motion still running and
+    any write still parked for its frame.
+    """
+    deadline = time.monotonic() + HANDOFF_DRAIN_S + HANDOFF_TIMEOUT_S
+    while b'\n' not in buf:
+        conn.settimeout(max(0.1, deadline - time.monotonic()))
+        data = conn.recv(65536)
+        if not data:
+            raise OSError('the old daemon closed before sending its state')
+        buf += data
+    state = json.loads(buf.partition(b'\n')[0])
+    for kind, entries in (state.get('library') or {}).items():
+        for name, spec in entries.items():
+            try:
+                _define(kind, spec)
+            except (ValueError, KeyError, TypeError) as exc:
+                _log(f"--takeover: could not adopt {kind} {name!r}: {exc}")
+    for number, snap in (state.get('buses') or {}).items():
+        bus = _buses.get(int(number))
+        if bus is None:
+            _log(f"--takeover: i2c-{number} is not configured here — not adopting it")
+            continue
+        try:
+            bus.get()
+        except (OSError, ImportError) as exc:
+            _log(f"could not open i2c-{bus.number} ({exc}) — opening it on first use")
+        now = time.time()
+        bus.initialized.update({address: now for address in snap.get('initialized', [])})
+        bus.dirty.update(snap.get('dirty', []))
+        bus.last_off.update({(a, c): off for a, c, off in snap.get('last_off', [])})
+        bus.driven.update({(a, c): off for a, c, off in snap.get('driven', [])})
+        bus.pending.update({(a, c): off for a, c, off in snap.get('pending', [])})
+        for spec in snap.get('motions', []):
+            track = servo_motion.Track([(t, angle, servo_motion.easing(name))
+                                        for t, angle, name in spec['keyframes']])
+            motion = _Motion(track, spec.get('min'), spec.get('max'))
+            motion.started -= spec.get('elapsed_s', 0.0)
+            bus.motions[(spec['address'], spec['channel'])] = motion
+        bus.limits.update({(a, c): (v, acc, jerk) for a, c, v, acc, jerk in snap.get('limits', [])})
+        for a, c, window, velocity, goal, lo, hi in snap.get('goals', []):
+            limits = bus.limits.get((a, c))
+            if limits is None:
+                continue
+            profile = servo_motion.Profile(window[-1], goal, *limits, tick=FRAME_S)
+            profile.window.extend(window)
+            profile.velocity = velocity
+            bus.motions[(a, c)] = _Goal(profile, lo, hi)
+        for a, c, floor, specs in snap.get('layers', []):
+            stack = _Layers(floor)
+            for spec in specs:
+                name = spec['name']
+                stack.update(name, spec['value'], spec['additive'], spec['priority'],
+                             spec['target'], spec['fade_s'], spec['ttl_s'],
+                             spec['min'], spec['max'], time.monotonic() - spec['silent_s'])
+                stack.layers[name].weight = spec['weight']
+                if spec.get('idle'):
+                    seed, bands, elapsed_s = spec['idle']
+                    stack.generators[name] = (servo_motion.IdleMotion(bands, seed),
+                                              time.monotonic() - elapsed_s)
+            bus.motions[(a, c)] = stack
+        for a, c, remaining_s in snap.get('rotations', []):
+            bus.timers.schedule((a, c), time.monotonic() + max(0.0, remaining_s))
+        bus.wake.set()
+        _positions_dirty.set()   # save the adopted view, not just what the chips said
+        _log(f"--takeover: i2c-{bus.number}: {len(snap.get('last_off', []))} channel(s), "
+             f"{len(snap.get('motions', [])) + len(snap.get('goals', []))} motion(s) adopted")
+
+
+# ---------------------------------------------------------------------------
+# Front end 3 — the jaw stream socket
+# ---------------------------------------------------------------------------
+
+def _jaw_from(spec):
+    """The header line of a jaw stream -> (bus, address, channel, decoder, _Jaw, delay_s)."""
+    bus, address = _bus_of(spec), _address_of(spec)
+    channel = _validate_channel(spec['channel'])
+    decoder = servo_audio.LevelDecoder(spec.get('format', 'pcm_s16le'),
+                                       spec.get('sample_rate'), FRAME_S)
+    envelope = servo_audio.Envelope(
+        attack_s=float(spec.get('attack_ms', 50)) / 1000.0,
+        release_s=float(spec.get('release_ms', 150)) / 1000.0,
+        gate=float(spec.get('gate', 0.02)),
+        gamma=float(spec.get('gamma', 0.75)),
+        gain=float(spec.get('gain', 1.0)))
+    lo, hi = spec.get('min'), spec.get('max')
+    closed = _clamp_angle(spec['min_angle'], lo, hi)
+    opened = _clamp_angle(spec['max_angle'], lo, hi)
+    delay_s = max(0.0, float(spec.get('delay_ms', 0))) / 1000.0
+    return bus, address, channel, decoder, _Jaw(envelope, closed, opened, lo, hi), delay_s
+
+
+def _serve_jaw(conn):
+    """One jaw stream: a JSON header line, a JSON reply, then audio until EOF.
+
+      {"channel":10,"min_angle":20,"max_angle":55,"format":"pcm_s16le",
+       "sample_rate":16000,"attack_ms":50,"release_ms":150,"gate":0.02,
+       "gamma":0.75,"gain":1.0,"delay_ms":0}        -> {"status":"ok","step_ms":20}
+
+    The stream is mono PCM (pcm_s16le, pcm_f32le), cut into 20ms RMS windows,
+    or one loudness value per step (amplitude_u8, amplitude_f32). An envelope
+    follower (servo_audio) sets the jaw each frame between min_angle (closed)
+    and max_angle (open); at EOF the jaw closes and is left alone.
+
+    Levels are stamped by their position in the stream, counted from when the
+    first bytes arrived plus delay_ms, so a client may send in real time or
+    ahead of time; one falling behind by more than JAW_MAX_LAG_S is re-timed
+    rather than played late. Any other command for the channel takes the jaw
+    over and ends the stream.
+    """
+    jaw = None
+    try:
+        conn.settimeout(CLIENT_IDLE_TIMEOUT_S)
+        buf = b''
+        while b'\n' not in buf:
+            data = conn.recv(4096)
+            if not data or len(buf) > 65536:
+                return
+            buf += data
+        line, _sep, data = buf.partition(b'\n')
+        try:
+            bus, address, channel, decoder, jaw, delay_s = _jaw_from(json.loads(line))
+        except (ValueError, KeyError, TypeError) as exc:
+            _send_reply(conn, {'status': 'error', 'message': str(exc)})
+            return
+        denied = _broken_channels().get(channel)
+        if denied:
+            _send_reply(conn, {'status': 'error', 'message': f"ch{channel} refused — {denied}"})
+            return
+        key = (address, channel)
+        with bus.lock:
+            _cancel_motion(bus, address, channel)
+            bus.motions[key] = jaw
+            bus.pending.pop(key, None)
+            bus.wake.set()
+        _stats['jaw_streams'] += 1
+        _send_reply(conn, {'status': 'ok', 'channel': channel,
+                           'step_ms': round(decoder.step_s * 1000, 3)})
+
+        start, index, step_s = None, 0, decoder.step_s
+        while not _shutdown_event.is_set() and bus.motions.get(key) is jaw:
+            if data:
+                now = time.monotonic()
+                if start is None:
+                    start = now + delay_s
+                elif start + index * step_s < now - JAW_MAX_LAG_S:
+                    start = now - index * step_s
+                levels = decoder.levels(data)
+                for level in levels:
+                    jaw.levels.append((start + index * step_s, level, step_s))
+                    index += 1
+                _stats['jaw_levels'] += len(levels)
+            data = conn.recv(65536)
+            if not data:
+                break
+    except OSError:
+        pass  # client hung up
+    finally:
+        if jaw is not None:
+            jaw.ended = True
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def _jaw_server(path):
+    """Accept jaw streams on `path` for as long as this daemon lives.
+
+    Bound like the command socket, standing by while another daemon holds it.
+    It is not passed on in a handoff: the old daemon removes and closes it
+    when it hands over, and the replacement binds it within a second.
+    """
+    server = inode = None
+    try:
+        while not _shutdown_event.is_set():
+            if _handoff.is_set():
+                if server is not None:
+                    _close_jaw_listener(server, path, inode)
+                    server = None
+                _shutdown_event.wait(0.2)
+                continue
+            if server is None:
+                server = _try_bind(path, primary=False)
+                if server is None:
+                    _shutdown_event.wait(1.0)
+                    continue
+                inode = os.stat(path).st_ino
+                _log(f"jaw streams on {path}")
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                server.close()
+                server = None
+                continue
+            threading.Thread(target=_serve_jaw, args=(conn,), daemon=True).start()
+    finally:
+        if server is not None:
+            _close_jaw_listener(server, path, inode)
+
+
+def _close_jaw_listener(server, path, inode):
+    """Remove the jaw socket file if it is still ours, then stop listening.
+
+    In that order: while this listener is open a replacement probing the path
+    finds it live and stands by, so it can only bind once the file is gone,
+    and a file it has bound in the meantime (a different inode) is left alone.
+    """
+    try:
+        if os.stat(path).st_ino == inode:
+            os.unlink(path)
+    except OSError:
+        pass
+    server.close()
+
+
 # ---------------------------------------------------------------------------
 # Front end 2 — stdin/stdout (the original jaw-daemon protocol, unchanged)
 # ---------------------------------------------------------------------------
 
 def _send_stdout(obj):
-    sys.stdout.write(json.dumps(obj) + '\n')
-    sys.stdout.flush()
+    try:
+        sys.stdout.write(json.dumps(obj) + '\n')
+        sys.stdout.flush()
+    except (OSError, ValueError):
+        # Nobody reading any more: pca9685_control closes its end once it has
+        # seen `ready` from a daemon it started. That must not stop the daemon.
+        pass
 
 
 def _stdin_loop():
@@ -509,7 +3656,8 @@ def _stdin_loop():
         line = line.strip()
         if not line:
             continue
-        reply = dispatch_line(line)
+        # The jaw is the most visible lag there is: it goes ahead of scene traffic.
+        reply = dispatch_line(line, default_priority=REALTIME)
         _send_stdout(reply)
         if reply.get('status') == 'shutdown':
             break
@@ -543,11 +3691,70 @@ def main():
     signal.signal(signal.SIGINT, _handle_signal)
 
     use_stdin = '--no-stdin' not in sys.argv and _stdin_is_a_live_pipe()
+    use_asyncio = ('--asyncio' in sys.argv
+                   or os.environ.get('MB_SERVO_FRONTEND', '').lower() == 'asyncio')
 
     socket_path = os.environ.get('MB_SERVO_SOCKET', SERVO_SOCKET_PATH)
-    threading.Thread(target=_socket_server, args=(socket_path,), daemon=True).start()
+    global _on_demand, _frame_scheduler
+    _on_demand = '--on-demand' in sys.argv
+    if '--frame-scheduler' in sys.argv:
+        _frame_scheduler = True
+    takeover = None
+    if '--takeover' in sys.argv or os.environ.get('MB_SERVO_TAKEOVER') == '1':
+        takeover = _take_over(socket_path)
+    elif use_stdin:
+        # A daemon a CLI call started on demand steps aside for the managed one.
+        takeover = _take_over(socket_path, on_demand_only=True)
+    if POSITIONS_PATH:
+        # Taken by each bus's first snapshot, in _warm_start or at adoption.
+        _saved_positions.update(_load_positions(POSITIONS_PATH))
+    if takeover:
+        # Commands are accepted at once but wait here for the buses until the
+        # old daemon has stopped writing and sent what it was doing.
+        for bus in _buses.values():
+            bus.lock.acquire(REALTIME)
+    else:
+        # Before anything can write: what the chips hold now is what `state`
+        # reports and what the first writes are deduplicated and eased against.
+        _warm_start()
+    for bus in _buses.values():
+        threading.Thread(target=_frame_loop, args=(bus,), daemon=True,
+                         name=f"servo-frame-{bus.number}").start()
+        threading.Thread(target=_verify_loop, args=(bus,), daemon=True,
+                         name=f"servo-verify-{bus.number}").start()
+    if POSITIONS_PATH:
+        threading.Thread(target=_positions_loop, args=(POSITIONS_PATH,), daemon=True,
+                         name='servo-positions').start()
+    if STATS_FILE:
+        threading.Thread(target=_stats_dump_loop, args=(STATS_FILE,), daemon=True).start()
+        _log(f"appending stats to {STATS_FILE} every {STATS_INTERVAL_S:g}s")
+    if _frame_scheduler:
+        _log('frame-scheduler mode: every write goes out with its bus\'s next frame')
+    if len(_buses) > 1:
+        _log(f"driving I2C buses {', '.join(map(str, BUS_NUMBERS))} "
+             f"(default {DEFAULT_BUS})")
+    server_main = _async_socket_server if use_asyncio else _socket_server
+    threading.Thread(target=server_main, args=(socket_path,), daemon=True).start()
+    if JAW_SOCKET_PATH:
+        threading.Thread(target=_jaw_server, args=(JAW_SOCKET_PATH,), daemon=True,
+                         name='servo-jaw').start()
+
+    if takeover:
+        conn, leftover = takeover
+        try:
+            _adopt_state(conn, leftover)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            _log(f"--takeover: no bus state from the old daemon ({exc}) — reading the chips")
+            _warm_start()
+        finally:
+            conn.close()
+            for bus in _buses.values():
+                bus.lock.release()
 
-    # Announce readiness on stdout for the jaw-daemon Node manager.
+    # Announce readiness on stdout for the jaw-daemon Node manager. Only now:
+    # the snapshot above is complete, so `state` is already accurate, and the
+    # socket is accepting (a daemon standing by behind another gives up waiting).
+    _listening.wait(2.0)
     _send_stdout({'status': 'ready'})
 
     if use_stdin:
@@ -559,8 +3766,15 @@ def main():
         time.sleep(0.2)
 
     _send_stdout({'status': 'shutdown'})
-    with _bus_lock:
-        _drop_bus()
+    if not _handoff.is_set():  # a handoff already stopped every bus, for good
+        if POSITIONS_PATH and _positions_dirty.is_set():
+            try:
+                _save_positions(POSITIONS_PATH)
+            except OSError as exc:
+                _log(f"positions: cannot save to {POSITIONS_PATH}: {exc}")
+        for bus in _buses.values():
+            with bus.lock:
+                bus.drop()
 
     # The socket server runs on a daemon thread, so the process can exit before
     # that thread's own cleanup runs and leave the socket file behind. A stale
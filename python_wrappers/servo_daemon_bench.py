@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Connection/latency benchmark for the servo daemon's socket front ends.
+
+Why this exists: the threaded front end spawns one thread per accepted
+connection, the asyncio one multiplexes every client on a single loop. Which
+is better on a Pi 4 is a measurement, not an opinion, so this starts a private
+daemon per mode on a throwaway socket, hammers it with concurrent clients the
+way a show night does (gesture engine, jaw sync and head tracking all at once),
+and reports connect and round-trip latency side by side.
+
+Each mode gets its own daemon process on its own socket path, so a running
+show daemon on /tmp/monsterbox-servo.sock is never touched. The default
+payload is a ping, which never reaches the I2C bus. A payload that does touch
+the bus (e.g. '{"cmd":"set_raw","channel":15,"off":0}') makes the benchmark
+daemon a second owner of /dev/i2c-1 — only do that with the show daemon
+stopped.
+
+Usage:
+  python3 servo_daemon_bench.py
+  python3 servo_daemon_bench.py --clients 32 --requests 100 --modes threaded,asyncio
+  python3 servo_daemon_bench.py --persistent --payload '{"cmd":"state"}'
+
+--persistent keeps one connection per client for all of its requests (how
+Node's servoDaemonClient talks); the default reconnects for every request,
+which is how pca9685_control.daemon_request and one-shot CLI calls behave.
+
+JSON lines against the binary framing (servo_protocol.py):
+  python3 servo_daemon_bench.py --protocols json,binary --persistent
+  python3 servo_daemon_bench.py --protocols binary --no-reply --persistent
+  python3 servo_daemon_bench.py --codec --payload '{"cmd":"set_angles","moves":[...]}'
+
+Upgrading a running daemon (servo_daemon.py --takeover):
+  python3 servo_daemon_bench.py --failover --persistent
+
+--failover keeps the clients sending for the whole run while a second daemon
+takes the socket over from the first, and reports how many connections were
+refused or requests lost across the swap (both should be zero) next to the
+request latency, the time the replacement took to report ready and the time
+the old daemon took to exit.
+
+--no-reply sends fire-and-forget binary frames and times each client's whole
+burst, closed by one ping so every frame has been handled. --codec runs no
+daemon at all: it times decode+encode of the payload and its reply in-process,
+which is the per-update CPU the binary framing exists to save.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import servo_protocol
+
+DAEMON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'servo_daemon.py')
+
+MODE_ARGS = {
+    'threaded': [],
+    'asyncio': ['--asyncio'],
+}
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round((pct / 100.0) * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+def _summary(values):
+    return {
+        'n': len(values),
+        'p50_ms': _percentile(values, 50),
+        'p95_ms': _percentile(values, 95),
+        'p99_ms': _percentile(values, 99),
+        'max_ms': round(max(values), 3) if values else None,
+    }
+
+
+def _thread_count(pid):
+    """Live thread count of the daemon, from /proc. None where /proc is absent."""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as handle:
+            for line in handle:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _connect(path, timeout):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(path)
+    return sock
+
+
+def _roundtrip(sock, reader, payload):
+    sock.sendall((json.dumps(payload) + '\n').encode('utf-8'))
+    line = reader.readline()
+    if not line:
+        raise OSError('daemon closed the connection')
+    return json.loads(line)
+
+
+def _read_frame(reader):
+    header = reader.read(servo_protocol.HEADER_SIZE)
+    if len(header) < servo_protocol.HEADER_SIZE:
+        raise OSError('daemon closed the connection')
+    rest = servo_protocol.reply_size(header) - len(header)
+    return servo_protocol.decode_reply(header + (reader.read(rest) if rest else b''))
+
+
+def _roundtrip_binary(sock, reader, payload, seq):
+    sock.sendall(servo_protocol.encode_request(payload, seq))
+    return _read_frame(reader)
+
+
+def _open(path, timeout, protocol):
+    sock = _connect(path, timeout)
+    reader = sock.makefile('rb')
+    if protocol == 'binary':
+        reply = _roundtrip(sock, reader, {'cmd': 'binary'})
+        if reply.get('protocol') != 'binary':
+            sock.close()
+            raise OSError(f"daemon refused binary framing: {reply}")
+    return sock, reader
+
+
+def _wait_for_daemon(path, deadline):
+    while time.time() < deadline:
+        try:
+            sock = _connect(path, 0.5)
+            try:
+                reply = _roundtrip(sock, sock.makefile('rb'), {'cmd': 'ping'})
+                if reply.get('status') == 'pong':
+                    return True
+            finally:
+                sock.close()
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def _client_no_reply(path, payload, requests, timeout, out):
+    """One burst of fire-and-forget frames, closed by a ping; reports the mean per frame."""
+    try:
+        t0 = time.perf_counter()
+        sock, reader = _open(path, timeout, 'binary')
+        connect_ms = [(time.perf_counter() - t0) * 1000.0]
+        try:
+            frame = servo_protocol.encode_request(payload, no_reply=True)
+            t0 = time.perf_counter()
+            for _ in range(requests):
+                sock.sendall(frame)
+            reply = _roundtrip_binary(sock, reader, {'cmd': 'ping'}, requests)
+            per_ms = (time.perf_counter() - t0) * 1000.0 / (requests + 1)
+        finally:
+            sock.close()
+        out.append((connect_ms, [per_ms] * requests, 0 if reply.get('status') == 'pong' else 1))
+    except (OSError, ValueError):
+        out.append(([], [], requests))
+
+
+def _client(path, payload, requests, persistent, timeout, out, protocol='json'):
+    connect_ms, request_ms, errors = [], [], 0
+    sock = reader = None
+    try:
+        for seq in range(requests):
+            body = dict(payload, id=seq)
+            try:
+                if sock is None:
+                    t0 = time.perf_counter()
+                    sock, reader = _open(path, timeout, protocol)
+                    connect_ms.append((time.perf_counter() - t0) * 1000.0)
+                t0 = time.perf_counter()
+                if protocol == 'binary':
+                    reply = _roundtrip_binary(sock, reader, payload, seq)
+                else:
+                    reply = _roundtrip(sock, reader, body)
+                request_ms.append((time.perf_counter() - t0) * 1000.0)
+                if reply.get('id') != seq or reply.get('status') == 'error':
+                    errors += 1
+            except (OSError, ValueError):
+                errors += 1
+                if sock is not None:
+                    sock.close()
+                sock = reader = None
+                continue
+            if not persistent:
+                sock.close()
+                sock = reader = None
+    finally:
+        if sock is not None:
+            sock.close()
+    out.append((connect_ms, request_ms, errors))
+
+
+def _failover_client(path, payload, persistent, timeout, stop, out):
+    """Requests back to back until `stop`, failing the way a real caller would.
+
+    As in pca9685_control.daemon_request_many, a kept connection that turns out
+    to be dead is replaced once and the request resent. A connect that fails
+    is a refusal: the point where a real caller gives up on the daemon and
+    opens the bus itself.
+    """
+    request_ms, refused, failed = [], 0, 0
+    sock = reader = None
+    seq = 0
+    while not stop.is_set():
+        seq += 1
+        body = dict(payload, id=seq)
+        for attempt in range(2):
+            reused = sock is not None
+            if sock is None:
+                try:
+                    sock, reader = _open(path, timeout, 'json')
+                except OSError:
+                    refused += 1
+                    break
+            t0 = time.perf_counter()
+            try:
+                reply = _roundtrip(sock, reader, body)
+            except (OSError, ValueError):
+                sock.close()
+                sock = reader = None
+                if reused and attempt == 0:
+                    continue
+                failed += 1
+                break
+            request_ms.append((time.perf_counter() - t0) * 1000.0)
+            if reply.get('id') != seq or reply.get('status') == 'error':
+                failed += 1
+            break
+        if not persistent and sock is not None:
+            sock.close()
+            sock = reader = None
+    if sock is not None:
+        sock.close()
+    out.append((request_ms, refused, failed))
+
+
+def _wait_for_ready(proc, deadline):
+    """Block until the daemon prints {"status":"ready"} on stdout; False on timeout or exit."""
+    result = []
+
+    def read():
+        for line in proc.stdout:
+            try:
+                if json.loads(line).get('status') == 'ready':
+                    result.append(True)
+                    return
+            except ValueError:
+                continue
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    reader.join(max(0.0, deadline - time.time()))
+    return bool(result)
+
+
+def run_failover(mode, args, payload):
+    """Swap daemons under load with --takeover and count what the clients noticed."""
+    sock_dir = tempfile.mkdtemp(prefix='mb-servo-bench-')
+    path = os.path.join(sock_dir, f'{mode}.sock')
+    env = dict(os.environ, MB_SERVO_SOCKET=path)
+    stderr = subprocess.DEVNULL if args.quiet_daemon else None
+    old = subprocess.Popen(
+        [sys.executable, DAEMON, '--no-stdin'] + MODE_ARGS[mode],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=stderr, env=env)
+    new = None
+    try:
+        if not _wait_for_daemon(path, time.time() + 10.0):
+            return {'mode': mode, 'error': 'daemon did not come up'}
+
+        stop = threading.Event()
+        results = []
+        threads = [threading.Thread(target=_failover_client,
+                                    args=(path, payload, args.persistent, args.timeout,
+                                          stop, results))
+                   for _ in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.failover_settle_s)
+
+        t0 = time.perf_counter()
+        new = subprocess.Popen(
+            [sys.executable, DAEMON, '--no-stdin', '--takeover'] + MODE_ARGS[mode],
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr, env=env,
+            text=True)
+        ready = _wait_for_ready(new, time.time() + 15.0)
+        ready_ms = (time.perf_counter() - t0) * 1000.0
+        try:
+            old.wait(timeout=15.0)
+            old_exit_ms = round((time.perf_counter() - t0) * 1000.0, 1)
+        except subprocess.TimeoutExpired:
+            old_exit_ms = None
+        time.sleep(args.failover_settle_s)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        request_ms = [v for r, _refused, _failed in results for v in r]
+        return {
+            'mode': mode,
+            'clients': args.clients,
+            'persistent': args.persistent,
+            'requests': len(request_ms),
+            'refused': sum(refused for _r, refused, _f in results),
+            'failed': sum(failed for _r, _refused, failed in results),
+            'takeover_ready_ms': round(ready_ms, 1) if ready else None,
+            'old_daemon_exit_ms': old_exit_ms,
+            'request': _summary(request_ms),
+        }
+    finally:
+        try:
+            sock = _connect(path, 1.0)
+            _roundtrip(sock, sock.makefile('rb'), {'cmd': 'shutdown'})
+            sock.close()
+        except OSError:
+            pass
+        for proc in (old, new):
+            if proc is None:
+                continue
+            try:
+                proc.wait(timeout=5.0)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        try:
+            os.rmdir(sock_dir)
+        except OSError:
+            pass
+
+
+def run_mode(mode, args, payload, protocol='json'):
+    sock_dir = tempfile.mkdtemp(prefix='mb-servo-bench-')
+    path = os.path.join(sock_dir, f'{mode}.sock')
+    env = dict(os.environ, MB_SERVO_SOCKET=path)
+    proc = subprocess.Popen(
+        [sys.executable, DAEMON, '--no-stdin'] + MODE_ARGS[mode],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL if args.quiet_daemon else None, env=env)
+    try:
+        if not _wait_for_daemon(path, time.time() + 10.0):
+            return {'mode': mode, 'error': 'daemon did not come up'}
+
+        results = []
+        if args.no_reply:
+            target, client_args = _client_no_reply, (path, payload, args.requests,
+                                                     args.timeout, results)
+        else:
+            target, client_args = _client, (path, payload, args.requests, args.persistent,
+                                            args.timeout, results, protocol)
+        threads = [threading.Thread(target=target, args=client_args)
+                   for _ in range(args.clients)]
+        peak_threads = _thread_count(proc.pid)
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        while any(t.is_alive() for t in threads):
+            count = _thread_count(proc.pid)
+            if count is not None and (peak_threads is None or count > peak_threads):
+                peak_threads = count
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - t0
+
+        connect_ms = [v for c, _r, _e in results for v in c]
+        request_ms = [v for _c, r, _e in results for v in r]
+        errors = sum(e for _c, _r, e in results)
+        return {
+            'mode': mode,
+            'protocol': protocol + (' (no reply)' if args.no_reply else ''),
+            'clients': args.clients,
+            'requests_per_client': args.requests,
+            'persistent': args.persistent,
+            'elapsed_s': round(elapsed, 3),
+            'throughput_rps': round(len(request_ms) / elapsed, 1) if elapsed else None,
+            'errors': errors,
+            'peak_daemon_threads': peak_threads,
+            'connect': _summary(connect_ms),
+            'request': _summary(request_ms),
+        }
+    finally:
+        try:
+            sock = _connect(path, 1.0)
+            _roundtrip(sock, sock.makefile('rb'), {'cmd': 'shutdown'})
+            sock.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=5.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        try:
+            os.rmdir(sock_dir)
+        except OSError:
+            pass
+
+
+def codec_benchmark(payload, iterations):
+    """Per-update decode+encode cost of JSON lines against binary frames, in-process.
+
+    Mirrors what the daemon does with one request: decode it, build the reply
+    dict (a canned one here), encode the reply. No socket, no bus.
+    """
+    if payload.get('cmd') == 'set_angles':
+        reply = {'status': 'ok', 'results': [{'channel': m['channel'], 'angle': m['angle'],
+                                              'status': 'success'}
+                                             for m in payload.get('moves') or []]}
+    elif payload.get('cmd') == 'ping':
+        reply = {'status': 'pong'}
+    else:
+        reply = {'status': 'ok', 'channel': payload.get('channel')}
+
+    line = json.dumps(dict(payload, id=1)) + '\n'
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        cmd = json.loads(line)
+        (json.dumps(dict(reply, id=cmd['id'])) + '\n').encode('utf-8')
+    json_us = (time.perf_counter() - t0) * 1e6 / iterations
+
+    frame = servo_protocol.encode_request(payload, 1)
+    op = frame[0]
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        _cmd, request_id, _no_reply = servo_protocol.decode_request(frame)
+        servo_protocol.encode_reply(op, request_id, reply)
+    binary_us = (time.perf_counter() - t0) * 1e6 / iterations
+
+    return {
+        'iterations': iterations,
+        'json': {'request_bytes': len(line), 'us_per_update': round(json_us, 3)},
+        'binary': {'request_bytes': len(frame), 'us_per_update': round(binary_us, 3)},
+        'speedup': round(json_us / binary_us, 2) if binary_us else None,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--modes', default='threaded,asyncio',
+                    help='comma-separated front ends to compare')
+    ap.add_argument('--clients', type=int, default=24, help='concurrent clients')
+    ap.add_argument('--requests', type=int, default=50, help='requests per client')
+    ap.add_argument('--payload', default='{"cmd":"ping"}', help='JSON command to send')
+    ap.add_argument('--persistent', action='store_true',
+                    help='one connection per client instead of one per request')
+    ap.add_argument('--timeout', type=float, default=5.0, help='per-socket timeout, seconds')
+    ap.add_argument('--quiet-daemon', action='store_true', help="discard the daemons' stderr")
+    ap.add_argument('--protocols', default='json',
+                    help='comma-separated framings to compare: json, binary')
+    ap.add_argument('--no-reply', action='store_true',
+                    help='binary only: fire-and-forget frames, one burst per client')
+    ap.add_argument('--codec', action='store_true',
+                    help='in-process encode/decode micro-benchmark only, no daemon')
+    ap.add_argument('--iterations', type=int, default=100000, help='--codec iterations')
+    ap.add_argument('--failover', action='store_true',
+                    help='hand the socket to a --takeover daemon under load and count refusals')
+    ap.add_argument('--failover-settle-s', type=float, default=1.0,
+                    help='--failover: seconds of load before and after the swap')
+    args = ap.parse_args()
+
+    try:
+        payload = json.loads(args.payload)
+    except ValueError as exc:
+        print(json.dumps({'error': f'invalid --payload: {exc}'}))
+        return 1
+    if not isinstance(payload, dict):
+        print(json.dumps({'error': '--payload must be a JSON object'}))
+        return 1
+
+    if args.codec or 'binary' in args.protocols or args.no_reply:
+        try:
+            servo_protocol.encode_request(payload)
+        except (KeyError, ValueError) as exc:
+            print(json.dumps({'error': f'payload has no binary form: {exc}'}))
+            return 1
+    if args.codec:
+        print(json.dumps({'payload': payload,
+                          'codec': codec_benchmark(payload, args.iterations)}, indent=1))
+        return 0
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    for mode in modes:
+        if mode not in MODE_ARGS:
+            print(json.dumps({'error': f'unknown mode: {mode}'}))
+            return 1
+    if args.failover:
+        report = {'payload': payload,
+                  'failover': [run_failover(m, args, payload) for m in modes]}
+        print(json.dumps(report, indent=1))
+        return 0
+
+    protocols = ['binary'] if args.no_reply else [
+        p.strip() for p in args.protocols.split(',') if p.strip()]
+    for protocol in protocols:
+        if protocol not in ('json', 'binary'):
+            print(json.dumps({'error': f'unknown protocol: {protocol}'}))
+            return 1
+
+    report = {'payload': payload,
+              'results': [run_mode(m, args, payload, p) for m in modes for p in protocols]}
+    print(json.dumps(report, indent=1))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
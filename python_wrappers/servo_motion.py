@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+"""
+Motion math for the shared servo daemon.
+
+Pure functions and small value objects only — no I2C, no threads, no clocks.
+servo_daemon.py owns the frame thread and the bus; this module only answers
+"where should this channel be, this many seconds in". Keeping the two apart
+means a curve can be checked on a laptop without a PCA9685 in sight:
+
+  python3 -c "import servo_motion as m; print(m.easing('ease_in_out')(0.25))"
+
+Every curve here is monotonic between its keyframes on purpose. An easing
+that overshoots (back, elastic) would carry a servo past a keyframe the caller
+already clamped to its calibrated window, and the daemon's contract is that it
+can only ever narrow a caller's limits, never widen them.
+"""
+
+import bisect
+import collections
+import math
+
+
+def _ease_in(t):
+    return t * t
+
+
+def _ease_out(t):
+    return t * (2.0 - t)
+
+
+def _ease_in_out(t):
+    # Cubic: gentle at both ends, which is what reads as "natural" on a head.
+    if t < 0.5:
+        return 4.0 * t * t * t
+    u = 2.0 * t - 2.0
+    return 0.5 * u * u * u + 1.0
+
+
+def _sine(t):
+    return 0.5 - 0.5 * math.cos(math.pi * t)
+
+
+def _smoothstep(t):
+    return t * t * (3.0 - 2.0 * t)
+
+
+EASINGS = {
+    'linear': lambda t: t,
+    'ease_in': _ease_in,
+    'ease_out': _ease_out,
+    'ease_in_out': _ease_in_out,
+    'sine': _sine,
+    'smoothstep': _smoothstep,
+}
+
+
+def easing(name):
+    """Look up an easing by name ('ease-in-out' and 'ease_in_out' both work)."""
+    key = str(name or 'linear').strip().lower().replace('-', '_')
+    try:
+        return EASINGS[key]
+    except KeyError:
+        raise ValueError(f"Unknown easing: {name} (use one of {', '.join(sorted(EASINGS))})")
+
+
+def easing_name(fn):
+    """The name easing() finds `fn` under, so a track can be written out and rebuilt."""
+    for name, candidate in EASINGS.items():
+        if candidate is fn:
+            return name
+    return 'linear'
+
+
+class Track:
+    """One channel's keyframed motion: angle as a function of elapsed seconds.
+
+    `keyframes` is a list of (t_s, angle_deg, easing_fn) sorted by time with the
+    first at t=0. Each segment's easing is the one on the keyframe it arrives
+    at, so "get to 120 by 300ms, easing out" is a single keyframe.
+    """
+
+    __slots__ = ('times', 'angles', 'easings')
+
+    def __init__(self, keyframes):
+        if not keyframes:
+            raise ValueError('a track needs at least one keyframe')
+        self.times = [float(t) for t, _a, _e in keyframes]
+        self.angles = [float(a) for _t, a, _e in keyframes]
+        self.easings = [e for _t, _a, e in keyframes]
+        if self.times[0] != 0.0:
+            raise ValueError('the first keyframe must be at t=0')
+        for earlier, later in zip(self.times, self.times[1:]):
+            if later < earlier:
+                raise ValueError('keyframes must be in time order')
+
+    @property
+    def duration(self):
+        return self.times[-1]
+
+    @property
+    def target(self):
+        return self.angles[-1]
+
+    def sample(self, elapsed):
+        if elapsed <= 0.0:
+            return self.angles[0]
+        if elapsed >= self.times[-1]:
+            return self.angles[-1]
+        index = bisect.bisect_right(self.times, elapsed)
+        t0, t1 = self.times[index - 1], self.times[index]
+        a0, a1 = self.angles[index - 1], self.angles[index]
+        if t1 <= t0:
+            return a1
+        progress = self.easings[index]((elapsed - t0) / (t1 - t0))
+        return a0 + (a1 - a0) * progress
+
+
+PROFILES = ('trapezoid', 's_curve')
+
+# Longest S-curve smoothing window, in ticks; a tiny max_jerk is capped here.
+MAX_SMOOTHING_TICKS = 50
+
+
+class Profile:
+    """Online velocity/acceleration-limited approach to a goal, one fixed tick at a time.
+
+    No precomputed curve: every step() asks "how fast may I be going, this far
+    from the goal, and still brake to a stop on it?" and moves the velocity
+    towards that by at most one tick's worth of max_accel. That alone is a
+    trapezoid (accelerate, cruise at max_velocity, brake). With max_jerk the
+    output is the average of the last max_accel / max_jerk seconds of that
+    trapezoid, which ramps the acceleration in and out over the same time and
+    rounds every corner off into an S-curve.
+
+    Because the plan is redone each tick from where the profile is and how fast
+    it is going, retarget() mid-motion simply carries on from there: a part
+    heading the other way brakes at max_accel and comes back, rather than
+    reversing on the spot. The trapezoid lands on the goal and never passes
+    it, and an average of positions that never pass it cannot either, so a
+    profile does not overshoot a target the caller clamped (see the module
+    docstring on why that matters).
+    """
+
+    __slots__ = ('goal', 'tick', 'max_velocity', 'max_accel', 'max_jerk',
+                 'reference', 'velocity', 'window')
+
+    def __init__(self, position, goal, max_velocity, max_accel, max_jerk=None, velocity=0.0,
+                 tick=0.02):
+        self.goal = float(goal)
+        self.tick = float(tick)
+        self.reference = float(position)
+        self.velocity = float(velocity)
+        self.window = collections.deque([self.reference])
+        self.set_limits(max_velocity, max_accel, max_jerk)
+        if self.velocity and len(self.window) > 1:
+            # Seed the window with a part already moving at `velocity`, centred
+            # on `position`, so the first steps carry on at speed.
+            n = len(self.window)
+            seeded = [self.reference + self.velocity * self.tick * (i - (n - 1) / 2.0)
+                      for i in range(n)]
+            limit = min if self.goal >= self.reference else max
+            self.window.extend(limit(p, self.goal) for p in seeded)
+            self.reference = self.window[-1]
+
+    def set_limits(self, max_velocity, max_accel, max_jerk=None):
+        if max_velocity <= 0 or max_accel <= 0 or (max_jerk is not None and max_jerk <= 0):
+            raise ValueError('motion limits must be positive')
+        self.max_velocity = float(max_velocity)
+        self.max_accel = float(max_accel)
+        self.max_jerk = None if max_jerk is None else float(max_jerk)
+        length = 1
+        if self.max_jerk is not None:
+            length = int(round(self.max_accel / (self.max_jerk * self.tick)))
+            length = max(1, min(MAX_SMOOTHING_TICKS, length))
+        history = list(self.window)[-length:]
+        self.window = collections.deque([history[0]] * (length - len(history)) + history,
+                                        maxlen=length)
+
+    @property
+    def position(self):
+        return sum(self.window) / len(self.window)
+
+    @property
+    def done(self):
+        return self.velocity == 0.0 and all(p == self.goal for p in self.window)
+
+    def retarget(self, goal):
+        self.goal = float(goal)
+
+    def step(self):
+        """Advance one tick; returns the new position."""
+        remaining = self.goal - self.reference
+        accel_step = self.max_accel * self.tick
+        # Braking from n * accel_step one tick at a time covers n(n+1)/2 steps'
+        # worth of distance: the largest n that still fits in `remaining`.
+        n = math.sqrt(0.25 + 2.0 * abs(remaining) / (accel_step * self.tick)) - 0.5
+        wanted = math.copysign(min(self.max_velocity, n * accel_step), remaining)
+        self.velocity += max(-accel_step, min(accel_step, wanted - self.velocity))
+
+        moved = self.velocity * self.tick
+        if moved * remaining >= 0 and abs(moved) >= abs(remaining):
+            self.reference, self.velocity = self.goal, 0.0  # on the goal, never past it
+        else:
+            self.reference += moved
+        self.window.append(self.reference)
+        return self.position
+
+
+class Layer:
+    """One source's say in a channel: an absolute angle, or an offset added on top.
+
+    `weight` (0-1) is how much of it shows. An absolute layer pulls the value
+    from whatever the layers below it resolved to towards its own angle by
+    that fraction, so weight 1 is a plain override; an additive layer adds
+    weight * offset. A weight change, including fading in a new layer and
+    fading out a cleared one, ramps over `fade_s` instead of jumping.
+    """
+
+    __slots__ = ('value', 'priority', 'additive', 'weight', 'target', 'fade_s')
+
+    def __init__(self, value, priority=0, additive=False, weight=1.0, fade_s=0.0):
+        self.value = float(value)
+        self.priority = int(priority)
+        self.additive = bool(additive)
+        self.weight = 0.0
+        self.target = 0.0
+        self.fade_s = 0.0
+        self.fade_to(weight, fade_s)
+
+    def fade_to(self, weight, fade_s=0.0):
+        self.target = max(0.0, min(1.0, float(weight)))
+        self.fade_s = max(0.0, float(fade_s))
+        if not self.fade_s:
+            self.weight = self.target
+
+    @property
+    def gone(self):
+        """Faded all the way out."""
+        return self.target == 0.0 and self.weight == 0.0
+
+    def step(self, dt):
+        if self.weight == self.target:
+            return
+        if not self.fade_s:
+            self.weight = self.target
+            return
+        change = dt / self.fade_s
+        if self.weight < self.target:
+            self.weight = min(self.target, self.weight + change)
+        else:
+            self.weight = max(self.target, self.weight - change)
+
+
+def blend(floor, layers):
+    """Resolve a channel's layers into one angle, or None if there is nothing to go on.
+
+    Absolute layers apply lowest priority first (ties in the order given), each
+    starting from what the ones below resolved to, and `floor` — where the
+    channel was before any layer — below them all. Additive layers go on top.
+    """
+    value = floor
+    absolute = sorted((layer for layer in layers if not layer.additive),
+                      key=lambda layer: layer.priority)
+    for layer in absolute:
+        if value is None:
+            value = layer.value
+        else:
+            value += (layer.value - value) * layer.weight
+    if value is None:
+        return None
+    for layer in layers:
+        if layer.additive:
+            value += layer.value * layer.weight
+    return value
+
+
+IDLE_KINDS = ('noise', 'sine', 'dart')
+
+_MASK64 = (1 << 64) - 1
+
+
+def _lattice(seed, band, index):
+    """A repeatable pseudo-random value in [-1, 1) for one lattice point (splitmix64)."""
+    x = (seed * 0x9E3779B97F4A7C15 + band * 0xD1B54A32D192ED03 + index * 0x94D049BB133111EB) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    x ^= x >> 31
+    return x / float(1 << 63) - 1.0
+
+
+def _fade(u):
+    # Quintic: the curve and its first two derivatives are continuous across
+    # lattice points, so noise built on it never jerks.
+    return u * u * u * (u * (u * 6.0 - 15.0) + 10.0)
+
+
+class IdleMotion:
+    """Procedural "alive" motion: a sum of bands, as an offset in degrees at time t.
+
+    `bands` is [(kind, amplitude_deg, frequency_hz, transition_s)]:
+      noise — smooth value noise, about `frequency_hz` changes of direction a
+              second (fidgets, drift);
+      sine  — a steady oscillation (breathing);
+      dart  — holds a random offset, then snaps to the next over
+              `transition_s` about `frequency_hz` times a second (eye darts).
+    Each band stays within +-amplitude. The same seed always gives the same
+    motion, so two channels given different seeds never move in lockstep.
+    """
+
+    __slots__ = ('bands', 'seed')
+
+    def __init__(self, bands, seed=0):
+        self.bands = []
+        for kind, amplitude, frequency, transition in bands:
+            if kind not in IDLE_KINDS:
+                raise ValueError(f"Unknown idle band kind: {kind} (use one of {', '.join(IDLE_KINDS)})")
+            if frequency <= 0:
+                raise ValueError('an idle band needs a frequency_hz > 0')
+            self.bands.append((kind, abs(float(amplitude)), float(frequency),
+                               max(0.0, float(transition))))
+        self.seed = int(seed)
+
+    def sample(self, t):
+        total = 0.0
+        for band, (kind, amplitude, frequency, transition) in enumerate(self.bands):
+            if kind == 'sine':
+                phase = (_lattice(self.seed, band, 0) + 1.0) * math.pi
+                total += amplitude * math.sin(2.0 * math.pi * frequency * t + phase)
+                continue
+            x = t * frequency
+            index = math.floor(x)
+            if kind == 'noise':
+                a = _lattice(self.seed, band, index)
+                b = _lattice(self.seed, band, index + 1)
+                total += amplitude * (a + (b - a) * _fade(x - index))
+                continue
+            # dart: each cell switches to its value at a jittered point in its first half.
+            cell = 1.0 / frequency
+            switch = (index + 0.25 * (_lattice(self.seed, band, -index - 1) + 1.0)) * cell
+            a = _lattice(self.seed, band, index - 1)
+            b = _lattice(self.seed, band, index)
+            if t < switch:
+                total += amplitude * a
+            elif transition and t < switch + transition:
+                total += amplitude * (a + (b - a) * _smoothstep((t - switch) / transition))
+            else:
+                total += amplitude * b
+        return total
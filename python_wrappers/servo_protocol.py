@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+"""
+Compact binary framing for the servo daemon socket.
+
+JSON lines stay the default and the only thing the stdin jaw protocol speaks.
+This is an opt-in for the hot verbs only — set_angle, set_angles, set_raw,
+release (plus ping, to measure a round trip) — for callers that send them at
+25-50 Hz and would otherwise pay json.loads/json.dumps on every update.
+
+Negotiated per connection: the client sends the JSON line {"cmd":"binary"},
+the daemon answers {"status":"ok","protocol":"binary","version":1} as a JSON
+line, and from then on every byte in both directions on that connection is a
+frame. There is no way back to JSON on the same connection; open another one.
+
+Frames are little-endian and fixed-layout, so a frame's length is known from
+its 8-byte header alone:
+
+  request  op:u8 flags:u8 id:u16 bus:u8 address:u8 count:u8 pad:u8
+           + count * item
+  item     channel:u8 pad:u8 value:u16 min:u16 max:u16
+  reply    op:u8 status:u8 id:u16 count:u8 pad:u8 message_len:u16
+           + count * item_status:u8 + message (utf-8)
+
+`value` is the angle in hundredths of a degree (set_angle, set_angles), the
+off-count (set_raw), or unused (release). min/max are hundredths of a degree
+or 0xFFFF for "none". bus 0xFF and address 0 mean the daemon's defaults.
+status and item_status are 0 for ok, 1 for error; an error carries a message.
+
+Bits 4-5 of flags carry the command's priority class: 0 for the connection's
+default, then realtime, interactive, background (servo_daemon PRIORITIES).
+
+A request with FLAG_NO_REPLY set is fire-and-forget: the daemon sends nothing
+back, not even on error (errors still show up in the daemon's `stats`).
+
+Pure functions only — no sockets. servo_daemon.py decodes with it, and
+servo_daemon_bench.py and any Python client encode with it.
+"""
+
+import struct
+
+VERSION = 1
+
+OP_PING = 0x01
+OP_SET_ANGLE = 0x02
+OP_SET_ANGLES = 0x03
+OP_SET_RAW = 0x04
+OP_RELEASE = 0x05
+
+OPS = {
+    'ping': OP_PING,
+    'set_angle': OP_SET_ANGLE,
+    'set_angles': OP_SET_ANGLES,
+    'set_raw': OP_SET_RAW,
+    'release': OP_RELEASE,
+}
+COMMANDS = {op: name for name, op in OPS.items()}
+
+FLAG_NO_REPLY = 0x01
+FLAG_RELEASE = 0x02   # set_angle: pulse, then release (continuous servos)
+PRIORITY_SHIFT = 4
+PRIORITY_MASK = 0x30
+PRIORITY_NAMES = ('realtime', 'interactive', 'background')
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+NONE_U16 = 0xFFFF
+DEFAULT_BUS = 0xFF
+DEFAULT_ADDRESS = 0x00
+MAX_ITEMS = 64
+MAX_MESSAGE = 1024
+
+REQUEST_HEADER = struct.Struct('<BBHBBBx')
+ITEM = struct.Struct('<BxHHH')
+REPLY_HEADER = struct.Struct('<BBHBxH')
+HEADER_SIZE = REQUEST_HEADER.size
+assert REPLY_HEADER.size == HEADER_SIZE
+
+
+def _expected_items(op, count):
+    if op not in COMMANDS:
+        raise ValueError(f"unknown binary op 0x{op:02x}")
+    if op == OP_PING:
+        return 0
+    if op == OP_SET_ANGLES:
+        if count > MAX_ITEMS:
+            raise ValueError(f"set_angles carries at most {MAX_ITEMS} moves, got {count}")
+        return count
+    return 1
+
+
+def request_size(header):
+    """Total length of the request frame starting with `header` (>= HEADER_SIZE bytes).
+
+    Raises ValueError for a header that cannot be a frame. A stream that
+    produces one has lost its framing for good and must be closed.
+    """
+    op, _flags, _id, _bus, _address, count, = REQUEST_HEADER.unpack_from(header)
+    return HEADER_SIZE + _expected_items(op, count) * ITEM.size
+
+
+def reply_size(header):
+    """Total length of the reply frame starting with `header`."""
+    _op, _status, _id, count, message_len = REPLY_HEADER.unpack_from(header)
+    return HEADER_SIZE + count + message_len
+
+
+def _centi(value):
+    return NONE_U16 if value is None else max(0, min(18000, int(round(float(value) * 100))))
+
+
+def _degrees(value):
+    return None if value == NONE_U16 else value / 100.0
+
+
+def encode_request(cmd, request_id=0, no_reply=False):
+    """Encode a JSON-shaped command dict as one request frame.
+
+    Only the hot verbs have a binary form; anything else raises ValueError and
+    belongs on a JSON connection.
+    """
+    name = cmd.get('cmd')
+    op = OPS.get(name)
+    if op is None:
+        raise ValueError(f"no binary form for {name!r} (use one of {', '.join(OPS)})")
+    flags = FLAG_NO_REPLY if no_reply else 0
+    if cmd.get('release'):
+        flags |= FLAG_RELEASE
+    if cmd.get('priority') is not None:
+        name = str(cmd['priority']).lower()
+        if name not in PRIORITY_NAMES:
+            raise ValueError(f"Unknown priority: {cmd['priority']}")
+        flags |= (PRIORITY_NAMES.index(name) + 1) << PRIORITY_SHIFT
+    bus = cmd.get('bus')
+    address = cmd.get('address')
+    if isinstance(address, str):
+        address = int(address, 0)
+
+    if op == OP_PING:
+        items = []
+    elif op == OP_SET_ANGLES:
+        items = [(m['channel'], _centi(m['angle']), _centi(m.get('min')), _centi(m.get('max')))
+                 for m in cmd.get('moves') or []]
+    elif op == OP_SET_ANGLE:
+        items = [(cmd['channel'], _centi(cmd['angle']),
+                  _centi(cmd.get('min')), _centi(cmd.get('max')))]
+    elif op == OP_SET_RAW:
+        items = [(cmd['channel'], max(0, min(4095, int(cmd['off']))), NONE_U16, NONE_U16)]
+    else:
+        items = [(cmd['channel'], 0, NONE_U16, NONE_U16)]
+    _expected_items(op, len(items))
+
+    parts = [REQUEST_HEADER.pack(op, flags, request_id & 0xFFFF,
+                                 DEFAULT_BUS if bus is None else int(bus),
+                                 DEFAULT_ADDRESS if address is None else int(address),
+                                 len(items))]
+    parts.extend(ITEM.pack(int(channel), value, lo, hi) for channel, value, lo, hi in items)
+    return b''.join(parts)
+
+
+def decode_request(frame):
+    """One complete request frame -> (cmd dict, request_id, no_reply)."""
+    op, flags, request_id, bus, address, count = REQUEST_HEADER.unpack_from(frame)
+    count = _expected_items(op, count)
+    if len(frame) != HEADER_SIZE + count * ITEM.size:
+        raise ValueError('truncated binary frame')
+    cmd = {'cmd': COMMANDS[op]}
+    priority = (flags & PRIORITY_MASK) >> PRIORITY_SHIFT
+    if priority:
+        cmd['priority'] = PRIORITY_NAMES[priority - 1]
+    if bus != DEFAULT_BUS:
+        cmd['bus'] = bus
+    if address != DEFAULT_ADDRESS:
+        cmd['address'] = address
+
+    items = [ITEM.unpack_from(frame, HEADER_SIZE + i * ITEM.size) for i in range(count)]
+    if op == OP_SET_ANGLES:
+        cmd['moves'] = [{'channel': channel, 'angle': value / 100.0,
+                         'min': _degrees(lo), 'max': _degrees(hi)}
+                        for channel, value, lo, hi in items]
+    elif op == OP_SET_ANGLE:
+        channel, value, lo, hi = items[0]
+        cmd.update(channel=channel, angle=value / 100.0, min=_degrees(lo), max=_degrees(hi))
+        if flags & FLAG_RELEASE:
+            cmd['release'] = True
+    elif op == OP_SET_RAW:
+        cmd.update(channel=items[0][0], off=items[0][1])
+    elif op == OP_RELEASE:
+        cmd['channel'] = items[0][0]
+    return cmd, request_id, bool(flags & FLAG_NO_REPLY)
+
+
+def encode_reply(op, request_id, reply):
+    """Encode the daemon's reply dict for a request with this op and id."""
+    ok = reply.get('status') in ('ok', 'pong')
+    statuses = b''
+    if op == OP_SET_ANGLES and ok:
+        statuses = bytes(STATUS_OK if r.get('status') == 'success' else STATUS_ERROR
+                         for r in reply.get('results') or [])
+    message = b''
+    if not ok:
+        message = str(reply.get('message', 'error')).encode('utf-8')[:MAX_MESSAGE]
+    return (REPLY_HEADER.pack(op, STATUS_OK if ok else STATUS_ERROR, request_id & 0xFFFF,
+                              len(statuses), len(message))
+            + statuses + message)
+
+
+def decode_reply(frame):
+    """One complete reply frame -> a dict shaped like the JSON reply.
+
+    {"status": "ok"|"pong"|"error", "id": n}, plus "results" (one bool per
+    move) for set_angles and "message" for an error.
+    """
+    op, status, request_id, count, message_len = REPLY_HEADER.unpack_from(frame)
+    if status != STATUS_OK:
+        reply = {'status': 'error',
+                 'message': frame[HEADER_SIZE + count:HEADER_SIZE + count + message_len]
+                 .decode('utf-8', 'replace')}
+    else:
+        reply = {'status': 'pong' if op == OP_PING else 'ok'}
+    if op == OP_SET_ANGLES and count:
+        reply['results'] = [b == STATUS_OK for b in frame[HEADER_SIZE:HEADER_SIZE + count]]
+    reply['id'] = request_id
+    return reply
@@ -0,0 +1,66 @@
+"""Shared setup for the python_wrappers tests: import path and a fake I2C bus."""
+
+import os
+import sys
+import types
+
+import pytest
+
+PYTHON_WRAPPERS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))), 'python_wrappers')
+sys.path.insert(0, PYTHON_WRAPPERS)
+
+
+class FakeSMBus:
+    """An smbus2.SMBus over in-memory PCA9685 register files.
+
+    Every transaction is appended to `log` as (kind, address, register, data),
+    so a test can count what actually went over the wire.
+    """
+
+    def __init__(self, number=1):
+        self.number = number
+        self.registers = {}   # address -> 256 register values
+        self.log = []
+
+    def _chip(self, address):
+        return self.registers.setdefault(address, [0] * 256)
+
+    def read_byte_data(self, address, register):
+        return self._chip(address)[register]
+
+    def write_byte_data(self, address, register, value):
+        self.log.append(('byte', address, register, [value]))
+        self._chip(address)[register] = value & 0xFF
+
+    def read_i2c_block_data(self, address, register, length):
+        return self._chip(address)[register:register + length]
+
+    def write_i2c_block_data(self, address, register, data):
+        self.log.append(('block', address, register, list(data)))
+        chip = self._chip(address)
+        if register >= 0xFA:   # ALL_LED_* mirror into every channel
+            for channel in range(16):
+                for offset, value in enumerate(data):
+                    chip[0x06 + 4 * channel + register - 0xFA + offset] = value & 0xFF
+            return
+        for offset, value in enumerate(data):
+            chip[register + offset] = value & 0xFF
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_smbus(monkeypatch):
+    """Make `import smbus2` hand out FakeSMBus; yields {bus number: FakeSMBus}."""
+    opened = {}
+
+    def open_bus(number=1):
+        opened[number] = FakeSMBus(number)
+        return opened[number]
+
+    module = types.ModuleType('smbus2')
+    module.SMBus = open_bus
+    monkeypatch.setitem(sys.modules, 'smbus2', module)
+    yield opened
@@ -0,0 +1,114 @@
+"""pca9685_control's pooled daemon client: what it resends when a connection dies."""
+
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+import pca9685_control as pc
+
+
+class FakeDaemon:
+    """A scripted servo socket. `plan` gives, per accepted connection in turn,
+    (replies, read_next): answer that many lines, then read one more line
+    without answering if read_next, then hang up. Connections past the plan
+    are answered for as long as they stay open. Every command line read is
+    recorded in `received`.
+    """
+
+    def __init__(self, path, plan=()):
+        self.plan = list(plan)
+        self.received = []
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(8)
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            replies, read_next = self.plan.pop(0) if self.plan else (None, False)
+            threading.Thread(target=self._handle, args=(conn, replies, read_next),
+                             daemon=True).start()
+
+    def _handle(self, conn, replies, read_next):
+        reader = conn.makefile('rb')
+        answered = 0
+        while replies is None or answered < replies:
+            raw = reader.readline()
+            if not raw:
+                break
+            cmd = json.loads(raw)
+            self.received.append(cmd['cmd'])
+            conn.sendall((json.dumps({'status': 'ok', 'id': cmd['id']}) + '\n').encode())
+            answered += 1
+        if read_next:
+            raw = reader.readline()
+            if raw:
+                self.received.append(json.loads(raw)['cmd'])
+        reader.close()
+        conn.close()
+
+    def close(self):
+        self.server.close()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = str(tmp_path / 'servo.sock')
+    monkeypatch.setattr(pc, 'SERVO_SOCKET_PATH', path)
+    monkeypatch.setattr(pc, '_IS_DAEMON', False)
+    monkeypatch.setattr(pc, '_DIRECT', False)
+    monkeypatch.setattr(pc, '_AUTOSTART', False)
+    monkeypatch.setattr(pc, '_daemon_available', None)
+    pc._close_pool()
+    daemons = []
+
+    def start(plan=()):
+        daemons.append(FakeDaemon(path, plan))
+        return daemons[-1]
+
+    yield start
+    pc._close_pool()
+    for daemon in daemons:
+        daemon.close()
+
+
+def test_replies_are_matched_and_the_connection_is_pooled(client):
+    daemon = client()
+    replies = pc.daemon_request_many([{'cmd': 'ping', 'id': 'a'}, {'cmd': 'state'}])
+    assert replies == [{'status': 'ok', 'id': 'a'}, {'status': 'ok'}]
+    assert pc.daemon_request({'cmd': 'ping'}) == {'status': 'ok'}
+    assert daemon.received == ['ping', 'state', 'ping']
+
+
+def test_absolute_commands_are_resent_on_a_fresh_connection(client):
+    daemon = client([(1, True)])
+    pc.daemon_request({'cmd': 'ping'})
+    reply = pc.daemon_request({'cmd': 'set_angle', 'channel': 1, 'angle': 90})
+    assert reply == {'status': 'ok'}
+    assert daemon.received == ['ping', 'set_angle', 'set_angle']
+
+
+def test_relative_commands_are_not_resent_after_the_send(client):
+    daemon = client([(1, True)])
+    pc.daemon_request({'cmd': 'ping'})
+    replies = pc.daemon_request_many([{'cmd': 'rotate', 'channel': 7, 'extend_ms': 500, 'id': 9},
+                                      {'cmd': 'set_angle', 'channel': 1, 'angle': 90}])
+    assert [r['status'] for r in replies] == ['error', 'error']
+    assert replies[0]['id'] == 9 and 'id' not in replies[1]
+    assert daemon.received == ['ping', 'rotate']
+
+
+def test_a_hung_up_idle_connection_is_dropped_before_sending(client):
+    daemon = client([(1, False)])
+    pc.daemon_request({'cmd': 'ping'})
+    time.sleep(0.1)                         # the daemon hangs up on the idle connection
+    reply = pc.daemon_request({'cmd': 'rotate', 'channel': 7, 'extend_ms': 500})
+    assert reply == {'status': 'ok'}
+    assert daemon.received == ['ping', 'rotate']
@@ -0,0 +1,124 @@
+"""mb_safety: part-index and servo_part lookups against a throwaway config tree."""
+
+import json
+import os
+
+import pytest
+
+import mb_safety
+
+PARTS = [
+    {'id': 1, 'name': 'Jaw', 'type': 'servo',
+     'config': {'controllerType': 'pca9685', 'channel': 4, 'address': '0x40'}},
+    {'id': 2, 'name': 'Head', 'type': 'servo',
+     'config': {'controllerType': 'pca9685', 'channel': 4, 'address': '0x41'}},
+    {'id': 3, 'name': 'Eyes', 'type': 'servo',
+     'config': {'controllerType': 'pca9685', 'channel': 7}},
+    {'id': 4, 'name': 'Arm', 'type': 'linear-actuator',
+     'rpwmPin': 19, 'lpwmPin': 21, 'config': {'enPin': 5}},
+    'not a part',
+]
+
+
+def _write(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(value, handle)
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """Point every path mb_safety reads into tmp_path, with no stat throttle."""
+    data = tmp_path / 'data'
+    monkeypatch.setattr(mb_safety, 'DATA_ROOT', str(data))
+    monkeypatch.setattr(mb_safety, 'PHYSICAL_FAULTS_PATH', str(tmp_path / 'faults.json'))
+    monkeypatch.setattr(mb_safety, 'SAFETY_CONFIG_PATH', str(tmp_path / 'safety.json'))
+    monkeypatch.setattr(mb_safety, 'CALIBRATION_PROFILES_PATH',
+                        str(data / 'calibration_profiles.json'))
+    monkeypatch.setattr(mb_safety, 'STAT_INTERVAL_S', 0.0)
+    mb_safety.reset_cache()
+    _write(mb_safety._parts_path('9'), PARTS)
+    yield tmp_path
+    mb_safety.reset_cache()
+
+
+def test_channel_lookup_prefers_the_declared_address(tree):
+    assert mb_safety.find_part_by_channel('9', 4, address=0x40)['id'] == 1
+    assert mb_safety.find_part_by_channel('9', '4', address='0x41')['id'] == 2
+    # No address asked for: first in file order.
+    assert mb_safety.find_part_by_channel('9', 4)['id'] == 1
+    # A part with no declared address matches any chip.
+    assert mb_safety.find_part_by_channel('9', 7, address=0x42)['id'] == 3
+    assert mb_safety.find_part_by_channel('9', 5) is None
+    assert mb_safety.find_part_by_channel('9', 'x') is None
+    assert mb_safety.find_part_by_channel(None, 4) is None
+
+
+def test_pin_lookup_needs_every_declared_pin_to_agree(tree):
+    assert mb_safety.find_part_by_pins('9', {'rpwmPin': 19})['id'] == 4
+    assert mb_safety.find_part_by_pins('9', {'rpwmPin': 19, 'enPin': 5})['id'] == 4
+    assert mb_safety.find_part_by_pins('9', {'rpwmPin': 19, 'lpwmPin': 22}) is None
+    assert mb_safety.find_part_by_pins('9', {'rpwmPin': None}) is None
+    assert mb_safety.find_part_by_pins('9', {}) is None
+
+
+def test_broken_channels_follow_the_faults_file(tree):
+    assert mb_safety.broken_channels('9') == {}
+    _write(mb_safety.PHYSICAL_FAULTS_PATH,
+           {'characters': {'9': {'parts': {'3': {'status': 'broken'},
+                                           '1': {'status': 'repaired'}}}}})
+    broken = mb_safety.broken_channels('9')
+    assert set(broken) == {7}
+    assert 'Eyes' in broken[7]
+
+
+def test_index_is_reused_until_a_file_changes(tree):
+    first = mb_safety._index('9')
+    assert mb_safety._index('9') is first
+    _write(mb_safety._parts_path('9'), PARTS[:1])
+    assert mb_safety._index('9') is not first
+    assert mb_safety.find_part_by_channel('9', 7) is None
+
+
+def test_unreadable_parts_file_means_no_parts(tree):
+    with open(mb_safety._parts_path('9'), 'w', encoding='utf-8') as handle:
+        handle.write('{not json')
+    assert mb_safety.load_parts('9') == []
+    assert mb_safety.find_part_by_channel('9', 4) is None
+
+
+def test_servo_part_intersects_limits_with_the_measured_window(tree):
+    _write(mb_safety.CALIBRATION_PROFILES_PATH, {
+        '9:1': {'bounds': {'minAngle': 20, 'maxAngle': 150}, 'capability': {'invert': True}},
+        '2': {'bounds': {'minAngle': 30, 'maxAngle': 30.5}},          # pinned: not a measurement
+        '3': {'autoGenerated': True, 'bounds': {'minAngle': 0, 'maxAngle': 180}},
+    })
+    _write(mb_safety.SAFETY_CONFIG_PATH, {'characters': {'9': {'parts': {
+        '1': {'maxAngle': 120},
+        '3': {'blockAllMotion': True, 'blockReason': 'stripped gear'},
+    }}}})
+    jaw = mb_safety.servo_part('9', 1)
+    assert (jaw['address'], jaw['channel'], jaw['type']) == (0x40, 4, 'servo')
+    assert (jaw['min'], jaw['max']) == (20.0, 120.0)
+    assert jaw['mirror'] == (20.0, 150.0)
+    assert jaw['blocked'] is None
+
+    head = mb_safety.servo_part('9', '2')
+    assert (head['min'], head['max'], head['mirror']) == (None, None, None)
+
+    eyes = mb_safety.servo_part('9', 3)
+    assert eyes['address'] is None
+    assert 'stripped gear' in eyes['blocked']
+
+    assert mb_safety.servo_part('9', 99) is None
+    assert mb_safety.servo_part(None, 1) is None
+
+
+def test_servo_part_is_cached_until_a_profile_changes(tree):
+    _write(mb_safety.CALIBRATION_PROFILES_PATH, {'1': {'bounds': {'minAngle': 10, 'maxAngle': 170}}})
+    first = mb_safety.servo_part('9', 1)
+    assert mb_safety.servo_part('9', 1) is first
+    assert (first['min'], first['max']) == (10.0, 170.0)
+    _write(mb_safety.CALIBRATION_PROFILES_PATH, {'1': {'bounds': {'minAngle': 40, 'maxAngle': 140}}})
+    again = mb_safety.servo_part('9', 1)
+    assert (again['min'], again['max']) == (40.0, 140.0)
@@ -0,0 +1,60 @@
+"""servo_audio: level decoding per stream format, and the jaw envelope."""
+
+import math
+import struct
+from array import array
+
+import pytest
+
+import servo_audio
+
+
+def test_pcm_s16_is_cut_into_rms_windows_across_reads():
+    decoder = servo_audio.LevelDecoder('pcm_s16le', rate=1000, window_s=0.02)
+    assert decoder.step_s == pytest.approx(0.02)
+    loud = array('h', [16384, -16384] * 10).tobytes()      # one 20-sample window at half scale
+    silent = bytes(40)
+    data = loud + silent
+    assert decoder.levels(data[:25]) == []                  # carried over, nothing complete
+    levels = decoder.levels(data[25:])
+    assert levels == pytest.approx([0.5, 0.0])
+    assert decoder.buffer == b''
+
+
+def test_pcm_f32_rms():
+    decoder = servo_audio.LevelDecoder('pcm_f32le', rate=100, window_s=0.02)
+    samples = [math.sin(2 * math.pi * i / 2 + math.pi / 4) for i in range(2)]
+    assert decoder.levels(array('f', samples).tobytes()) == pytest.approx([math.sqrt(0.5)], abs=1e-6)
+
+
+def test_amplitude_streams_are_one_level_per_value():
+    u8 = servo_audio.LevelDecoder('amplitude_u8', rate=50)
+    assert u8.step_s == pytest.approx(0.02)
+    assert u8.levels(bytes([0, 255, 51])) == pytest.approx([0.0, 1.0, 0.2])
+    f32 = servo_audio.LevelDecoder('amplitude_f32')
+    assert f32.levels(struct.pack('<3f', -0.5, 0.25, 2.0)) == pytest.approx([0.0, 0.25, 1.0])
+
+
+def test_unknown_format_and_bad_rate_are_refused():
+    with pytest.raises(ValueError):
+        servo_audio.LevelDecoder('mp3')
+    with pytest.raises(ValueError):
+        servo_audio.LevelDecoder('pcm_s16le', rate=-1)
+
+
+def test_envelope_gates_opens_fast_and_closes_slower():
+    envelope = servo_audio.Envelope(attack_s=0.05, release_s=0.15, gate=0.02, gamma=1.0)
+    assert envelope.step(0.01, 0.02) == 0.0                 # under the gate
+    opened = [envelope.step(0.8, 0.02) for _ in range(5)]
+    assert all(b > a for a, b in zip(opened, opened[1:])) and opened[-1] < 0.8
+    rise = opened[0]
+    fall = opened[-1] - envelope.step(0.0, 0.02)
+    assert fall / opened[-1] < rise / 0.8                   # release is the slower constant
+
+
+def test_envelope_shapes_by_gain_and_gamma_and_caps_at_one():
+    envelope = servo_audio.Envelope(attack_s=0.0, release_s=0.0, gate=0.0, gamma=0.5, gain=2.0)
+    assert envelope.step(0.125, 0.02) == pytest.approx(0.5)
+    assert envelope.step(0.9, 0.02) == 1.0
+    with pytest.raises(ValueError):
+        servo_audio.Envelope(gamma=0)
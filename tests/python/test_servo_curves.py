@@ -0,0 +1,74 @@
+"""servo_curves: interpolation, the inverse lookup, and the ends of a partial curve."""
+
+import pytest
+
+import servo_curves
+
+
+def to_off(pulse_us):
+    return int(pulse_us / 20000.0 * 4096)
+
+
+@pytest.mark.parametrize('interpolation', servo_curves.INTERPOLATIONS)
+def test_curve_passes_through_measured_points(interpolation):
+    points = [[0, 600], [30, 900], [120, 1700], [180, 2350]]
+    curve = servo_curves.compile_curve(points, interpolation, to_off)
+    assert [curve.off(angle) for angle, _ in points] == [to_off(us) for _, us in points]
+
+
+def test_spline_is_monotone_between_points():
+    curve = servo_curves.compile_curve([[0, 600], [30, 900], [120, 1700], [180, 2350]],
+                                       'spline', to_off)
+    offs = list(curve.offs)
+    assert all(b >= a for a, b in zip(offs, offs[1:]))
+    assert min(offs) == to_off(600) and max(offs) == to_off(2350)
+
+
+def test_falling_curve_round_trips():
+    curve = servo_curves.compile_curve([[0, 2410], [90, 1480], [180, 560]], 'spline', to_off)
+    assert not curve.rising
+    for angle in (10.0, 45.0, 90.0, 135.0):
+        assert curve.angle(curve.off(angle)) == pytest.approx(angle, abs=0.6)
+
+
+@pytest.mark.parametrize('points', [[[90, 500], [180, 2400]], [[0, 500], [10, 2400]],
+                                    [[90, 2400], [180, 500]]])
+def test_partial_curve_never_widens_past_its_ends(points):
+    curve = servo_curves.compile_curve(points, 'linear', to_off)
+    measured = sorted(to_off(us) for _, us in points)
+    assert measured[0] <= min(curve.offs) and max(curve.offs) <= measured[1]
+    assert curve.off(0) == to_off(points[0][1])
+    assert curve.off(180) == to_off(points[-1][1])
+
+
+def test_angle_of_a_clamped_end_is_the_measured_end():
+    curve = servo_curves.compile_curve([[90, 500], [180, 2400]], 'linear', to_off)
+    assert curve.angle(curve.off(0)) == 90.0
+    assert curve.angle(curve.off(180)) == pytest.approx(180.0, abs=0.1)
+
+
+@pytest.mark.parametrize('points', [[[0, 600]], [[0, 600], [90, 600]],
+                                    [[0, 600], [90, 1500], [180, 1400]],
+                                    [[90, 600], [0, 1500]], [[0, 600], [200, 1500]]])
+def test_invalid_curves_are_refused(points):
+    with pytest.raises(ValueError):
+        servo_curves.compile_curve(points, 'linear', to_off)
+
+
+def test_compile_curves_keeps_good_entries_and_reports_bad_ones():
+    curves, errors = servo_curves.compile_curves({
+        '_comment': 'ignored',
+        '64:4': {'points': [[0, 600], [180, 2400]]},
+        '3:0x41:2': {'points': [[0, 600], [180, 2400]], 'interpolation': 'spline'},
+        '64:5': {'points': [[0, 600], [90, 600]]},
+        '64:99': {'points': [[0, 600], [180, 2400]]},
+    }, to_off)
+    assert set(curves) == {(None, 64, 4), (3, 0x41, 2)}
+    assert len(errors) == 2
+
+
+def test_parse_label():
+    assert servo_curves.parse_label('64:4') == (None, 64, 4)
+    assert servo_curves.parse_label('3:0x41:15') == (3, 0x41, 15)
+    with pytest.raises(ValueError):
+        servo_curves.parse_label('4')
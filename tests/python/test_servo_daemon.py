@@ -0,0 +1,132 @@
+"""servo_daemon.handle_command against an in-memory PCA9685 (conftest.FakeSMBus)."""
+
+import json
+import os
+
+import pytest
+
+from pca9685_control import angle_to_off
+
+
+@pytest.fixture(scope='module')
+def servo_daemon(tmp_path_factory):
+    """The daemon module, imported with persistence, the jaw socket and curves off."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('MB_SERVO_POSITIONS', '')
+        patch.setenv('MB_SERVO_JAW_SOCKET', '')
+        patch.setenv('MB_SERVO_BUSES', '1')
+        patch.setenv('MB_SERVO_CURVES', str(tmp_path_factory.mktemp('curves') / 'none.json'))
+        patch.setenv('MB_CHARACTER_ID', 'no-such-character')   # no broken parts
+        import servo_daemon
+        yield servo_daemon
+    os.environ.pop('MB_SERVO_DAEMON', None)   # set by the import
+
+
+@pytest.fixture
+def daemon(servo_daemon, fake_smbus, monkeypatch):
+    """A fresh bus 1 and chip for every test; yields (module, _Bus, FakeSMBus opener)."""
+    bus = servo_daemon._Bus(1)
+    monkeypatch.setitem(servo_daemon._buses, 1, bus)
+    yield servo_daemon, bus, fake_smbus
+
+
+def run(d, cmd):
+    d._begin_call()
+    return d.handle_command(cmd)
+
+
+def channel_writes(wire, channel):
+    register = 0x06 + 4 * channel
+    return [entry for entry in wire.log if entry[0] == 'block' and entry[2] == register]
+
+
+def test_set_angle_reaches_the_chip_and_state(daemon):
+    d, bus, opened = daemon
+    reply = run(d, {'cmd': 'set_angle', 'channel': 3, 'angle': 90})
+    assert reply['status'] == 'ok'
+    off = angle_to_off(90)
+    chip = opened[1].registers[0x40]
+    assert chip[0x06 + 4 * 3 + 2] | chip[0x06 + 4 * 3 + 3] << 8 == off
+    assert bus.last_off[(0x40, 3)] == off
+    assert bus.driven[(0x40, 3)] == off
+
+
+def test_unchanged_write_is_skipped_and_fast_repeats_are_coalesced(daemon):
+    d, bus, opened = daemon
+    run(d, {'cmd': 'set_angle', 'channel': 3, 'angle': 90})
+    skipped = d._stats['writes_skipped']
+    run(d, {'cmd': 'set_angle', 'channel': 3, 'angle': 90})
+    assert d._stats['writes_skipped'] == skipped + 1
+    assert len(channel_writes(opened[1], 3)) == 1
+
+    # Within one PWM frame of the last write: parked, and the last value wins.
+    run(d, {'cmd': 'set_angle', 'channel': 3, 'angle': 100})
+    run(d, {'cmd': 'set_angle', 'channel': 3, 'angle': 110})
+    assert bus.pending[(0x40, 3)] == angle_to_off(110)
+    assert len(channel_writes(opened[1], 3)) == 1
+
+
+def test_set_angles_goes_out_as_one_block_per_run(daemon):
+    d, bus, opened = daemon
+    reply = run(d, {'cmd': 'set_angles',
+                    'moves': [{'channel': c, 'angle': 40 + c} for c in (0, 1, 2, 5)]})
+    assert reply['status'] == 'ok'
+    blocks = [entry for entry in opened[1].log if entry[0] == 'block']
+    assert [(entry[2], len(entry[3])) for entry in blocks] == [(0x06, 12), (0x06 + 4 * 5, 4)]
+    assert {key[1]: off for key, off in bus.last_off.items() if off} == {
+        c: angle_to_off(40 + c) for c in (0, 1, 2, 5)}
+
+
+def test_rotate_refuses_more_than_the_motion_limit(daemon):
+    d, bus, _ = daemon
+    limit_ms = d.MAX_MOTION_S * 1000
+    with pytest.raises(ValueError, match='limit is'):
+        run(d, {'cmd': 'rotate', 'channel': 7, 'pulse_us': 1800, 'duration_ms': limit_ms + 1000})
+    assert (0x40, 7) not in bus.timers
+    assert run(d, {'cmd': 'rotate', 'channel': 7, 'pulse_us': 1800,
+                   'duration_ms': limit_ms - 1000})['status'] == 'ok'
+    assert (0x40, 7) in bus.timers
+    with pytest.raises(ValueError, match='limit is'):
+        run(d, {'cmd': 'rotate', 'channel': 7, 'extend_ms': 5000})
+    run(d, {'cmd': 'release', 'channel': 7})
+
+
+def send(d, cmd):
+    """One JSON line through the daemon's own decode and dispatch path."""
+    return d.dispatch_line(json.dumps(cmd))
+
+
+def test_layer_rank_is_its_own_key_in_both_forms(daemon):
+    d, bus, _ = daemon
+    reply = send(d, {'cmd': 'layer', 'channel': 1, 'layer': 'tracking', 'angle': 95,
+                     'rank': 80, 'priority': 'realtime', 'fade_ms': 200})
+    assert reply['status'] == 'ok', reply
+    reply = send(d, {'cmd': 'layer', 'priority': 'background', 'layers': [
+        {'channel': 1, 'layer': 'base', 'angle': 60, 'rank': 10},
+        {'channel': 2, 'layer': 'base', 'offset': 5}]})
+    assert [result['status'] for result in reply['results']] == ['ok', 'ok']
+    layers = send(d, {'cmd': 'state'})['layers']
+    assert layers['64:1']['tracking']['rank'] == 80
+    assert layers['64:1']['base']['rank'] == 10
+    assert layers['64:2']['base']['rank'] == 0
+
+    # "priority" stays the scheduling class; a rank that is not a number is an error.
+    assert 'Unknown priority' in send(d, {'cmd': 'layer', 'channel': 1, 'layer': 'x',
+                                          'angle': 90, 'priority': 80})['message']
+    assert 'rank must be an integer' in send(d, {'cmd': 'layer', 'channel': 1, 'layer': 'x',
+                                                 'angle': 90, 'rank': 'high'})['message']
+    assert 'x' not in send(d, {'cmd': 'state'})['layers']['64:1']
+
+
+def test_idle_starts_and_stops_through_dispatch(daemon):
+    d, bus, _ = daemon
+    reply = send(d, {'cmd': 'idle', 'channel': 4, 'amplitude': 3, 'frequency_hz': 0.4,
+                     'rank': 5, 'priority': 'background'})
+    assert reply['status'] == 'ok', reply
+    idle = send(d, {'cmd': 'state'})['layers']['64:4']['idle']
+    assert idle['generated'] and idle['rank'] == 5
+    assert 'Unknown priority' in send(d, {'cmd': 'idle', 'channel': 4, 'priority': 5})['message']
+
+    reply = send(d, {'cmd': 'idle', 'stop': True, 'fade_ms': 100})
+    assert reply == {'status': 'ok', 'stopped': ['64:4']}
+    assert bus.motions[(0x40, 4)].layers['idle'].target == 0.0
@@ -0,0 +1,132 @@
+"""servo_motion: easings, keyframed tracks."""
+
+import pytest
+
+import servo_motion
+
+
+@pytest.mark.parametrize('name', sorted(servo_motion.EASINGS))
+def test_easings_run_from_0_to_1_without_overshoot(name):
+    fn = servo_motion.easing(name)
+    values = [fn(i / 100.0) for i in range(101)]
+    assert values[0] == pytest.approx(0.0) and values[-1] == pytest.approx(1.0)
+    assert all(b >= a - 1e-12 for a, b in zip(values, values[1:]))
+    assert servo_motion.easing_name(fn) == name
+
+
+def test_easing_names_are_forgiving_and_unknown_ones_refused():
+    assert servo_motion.easing('Ease-In-Out') is servo_motion.EASINGS['ease_in_out']
+    assert servo_motion.easing(None) is servo_motion.EASINGS['linear']
+    with pytest.raises(ValueError):
+        servo_motion.easing('elastic')
+
+
+def test_track_samples_its_keyframes_and_holds_the_ends():
+    linear = servo_motion.easing('linear')
+    track = servo_motion.Track([(0.0, 90, linear), (0.4, 130, linear), (1.0, 70, linear)])
+    assert track.duration == 1.0 and track.target == 70.0
+    assert track.sample(-1.0) == 90.0
+    assert track.sample(0.2) == pytest.approx(110.0)
+    assert track.sample(0.4) == pytest.approx(130.0)
+    assert track.sample(0.7) == pytest.approx(100.0)
+    assert track.sample(5.0) == 70.0
+
+
+def test_segment_uses_the_easing_of_the_keyframe_it_arrives_at():
+    track = servo_motion.Track([(0.0, 0, None), (1.0, 100, servo_motion.easing('ease_in'))])
+    assert track.sample(0.5) == pytest.approx(25.0)
+
+
+@pytest.mark.parametrize('keyframes', [[], [(0.1, 90, None)],
+                                       [(0.0, 90, None), (0.5, 100, None), (0.2, 80, None)]])
+def test_bad_tracks_are_refused(keyframes):
+    with pytest.raises(ValueError):
+        servo_motion.Track(keyframes)
+
+
+def run(profile, ticks=2000):
+    positions = []
+    while not profile.done and len(positions) < ticks:
+        positions.append(profile.step())
+    return positions
+
+
+@pytest.mark.parametrize('max_jerk', [None, 2000.0])
+def test_profile_lands_on_the_goal_and_never_passes_it(max_jerk):
+    profile = servo_motion.Profile(90, 150, max_velocity=120, max_accel=600, max_jerk=max_jerk)
+    positions = run(profile)
+    assert profile.done and positions[-1] == 150.0
+    assert all(90.0 <= p <= 150.0 for p in positions)
+    assert all(b >= a for a, b in zip(positions, positions[1:]))
+
+
+def test_profile_respects_its_velocity_and_acceleration_limits():
+    profile = servo_motion.Profile(0, 180, max_velocity=100, max_accel=400, tick=0.02)
+    velocities = [0.0]
+    previous = 0.0
+    while not profile.done:
+        position = profile.step()
+        velocities.append((position - previous) / 0.02)
+        previous = position
+    assert max(velocities) <= 100.0 + 1e-9
+    assert all(abs(b - a) / 0.02 <= 400.0 + 1e-6 for a, b in zip(velocities[:-1], velocities[1:-1]))
+    # A 180 degree move at 100 deg/s takes at least 1.8s.
+    assert len(velocities) - 1 >= 90
+
+
+def test_retarget_mid_move_brakes_and_comes_back():
+    profile = servo_motion.Profile(90, 150, max_velocity=120, max_accel=600)
+    for _ in range(20):
+        profile.step()
+    turned_at = profile.position
+    profile.retarget(100)
+    positions = run(profile)
+    assert max(positions) > turned_at            # carries on while braking
+    assert positions[-1] == 100.0 and profile.done
+
+
+def test_profile_refuses_non_positive_limits():
+    with pytest.raises(ValueError):
+        servo_motion.Profile(0, 10, max_velocity=0, max_accel=100)
+    with pytest.raises(ValueError):
+        servo_motion.Profile(0, 10, max_velocity=10, max_accel=100, max_jerk=-1)
+
+
+def test_blend_pulls_absolute_layers_by_weight_in_priority_order():
+    low = servo_motion.Layer(100, priority=10)
+    high = servo_motion.Layer(140, priority=80, weight=0.5)
+    offset = servo_motion.Layer(3, additive=True, weight=0.5)
+    assert servo_motion.blend(90, [high, offset, low]) == pytest.approx(121.5)
+    assert servo_motion.blend(None, [offset]) is None
+    assert servo_motion.blend(None, [high]) == 140.0
+
+
+def test_layer_fades_over_fade_s_and_is_gone_once_out():
+    layer = servo_motion.Layer(120, weight=1.0, fade_s=0.2)
+    assert layer.weight == 0.0
+    for _ in range(5):
+        layer.step(0.02)
+    assert layer.weight == pytest.approx(0.5)
+    layer.fade_to(0.0, 0.1)
+    for _ in range(5):
+        layer.step(0.02)
+    assert layer.gone
+
+
+@pytest.mark.parametrize('kind', servo_motion.IDLE_KINDS)
+def test_idle_bands_stay_within_their_amplitude_and_repeat_by_seed(kind):
+    idle = servo_motion.IdleMotion([(kind, 4.0, 0.5, 0.1)], seed=7)
+    samples = [idle.sample(i * 0.02) for i in range(1000)]
+    assert all(abs(s) <= 4.0 + 1e-9 for s in samples)
+    assert max(samples) - min(samples) > 1.0
+    again = servo_motion.IdleMotion([(kind, 4.0, 0.5, 0.1)], seed=7)
+    assert [again.sample(i * 0.02) for i in range(1000)] == samples
+    other = servo_motion.IdleMotion([(kind, 4.0, 0.5, 0.1)], seed=8)
+    assert [other.sample(i * 0.02) for i in range(1000)] != samples
+
+
+def test_idle_refuses_unknown_kinds_and_zero_frequency():
+    with pytest.raises(ValueError):
+        servo_motion.IdleMotion([('wobble', 1.0, 1.0, 0.0)])
+    with pytest.raises(ValueError):
+        servo_motion.IdleMotion([('noise', 1.0, 0.0, 0.0)])
@@ -0,0 +1,58 @@
+"""servo_protocol: binary frames round-trip to the JSON commands they stand for."""
+
+import pytest
+
+import servo_protocol as sp
+
+
+@pytest.mark.parametrize('cmd', [
+    {'cmd': 'ping'},
+    {'cmd': 'set_angle', 'channel': 3, 'angle': 85.25, 'min': 60.0, 'max': 120.0},
+    {'cmd': 'set_angle', 'channel': 7, 'angle': 90.0, 'min': None, 'max': None,
+     'release': True, 'priority': 'realtime', 'bus': 3, 'address': 0x41},
+    {'cmd': 'set_angles', 'moves': [{'channel': 0, 'angle': 100.0, 'min': None, 'max': None},
+                                    {'channel': 15, 'angle': 0.5, 'min': 0.0, 'max': 180.0}],
+     'priority': 'background'},
+    {'cmd': 'set_raw', 'channel': 5, 'off': 307},
+    {'cmd': 'release', 'channel': 5, 'address': 0x40},
+])
+def test_request_round_trip(cmd):
+    frame = sp.encode_request(cmd, request_id=0x1234)
+    assert sp.request_size(frame[:sp.HEADER_SIZE]) == len(frame)
+    decoded, request_id, no_reply = sp.decode_request(frame)
+    assert decoded == cmd and request_id == 0x1234 and not no_reply
+
+
+def test_request_clamps_and_flags():
+    frame = sp.encode_request({'cmd': 'set_angle', 'channel': 1, 'angle': 200, 'address': '0x41'},
+                              request_id=0x10001, no_reply=True)
+    decoded, request_id, no_reply = sp.decode_request(frame)
+    assert decoded['angle'] == 180.0 and decoded['address'] == 0x41
+    assert request_id == 1 and no_reply
+
+
+def test_verbs_without_a_binary_form_and_bad_frames_are_refused():
+    with pytest.raises(ValueError):
+        sp.encode_request({'cmd': 'move_to', 'channel': 1, 'angle': 90})
+    with pytest.raises(ValueError):
+        sp.encode_request({'cmd': 'set_angles',
+                           'moves': [{'channel': 0, 'angle': 90}] * (sp.MAX_ITEMS + 1)})
+    with pytest.raises(ValueError):
+        sp.request_size(bytes([0x7F]) + bytes(sp.HEADER_SIZE - 1))
+    frame = sp.encode_request({'cmd': 'set_raw', 'channel': 5, 'off': 307})
+    with pytest.raises(ValueError):
+        sp.decode_request(frame[:-1])
+
+
+def test_reply_round_trip():
+    ok = sp.encode_reply(sp.OP_SET_ANGLES, 9, {'status': 'ok', 'results': [
+        {'status': 'success'}, {'status': 'error', 'error': 'refused'}]})
+    assert sp.reply_size(ok[:sp.HEADER_SIZE]) == len(ok)
+    assert sp.decode_reply(ok) == {'status': 'ok', 'results': [True, False], 'id': 9}
+
+    error = sp.encode_reply(sp.OP_SET_ANGLE, 10, {'status': 'error', 'message': 'ch4 refused'})
+    assert sp.reply_size(error[:sp.HEADER_SIZE]) == len(error)
+    assert sp.decode_reply(error) == {'status': 'error', 'message': 'ch4 refused', 'id': 10}
+
+    pong = sp.encode_reply(sp.OP_PING, 11, {'status': 'pong'})
+    assert sp.decode_reply(pong) == {'status': 'pong', 'id': 11}